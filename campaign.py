@@ -0,0 +1,75 @@
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+
+def get_targets(config: Dict) -> List[Dict]:
+    """
+    테스트 대상 목록
+    targets가 없으면 server_config 하나만 대상(name None, 결과는 실행 폴더에 바로 저장)
+    각 targets 항목은 name과 덮어쓸 설정 블록(server_config, test_parameters 등)으로 구성되며 dict 블록은 기존 값에 병합
+    :return: [{"name": 대상 이름, "config": 대상별 전체 설정}]
+    """
+    targets = config.get("targets")
+    if not targets:
+        return [{"name": None, "config": config}]
+
+    resolved = []
+    for index, target in enumerate(targets):
+        target_config = {key: value for key, value in config.items() if key != "targets"}
+        for key, value in target.items():
+            if key == "name":
+                continue
+            if isinstance(value, dict) and isinstance(target_config.get(key), dict):
+                target_config[key] = dict(target_config[key], **value)
+            else:
+                target_config[key] = value
+        server = target_config["server_config"]
+        name = target.get("name") or f"{server['server_name']}_{server['port']}"
+        resolved.append({"name": name, "config": target_config})
+
+    names = [target["name"] for target in resolved]
+    if len(set(names)) != len(names):
+        raise ValueError(f"대상 이름이 중복됩니다: {names}")
+    return resolved
+
+
+class ThreadBudget:
+    def __init__(self, total_threads: int):
+        """
+        동시에 실행되는 대상들이 나눠 쓰는 부하 발생기 쓰레드 예산
+        요청 순서(FIFO)대로 배정하므로 큰 단계를 요청한 대상도 작은 요청들에 밀려 굶지 않음
+        Args:
+            total_threads: 모든 대상의 단계 쓰레드 수 합계 상한
+        """
+        self.total_threads = total_threads
+        self.available = total_threads
+        self._queue = deque()
+        self._condition = threading.Condition()
+
+    def acquire(self, threads: int) -> int:
+        """
+        쓰레드 예산 확보 (앞선 요청이 모두 배정되고 여유가 생길 때까지 대기)
+        예산보다 큰 요청은 예산 전체를 확보하여 단독 실행
+        :return: 확보한 쓰레드 수 (release에 그대로 전달)
+        """
+        threads = min(threads, self.total_threads)
+        ticket = object()
+        with self._condition:
+            self._queue.append(ticket)
+            self._condition.wait_for(lambda: self._queue[0] is ticket and self.available >= threads)
+            self._queue.popleft()
+            self.available -= threads
+            self._condition.notify_all()
+        return threads
+
+    def release(self, threads: int):
+        with self._condition:
+            self.available += threads
+            self._condition.notify_all()
+
+
+def create_thread_budget(config: Dict) -> Optional[ThreadBudget]:
+    """campaign_config.max_total_threads가 있으면 공유 쓰레드 예산 생성 (없으면 제한 없음)"""
+    max_total_threads = config.get("campaign_config", {}).get("max_total_threads")
+    return ThreadBudget(max_total_threads) if max_total_threads else None
@@ -0,0 +1,118 @@
+import argparse
+import json
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from dashboard_data import load_run
+
+# USL 적합에 필요한 최소 쓰레드 수 종류
+MIN_CONCURRENCY_LEVELS = 3
+
+# 이보다 작은 계수는 수치 오차로 보고 0 처리
+COEFFICIENT_EPSILON = 1e-9
+
+
+def aggregate_throughput(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    쓰레드 수별 평균 유효 처리량(성공 요청/초) 계산
+    오류 응답은 용량이 아니므로 requests_per_second × (1 - 오류율)을 사용
+    """
+    goodput = data['requests_per_second'] * (1 - data['error_rate'] / 100)
+    return goodput.groupby(data['thread_count']).mean().rename('throughput').reset_index()
+
+
+def predict_throughput(model: Dict, concurrency) -> np.ndarray:
+    """USL: X(N) = λN / (1 + σ(N-1) + κN(N-1))"""
+    n = np.asarray(concurrency, dtype=float)
+    return model['lambda'] * n / (1 + model['sigma'] * (n - 1) + model['kappa'] * n * (n - 1))
+
+
+def _fit_bounded(n: np.ndarray, x: np.ndarray):
+    """
+    0 ≤ σ ≤ 1, κ ≥ 0 격자에서 처리량 제곱오차가 최소인 계수 탐색
+    σ, κ가 정해지면 λ는 최소제곱 닫힌 해 Σxg/Σg²
+    """
+    sigmas = np.concatenate([[0.0], np.logspace(-4, 0, 81)])[:, None, None]
+    kappas = np.concatenate([[0.0], np.logspace(-8, 0, 121)])[None, :, None]
+    g = n / (1 + sigmas * (n - 1) + kappas * n * (n - 1))
+    lams = (g * x).sum(axis=2) / (g * g).sum(axis=2)
+    sse = ((x - lams[:, :, None] * g) ** 2).sum(axis=2)
+    i, j = np.unravel_index(np.argmin(sse), sse.shape)
+    return float(lams[i, j]), float(sigmas[i, 0, 0]), float(kappas[0, j, 0])
+
+
+def fit_usl(concurrency, throughput) -> Optional[Dict]:
+    """
+    Universal Scalability Law 적합
+    N/X = (1-σ)/λ + (σ-κ)/λ·N + κ/λ·N² 이므로 N/X에 대한 2차 다항식 최소제곱으로 닫힌 해를 구함
+    (해가 σ∈[0,1], κ≥0 범위를 벗어나면 _fit_bounded로 대체)
+    :return: lambda(단일 쓰레드 처리량), sigma(경합), kappa(일관성), r_squared, optimal_concurrency, max_throughput
+             쓰레드 수 종류가 부족하거나 적합이 무의미하면 None
+    """
+    n = np.asarray(concurrency, dtype=float)
+    x = np.asarray(throughput, dtype=float)
+    valid = (n > 0) & (x > 0)
+    n, x = n[valid], x[valid]
+    if len(np.unique(n)) < MIN_CONCURRENCY_LEVELS:
+        return None
+
+    c2, c1, c0 = np.polyfit(n, n / x, 2)
+    lam = 1 / (c0 + c1 + c2) if c0 + c1 + c2 > 0 else 0.0
+    kappa = c2 * lam
+    sigma = c1 * lam + kappa
+    if lam <= 0 or kappa < 0 or not 0 <= sigma <= 1:
+        # 잡음이 큰 측정값은 선형화 해가 물리적으로 무의미할 수 있으므로 범위 제한 탐색으로 대체
+        lam, sigma, kappa = _fit_bounded(n, x)
+    kappa = kappa if kappa > COEFFICIENT_EPSILON else 0.0
+    sigma = sigma if sigma > COEFFICIENT_EPSILON else 0.0
+
+    model = {"lambda": float(lam), "sigma": float(sigma), "kappa": float(kappa)}
+    predicted = predict_throughput(model, n)
+    total = ((x - x.mean()) ** 2).sum()
+    model["r_squared"] = float(1 - ((x - predicted) ** 2).sum() / total) if total > 0 else 1.0
+
+    if kappa > 0:
+        # 처리량 최대점 N* = sqrt((1-σ)/κ), 그 이후는 쓰레드를 늘릴수록 처리량 감소
+        optimal = max(float(np.sqrt((1 - sigma) / kappa)), 1.0)
+        model["optimal_concurrency"] = optimal
+        model["max_throughput"] = float(predict_throughput(model, optimal))
+    else:
+        # 일관성 비용이 없으면 최대점 없이 λ/σ(암달 한계)로 수렴
+        model["optimal_concurrency"] = None
+        model["max_throughput"] = float(lam / sigma) if sigma > 0 else None
+    model["tested_max_concurrency"] = int(n.max())
+    # 최대점이 시험 범위 밖이면 외삽 결과임
+    model["extrapolated"] = bool(model["optimal_concurrency"] is None or model["optimal_concurrency"] > n.max())
+    return model
+
+
+def capacity_table(model: Dict, concurrency: List[int]) -> pd.DataFrame:
+    """지정한 쓰레드 수(시험 범위 밖 포함)별 예상 처리량"""
+    return pd.DataFrame({
+        'thread_count': concurrency,
+        'predicted_throughput': predict_throughput(model, concurrency).round(2)
+    })
+
+
+def estimate_capacity(data: pd.DataFrame) -> Optional[Dict]:
+    """phase 결과 DataFrame으로 USL 용량 모델 계산"""
+    measured = aggregate_throughput(data)
+    return fit_usl(measured['thread_count'], measured['throughput'])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="USL 기반 최대 지속 처리량/최적 쓰레드 수 추정")
+    parser.add_argument("run_dir", help="stress_test_results_* 폴더")
+    parser.add_argument("--predict", type=int, nargs="*", default=[], help="예상 처리량을 계산할 쓰레드 수")
+    args = parser.parse_args()
+
+    run_data, _ = load_run(args.run_dir)
+    capacity = estimate_capacity(run_data) if run_data is not None else None
+    if capacity is None:
+        print(json.dumps({"error": f"쓰레드 수가 {MIN_CONCURRENCY_LEVELS}종류 이상인 결과가 필요합니다"}, ensure_ascii=False))
+    else:
+        if args.predict:
+            capacity["predictions"] = capacity_table(capacity, args.predict).to_dict(orient="records")
+        print(json.dumps(capacity, indent=4, ensure_ascii=False))
@@ -0,0 +1,79 @@
+import streamlit as st
+import plotly.express as px
+import os
+from results_db import ResultsDB, DEFAULT_DB_PATH
+
+st.set_page_config(page_title="Cross-Run Comparison", layout="wide")
+st.title("🔀 Cross-Run Regression Analysis")
+
+def highlight_regressions(row, p95_tolerance, rps_tolerance):
+    """허용치를 넘는 p95 증가 / RPS 감소 행 강조"""
+    regressed = (row['p95_change_pct'] > p95_tolerance) or (row['rps_change_pct'] < -rps_tolerance)
+    return ['background-color: #ffcccc' if regressed else '' for _ in row]
+
+def main():
+    db_path = st.sidebar.text_input("Results DB", value=DEFAULT_DB_PATH)
+    if not os.path.exists(db_path):
+        st.error("No results database found!")
+        return
+
+    db = ResultsDB(db_path)
+    runs = db.list_runs()
+    if len(runs) < 2:
+        st.info("At least two runs are needed for comparison.")
+        st.dataframe(runs)
+        return
+
+    st.subheader("📚 Stored Runs")
+    st.dataframe(runs)
+
+    labels = {row.run_id: f"{row.run_id} ({row.build_tag or 'no tag'})" for row in runs.itertuples()}
+    col1, col2 = st.columns(2)
+    with col1:
+        baseline_run = st.selectbox("Baseline Run:", options=list(labels), format_func=labels.get, index=len(labels)-2)
+    with col2:
+        candidate_run = st.selectbox("Candidate Run:", options=list(labels), format_func=labels.get, index=len(labels)-1)
+
+    p95_tolerance = st.sidebar.slider("p95 Increase Tolerance (%)", min_value=0, max_value=100, value=10)
+    rps_tolerance = st.sidebar.slider("RPS Decrease Tolerance (%)", min_value=0, max_value=100, value=10)
+
+    # 엔드포인트 × 쓰레드 수별 변화 (DB 집계 쿼리)
+    comparison = db.compare_runs(baseline_run, candidate_run)
+    if comparison.empty:
+        st.warning("No overlapping endpoint / thread count combinations between the selected runs.")
+        return
+
+    regressions = comparison[(comparison['p95_change_pct'] > p95_tolerance) |
+                             (comparison['rps_change_pct'] < -rps_tolerance)]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Compared Combinations", len(comparison))
+    col2.metric("Regressions", len(regressions))
+    col3.metric("Median p95 Change", f"{comparison['p95_change_pct'].median():.1f}%")
+
+    st.subheader("📋 Endpoint Comparison")
+    st.dataframe(comparison.style.apply(highlight_regressions, axis=1,
+                                        p95_tolerance=p95_tolerance, rps_tolerance=rps_tolerance).format(precision=2))
+
+    fig_change = px.bar(
+        comparison,
+        x='thread_count',
+        y='p95_change_pct',
+        color='endpoint',
+        barmode='group',
+        title='p95 Change vs Baseline by Thread Count (%)'
+    )
+    fig_change.add_hline(y=p95_tolerance, line_dash='dot', line_color='red', annotation_text="Tolerance")
+    fig_change.update_xaxes(type='category')
+    st.plotly_chart(fig_change, use_container_width=True)
+
+    # 엔드포인트별 실행 추이
+    st.subheader("📈 Endpoint Trend Across Runs")
+    endpoint = st.selectbox("Endpoint:", options=db.list_endpoints())
+    trend = db.run_trend(endpoint)
+    trend['run'] = trend['run_id'] + trend['build_tag'].fillna('').map(lambda tag: f" ({tag})" if tag else "")
+    fig_trend = px.line(trend, x='thread_count', y='p95', color='run', markers=True,
+                        title=f'p95 by Thread Count per Run ({endpoint})')
+    st.plotly_chart(fig_trend, use_container_width=True)
+
+if __name__ == "__main__":
+    main()
@@ -4,68 +4,54 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import os
-import json
+import numpy as np
 from datetime import datetime
+from dashboard_data import find_run_dirs, get_run_mtime, load_run
+from timeseries_analysis import load_timeseries
+from resource_sampler import load_resources, join_with_timeseries
+from downsample import DEFAULT_MAX_POINTS, downsample_frame, select_window
+from capacity_model import MIN_CONCURRENCY_LEVELS, aggregate_throughput, capacity_table, estimate_capacity, predict_throughput
 
 # 스크립트 시작 시 가장 먼저 설정
 st.set_page_config(page_title="Load Test Results", layout="wide")
 st.title("📊 Load Test Performance Analysis")
 
-def load_test_results(base_dir):
-    """각 phase 폴더의 모든 JSON 파일을 로드하여 DataFrame으로 변환"""
-    all_results = []
-    
-    for folder in os.listdir(base_dir):
-        if folder.startswith('phase_threads_'):
-            thread_count = int(folder.split('_')[2])
-            duration = int(folder.split('_')[4])
-            
-            phase_dir = os.path.join(base_dir, folder)
-            for stats_file in os.listdir(phase_dir):
-                if stats_file.startswith('test_results_'):
-                    with open(os.path.join(phase_dir, stats_file), 'r') as f:
-                        stats = json.load(f)
-                        stats['thread_count'] = thread_count
-                        stats['duration'] = duration
-                        stats['file_name'] = stats_file
-                        all_results.append(stats)
-    
-    if not all_results:
-        return None
+@st.cache_data(show_spinner=False)
+def load_run_data(base_dir, run_mtime=None):
+    """
+    phase별/엔드포인트별 결과 DataFrame 로드 (dashboard_data 공용 평탄화 사용)
+    run_mtime(get_run_mtime)이 캐시 키에 포함되어 새 phase가 생길 때만 다시 읽음
+    """
+    data, endpoint_data = load_run(base_dir)
+    if data is not None:
+        data['error_rate'] = (data['error_count'] / data['total_requests'] * 100).round(2)
+        data = data.sort_values('duration')
+    return data, endpoint_data
 
-    data = pd.DataFrame(all_results)
-    data['timestamp'] = pd.to_datetime(data['timestamp'])
-    
-    # response_time과 throughput 데이터 처리
-    data['min_response_time'] = data['response_time'].apply(lambda x: x['min'])
-    data['max_response_time'] = data['response_time'].apply(lambda x: x['max'])
-    data['avg_response_time'] = data['response_time'].apply(lambda x: x['mean'])
-    data['median_response_time'] = data['response_time'].apply(lambda x: x['median'])
-    data['90th_percentile'] = data['response_time'].apply(lambda x: x['90th_percentile'])
-    data['95th_percentile'] = data['response_time'].apply(lambda x: x['95th_percentile'])
-    data['99th_percentile'] = data['response_time'].apply(lambda x: x['99th_percentile'])
-    data['requests_per_second'] = data['throughput'].apply(lambda x: x['requests_per_second'])
-    data['error_rate'] = (data['error_count'] / data['total_requests'] * 100).round(2)
-    
-    return data.sort_values('duration')
-
-def create_endpoint_metrics(data):
-    """엔드포인트별 메트릭스 생성"""
-    endpoint_data = []
-    for _, row in data.iterrows():
-        for endpoint, stats in row['endpoint_statistics'].items():
-            endpoint_data.append({
-                'timestamp': row['timestamp'],
-                'thread_count': row['thread_count'],
-                'duration': row['duration'],
-                'endpoint': endpoint,
-                'total_requests': stats['total_requests'],
-                'error_rate': stats['error_rate'],
-                'avg_response_time': stats['avg_response_time'],
-                '90th_percentile': stats['90th_percentile'],
-                'error_count': stats['error_count']
-            })
-    return pd.DataFrame(endpoint_data)
+def create_timeseries_chart(series, title):
+    """단계 내 구간별 처리량/응답시간 분위수 차트 생성"""
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(go.Scatter(x=series['second'], y=series['rps'], name='Requests/Second'), secondary_y=False)
+    for percentile in ['p50', 'p95', 'p99']:
+        fig.add_trace(go.Scatter(x=series['second'], y=series[percentile], name=f'{percentile} (ms)'), secondary_y=True)
+    fig.add_trace(go.Bar(x=series['second'], y=series['error_rate'], name='Error Rate (%)', opacity=0.3), secondary_y=False)
+
+    fig.update_layout(title=title, xaxis_title='Elapsed Time in Phase (seconds)', hovermode='x unified')
+    fig.update_yaxes(title_text='Requests/Second | Error Rate(%)', secondary_y=False)
+    fig.update_yaxes(title_text='Response Time (ms)', secondary_y=True)
+    return fig
+
+def create_resource_chart(joined, title):
+    """처리량과 서버 자원 사용량(CPU/iowait/메모리) 비교 차트 생성"""
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(go.Scatter(x=joined['second'], y=joined['rps'], name='Requests/Second'), secondary_y=False)
+    for column, name in [('cpu_pct', 'CPU (%)'), ('iowait_pct', 'IO Wait (%)'), ('mem_used_pct', 'Memory (%)')]:
+        fig.add_trace(go.Scatter(x=joined['second'], y=joined[column], name=name, line=dict(dash='dot')), secondary_y=True)
+
+    fig.update_layout(title=title, xaxis_title='Elapsed Time in Phase (seconds)', hovermode='x unified')
+    fig.update_yaxes(title_text='Requests/Second', secondary_y=False)
+    fig.update_yaxes(title_text='Utilization (%)', range=[0, 100], secondary_y=True)
+    return fig
 
 def create_performance_dashboard(data):
     
@@ -98,49 +84,70 @@ def create_performance_dashboard(data):
         '95th_percentile': 'mean'
     }).round(2).reset_index()
 
-    # 5. Optimal Configuration Finder
-    st.header("🎯 Optimal Configuration Analysis")
-    st.write("Based on response time and throughput:")
-    
-    best_throughput = metrics_df.loc[metrics_df['requests_per_second'].idxmax()]
-    best_response = metrics_df.loc[metrics_df['avg_response_time'].idxmin()]
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.subheader("Best Throughput Configuration")
-        st.write(f"Threads: {best_throughput['thread_count']}")
-        st.write(f"Duration: {best_throughput['duration']}s")
-        st.write(f"Throughput: {best_throughput['requests_per_second']} req/s")
-        
-    with col2:
-        st.subheader("Best Response Time Configuration")
-        st.write(f"Threads: {best_response['thread_count']}")
-        st.write(f"Duration: {best_response['duration']}s")
-        st.write(f"Response Time: {best_response['avg_response_time']}ms")
+    # 5. Capacity Model (USL)
+    st.header("🎯 Capacity Analysis (Universal Scalability Law)")
+    capacity = estimate_capacity(data)
+
+    if capacity is None:
+        st.info(f"At least {MIN_CONCURRENCY_LEVELS} different thread counts are needed to fit the scalability model.")
+        best_thread = metrics_df.loc[metrics_df['requests_per_second'].idxmax(), 'thread_count']
+    else:
+        optimal = capacity['optimal_concurrency']
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Max Sustainable Throughput",
+                    f"{capacity['max_throughput']:.1f} req/s" if capacity['max_throughput'] is not None else "Unbounded")
+        col2.metric("Optimal Concurrency", f"{optimal:.0f} threads" if optimal is not None else "Beyond any peak")
+        col3.metric("Contention (σ)", f"{capacity['sigma']:.4f}")
+        col4.metric("Coherency (κ)", f"{capacity['kappa']:.6f}")
+        st.caption(f"Single-thread throughput (λ): {capacity['lambda']:.2f} req/s · Fit R²: {capacity['r_squared']:.3f}"
+                   + (" · Peak is extrapolated beyond the tested range" if capacity['extrapolated'] else ""))
+
+        # 측정값과 적합 곡선 (시험 범위 밖까지 예측)
+        measured = aggregate_throughput(data)
+        tested_max = capacity['tested_max_concurrency']
+        curve_max = max(tested_max * 2, optimal * 1.5 if optimal is not None else 0)
+        curve_threads = np.linspace(1, curve_max, 200)
+        fig_capacity = go.Figure()
+        fig_capacity.add_trace(go.Scatter(x=measured['thread_count'], y=measured['throughput'],
+                                          mode='markers', name='Measured (successful req/s)'))
+        fig_capacity.add_trace(go.Scatter(x=curve_threads, y=predict_throughput(capacity, curve_threads),
+                                          mode='lines', name='USL Fit'))
+        fig_capacity.add_vline(x=tested_max, line_dash='dot', annotation_text="Tested Range")
+        fig_capacity.update_layout(title='Throughput vs Concurrency', xaxis_title='Thread Count',
+                                   yaxis_title='Successful Requests per Second')
+        st.plotly_chart(fig_capacity, use_container_width=True)
+
+        st.write("Predicted capacity:")
+        st.dataframe(capacity_table(capacity, [tested_max * factor for factor in (1, 2, 4, 8)]))
+
+        # 엔드포인트 분석용: 최적점에 가장 가까운 시험된 쓰레드 수
+        tested = measured['thread_count']
+        best_thread = tested.max() if optimal is None else tested.iloc[(tested - optimal).abs().argmin()]
 
 
     st.header("📑 Detailed Performance Metrics")
     st.dataframe(metrics_df.sort_values(['thread_count', 'duration']))
 
-    return best_response
+    return best_thread
 
 def main():
     # 파일 선택
-    # result_dirs = 'stress_test_results_20250219_134529'
-    result_dirs = [d for d in os.listdir('.') if d.startswith('stress_test_results')]
+    # 다중 대상 실행은 대상별 하위 폴더를 각각 선택 가능
+    result_dirs = find_run_dirs()
     if not result_dirs:
         st.error("No test result files found!")
         return
     
     selected_dir = st.selectbox("Select Test Run:", options=result_dirs, index=len(result_dirs)-1)
     
-    # 데이터 로드
-    data = load_test_results(selected_dir)
+    # 데이터 로드 (새 phase가 추가된 경우에만 디스크에서 다시 읽음)
+    run_mtime = get_run_mtime(selected_dir)
+    data, endpoint_df = load_run_data(selected_dir, run_mtime)
     if data is None:
         st.error("No data found in the selected directory!")
         return
         
-    best_response = create_performance_dashboard(data)
+    best_thread = create_performance_dashboard(data)
 
     filtered_data = data[data['duration'] > 0].sort_values(by='thread_count')
 
@@ -160,7 +167,7 @@ def main():
     with tabs[0]:
         # 처리량 분석
         fig_throughput = px.line(
-            filtered_data,
+            downsample_frame(filtered_data, 'thread_count', ['requests_per_second'], by='duration'),
             x='thread_count',
             y='requests_per_second',
             color='duration',
@@ -217,8 +224,7 @@ def main():
 
     # Endpoint Performance
     st.subheader("Endpoint Performance")
-    endpoint_df = create_endpoint_metrics(filtered_data)
-    best_thread = best_response['thread_count']
+    endpoint_df = endpoint_df[endpoint_df['duration'] > 0]
 
     best_thread_endpoints = endpoint_df[endpoint_df['thread_count'] == best_thread] # proper data
     best_thread_endpoints = best_thread_endpoints.sort_values(by='duration')
@@ -230,7 +236,7 @@ def main():
         y='error_rate',
         color='endpoint',
         barmode='group',
-        title=f"Error Rate by Endpoint and Duration (Best Response Time Threads: {best_thread_endpoints['thread_count'].values[0]})",
+        title=f"Error Rate by Endpoint and Duration (Optimal Threads: {best_thread_endpoints['thread_count'].values[0]})",
     )
 
     fig_endpoint.update_xaxes(type='category')
@@ -244,5 +250,43 @@ def main():
 
     st.plotly_chart(fig_endpoint, use_container_width=True)
 
+    # Phase Time Series
+    st.subheader("Phase Time Series")
+    # 같은 쓰레드 수/지속시간은 가장 최근 유효 단계 (포화로 재시도한 경우 _retryN 폴더)
+    phases = data.sort_values('timestamp')[['thread_count', 'duration', 'phase_dir']].drop_duplicates(['thread_count', 'duration'], keep='last')
+    phases = phases.sort_values(['thread_count', 'duration'])
+    phase_labels = [f"Threads {t} / Duration {d}s" for t, d in zip(phases['thread_count'], phases['duration'])]
+    selected_phase = st.selectbox("Select Phase:", options=range(len(phase_labels)),
+                                  format_func=lambda i: phase_labels[i], index=len(phase_labels)-1)
+    phase_name = phases['phase_dir'].iloc[selected_phase]
+    phase_dir = os.path.join(selected_dir, phase_name)
+    series = load_timeseries(phase_dir)
+
+    if series is None or series.empty:
+        st.info("No time series data for the selected phase.")
+    else:
+        # 긴 단계는 구간 선택(확대) 후 축소본만 전송, 구간을 좁힐수록 세밀하게 표시
+        window = None
+        if len(series) > DEFAULT_MAX_POINTS:
+            first, last = int(series['second'].min()), int(series['second'].max())
+            window = st.slider("Zoom (elapsed seconds):", min_value=first, max_value=last, value=(first, last))
+        visible = select_window(series, 'second', window)
+        chart_series = downsample_frame(visible, 'second', ['rps', 'p50', 'p95', 'p99', 'error_rate'])
+        if len(chart_series) < len(visible):
+            st.caption(f"Showing {len(chart_series):,} of {len(visible):,} points (narrow the zoom range for more detail)")
+        st.plotly_chart(create_timeseries_chart(chart_series, phase_labels[selected_phase]), use_container_width=True)
+
+        resources = load_resources(phase_dir)
+        if resources is not None and not resources.empty and 'timestamp' in series.columns:
+            joined = join_with_timeseries(visible, resources)
+            joined = downsample_frame(joined, 'second', ['rps', 'cpu_pct', 'iowait_pct', 'mem_used_pct'])
+            st.plotly_chart(create_resource_chart(joined, f"Throughput vs Server Resources ({phase_labels[selected_phase]})"),
+                            use_container_width=True)
+
+    if 'degrading' in data.columns:
+        phase_rows = data[data['phase_dir'] == phase_name]
+        for reason in phase_rows.loc[phase_rows['degrading'] == True, 'degradation_reason']:
+            st.warning(f"⚠️ Degradation detected: {reason}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
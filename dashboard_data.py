@@ -0,0 +1,144 @@
+import os
+import json
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# 중첩 통계 블록 → 대시보드에서 쓰는 평탄화 컬럼 이름
+FLAT_COLUMNS = {
+    'response_time.min': 'min_response_time',
+    'response_time.max': 'max_response_time',
+    'response_time.mean': 'avg_response_time',
+    'response_time.median': 'median_response_time',
+    'response_time.90th_percentile': '90th_percentile',
+    'response_time.95th_percentile': '95th_percentile',
+    'response_time.99th_percentile': '99th_percentile',
+    'throughput.requests_per_second': 'requests_per_second',
+    'throughput.total_bytes': 'total_bytes',
+    'throughput.avg_bytes_per_request': 'avg_bytes_per_request',
+    'connect_time.mean': 'avg_connect_time',
+    'connect_time.95th_percentile': '95th_connect_time',
+    'connect_time.new_connection_rate': 'new_connection_rate',
+    'degradation.degrading': 'degrading',
+    'degradation.reason': 'degradation_reason',
+    'generator.saturated': 'generator_saturated'
+}
+
+# 평탄화하지 않는 가변 키 dict (에러 메시지, 응답 코드, 엔드포인트별 통계)
+NESTED_KEYS = ('endpoint_statistics', 'errors', 'response_codes')
+
+
+def get_run_mtime(base_dir: str) -> float:
+    """
+    실행 결과 폴더와 phase 폴더들의 최신 수정 시각
+    phase 폴더나 결과 파일이 새로 생기면 값이 바뀌므로 대시보드 캐시 키로 사용
+    """
+    latest = os.path.getmtime(base_dir)
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            if entry.is_dir() and entry.name.startswith('phase_'):
+                latest = max(latest, entry.stat().st_mtime)
+    return latest
+
+
+def find_target_dirs(base_dir: str) -> List[str]:
+    """다중 대상 실행의 대상별 결과 폴더 목록 (test_config.json이 있는 하위 폴더, 단일 대상 실행이면 빈 목록)"""
+    return [
+        os.path.join(base_dir, name) for name in sorted(os.listdir(base_dir))
+        if not name.startswith('phase_') and os.path.isfile(os.path.join(base_dir, name, 'test_config.json'))
+    ]
+
+
+def find_run_dirs(root: str = '.') -> List[str]:
+    """
+    대시보드에서 선택할 결과 폴더 목록 (오래된 순)
+    다중 대상 실행은 실행 폴더 대신 대상별 하위 폴더를 각각 포함
+    """
+    run_dirs = []
+    for name in sorted(os.listdir(root)):
+        path = os.path.relpath(os.path.join(root, name))
+        if name.startswith('stress_test_results') and os.path.isdir(path):
+            run_dirs.extend(find_target_dirs(path) or [path])
+    return run_dirs
+
+
+def parse_phase_folder(folder: str) -> Optional[Tuple[int, int]]:
+    """phase_threads_{threads}_duration_{duration}[_retryN] 폴더 이름에서 (쓰레드 수, 지속시간) 추출"""
+    parts = folder.split('_')
+    if len(parts) < 5 or parts[1] != 'threads' or parts[3] != 'duration':
+        return None
+    return int(parts[2]), int(parts[4])
+
+
+def read_phase_results(base_dir: str) -> List[Dict]:
+    """각 phase 폴더의 test_results_*.json을 읽어 레코드 목록으로 반환 (무효 단계 제외)"""
+    records = []
+    for folder in sorted(os.listdir(base_dir)):
+        phase = parse_phase_folder(folder)
+        if phase is None:
+            continue
+
+        phase_dir = os.path.join(base_dir, folder)
+        for stats_file in sorted(os.listdir(phase_dir)):
+            if stats_file.startswith('test_results_') and stats_file.endswith('.json'):
+                with open(os.path.join(phase_dir, stats_file), 'r', encoding='utf-8') as f:
+                    stats = json.load(f)
+                # 부하 발생기 포화로 무효 처리된 단계 제외
+                if not stats.get('valid', True):
+                    continue
+                stats['thread_count'], stats['duration'] = phase
+                # 재시도 단계(_retryN)도 실제 폴더를 열 수 있도록 폴더 이름 유지
+                stats['phase_dir'] = folder
+                stats['file_name'] = stats_file
+                records.append(stats)
+    return records
+
+
+def read_manifest_records(base_dir: str, entries: List[Dict]) -> List[Dict]:
+    """실행 매니페스트 항목이 가리키는 결과 JSON만 읽어 레코드 목록으로 반환 (무효 단계 제외)"""
+    records = []
+    for entry in entries:
+        if not entry.get('valid', True):
+            continue
+        with open(os.path.join(base_dir, entry['phase_dir'], entry['results_file']), 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+        stats['thread_count'] = entry['thread_count']
+        stats['duration'] = entry['duration']
+        stats['phase_dir'] = entry['phase_dir']
+        stats['file_name'] = entry['results_file']
+        records.append(stats)
+    return records
+
+
+def normalize_results(records: List[Dict]) -> Optional[pd.DataFrame]:
+    """
+    phase 레코드를 한 번에 평탄화하여 단계별 DataFrame 생성
+    중첩 통계(response_time.*, throughput.* 등)는 json_normalize로 컬럼화
+    """
+    if not records:
+        return None
+
+    flat_records = [{key: value for key, value in record.items() if key not in NESTED_KEYS} for record in records]
+    data = pd.json_normalize(flat_records, max_level=1).rename(columns=FLAT_COLUMNS)
+    data['timestamp'] = pd.to_datetime(data['timestamp'])
+    return data.sort_values('timestamp').reset_index(drop=True)
+
+
+def normalize_endpoint_results(records: List[Dict]) -> pd.DataFrame:
+    """phase × 엔드포인트 통계를 한 번의 리스트 변환으로 DataFrame 생성"""
+    rows = [
+        dict(stats, timestamp=record['timestamp'], thread_count=record['thread_count'],
+             duration=record['duration'], endpoint=endpoint)
+        for record in records
+        for endpoint, stats in record.get('endpoint_statistics', {}).items()
+    ]
+    endpoint_data = pd.DataFrame.from_records(rows)
+    if not endpoint_data.empty:
+        endpoint_data['timestamp'] = pd.to_datetime(endpoint_data['timestamp'])
+    return endpoint_data
+
+
+def load_run(base_dir: str) -> Tuple[Optional[pd.DataFrame], pd.DataFrame]:
+    """실행 폴더를 한 번 읽어 (단계별 DataFrame, 엔드포인트별 DataFrame) 반환"""
+    records = read_phase_results(base_dir)
+    return normalize_results(records), normalize_endpoint_results(records)
@@ -0,0 +1,195 @@
+import mmap
+import os
+import csv
+import json
+import random
+import re
+import threading
+import itertools
+from array import array
+from typing import Dict, List, Optional
+
+PLACEHOLDER_PATTERN = re.compile(r"\$\{(\w+)\}")
+
+
+class DataFeeder:
+    def __init__(self, file_path: str, mode: str = "round_robin", seed: Optional[int] = None):
+        """
+        요청별 값을 공급하는 데이터 피더 초기화
+        파일 전체를 메모리에 올리지 않고 mmap + 줄 시작 오프셋 인덱스만 유지
+        Args:
+            file_path: CSV(첫 줄 헤더) 또는 JSONL 피더 파일 경로
+            mode: "round_robin" 또는 "random"
+            seed: random 모드의 시드 (재현용)
+        """
+        if mode not in ("round_robin", "random"):
+            raise ValueError(f"지원하지 않는 피더 모드입니다: {mode}")
+
+        self.file_path = os.path.abspath(file_path)
+        self.mode = mode
+        self.format = "jsonl" if file_path.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+        self._file = open(self.file_path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = self._build_index()
+
+        if self.format == "csv":
+            header = self._read_line(0)
+            self.fields = next(csv.reader([header]))
+            self._first_row = 1
+        else:
+            self.fields = list(json.loads(self._read_line(0)).keys())
+            self._first_row = 0
+
+        self.record_count = len(self._offsets) - self._first_row
+        if self.record_count <= 0:
+            raise ValueError(f"피더 파일에 데이터가 없습니다: {file_path}")
+
+        self._counter = itertools.count()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._convert_lock = threading.Lock()
+
+    def _build_index(self) -> array:
+        """각 줄의 시작 바이트 오프셋 인덱스 생성 (빈 줄 제외)"""
+        offsets = array("Q")
+        size = len(self._mm)
+        pos = 0
+        while pos < size:
+            end = self._mm.find(b"\n", pos)
+            if end == -1:
+                end = size
+            if self._mm[pos:end].strip():
+                offsets.append(pos)
+            pos = end + 1
+        return offsets
+
+    def _read_line(self, index: int) -> str:
+        start = self._offsets[index]
+        end = self._mm.find(b"\n", start)
+        if end == -1:
+            end = len(self._mm)
+        return self._mm[start:end].decode("utf-8").rstrip("\r")
+
+    def get_record(self, index: int) -> Dict[str, str]:
+        """index 번째 레코드를 dict로 반환"""
+        line = self._read_line(self._first_row + index % self.record_count)
+        if self.format == "csv":
+            return dict(zip(self.fields, next(csv.reader([line]))))
+        return {key: str(value) for key, value in json.loads(line).items()}
+
+    def next_record(self) -> Dict[str, str]:
+        """모드에 따라 다음 레코드 반환 (스레드 안전)"""
+        if self.mode == "random":
+            with self._lock:
+                index = self._random.randrange(self.record_count)
+        else:
+            index = next(self._counter)
+        return self.get_record(index)
+
+    def iter_records(self):
+        """파일 순서대로 레코드 순회 (스트리밍)"""
+        for index in range(self.record_count):
+            yield self.get_record(index)
+
+    def jmeter_csv_path(self) -> str:
+        """
+        JMeter CSV Data Set에서 읽을 CSV 경로 반환
+        JSONL인 경우 원본 옆에 한 번만 CSV로 변환하고, 원본 크기/수정 시각이 같으면 재사용
+        """
+        if self.format == "csv":
+            return self.file_path
+
+        stat = os.stat(self.file_path)
+        prefix = f"{self.file_path}.jmeter_"
+        csv_path = f"{prefix}{stat.st_size}_{stat.st_mtime_ns}.csv"
+        # 다중 대상 실행에서 여러 캠페인이 동시에 JMX를 만들 수 있으므로 변환은 한 번에 하나만
+        with self._convert_lock:
+            if not os.path.exists(csv_path):
+                temp_file = csv_path + ".tmp"
+                with open(temp_file, "w", encoding="utf-8", newline="") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(self.fields)
+                    for record in self.iter_records():
+                        writer.writerow([record.get(field, "") for field in self.fields])
+                os.replace(temp_file, csv_path)
+                # 원본이 바뀌기 전의 변환 결과 정리
+                directory = os.path.dirname(csv_path)
+                for name in os.listdir(directory):
+                    path = os.path.join(directory, name)
+                    if path.startswith(prefix) and path.endswith(".csv") and path != csv_path:
+                        os.remove(path)
+        return csv_path
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+def apply_placeholders(values: Dict[str, str], fields: List[str]) -> Dict[str, str]:
+    """피더 컬럼과 이름이 같은 키의 값을 ${컬럼} 플레이스홀더로 교체"""
+    return {key: (f"${{{key}}}" if key in fields else value) for key, value in values.items()}
+
+
+def template_body(body: str, fields: List[str]) -> str:
+    """JSON 문자열 body에 피더 플레이스홀더 적용"""
+    if not body:
+        return body
+    return json.dumps(apply_placeholders(json.loads(body), fields), ensure_ascii=False)
+
+
+def render(template: str, record: Dict[str, str]) -> str:
+    """${컬럼} 플레이스홀더를 레코드 값으로 치환 (JMeter 변수 문법과 동일)"""
+    if not template or not record:
+        return template
+    return PLACEHOLDER_PATTERN.sub(lambda m: record.get(m.group(1), m.group(0)), template)
+
+
+def create_feeder(config: Dict) -> Optional[DataFeeder]:
+    """설정에서 데이터 피더 생성 (비활성화 시 None)"""
+    feeder_config = config.get("data_feeder", {})
+    if not feeder_config.get("enabled", False):
+        return None
+
+    feeder = DataFeeder(
+        feeder_config["file"],
+        mode=feeder_config.get("mode", "round_robin"),
+        seed=feeder_config.get("seed")
+    )
+    print(f"📂 데이터 피더 로드: {feeder.file_path} ({feeder.record_count}건, {feeder.mode})")
+    return feeder
+
+
+def create_csv_data_set_xml(feeder: DataFeeder) -> str:
+    """JMX에 삽입할 CSV Data Set 설정 요소 생성"""
+    csv_path = feeder.jmeter_csv_path()
+    variable_names = ",".join(feeder.fields)
+
+    if feeder.mode == "random":
+        # jmeter-plugins Random CSV Data Set Config 필요
+        return f'''
+      <com.blazemeter.jmeter.RandomCSVDataSetConfig guiclass="com.blazemeter.jmeter.RandomCSVDataSetConfigGui" testclass="com.blazemeter.jmeter.RandomCSVDataSetConfig" testname="Data Feeder" enabled="true">
+        <stringProp name="filename">{csv_path}</stringProp>
+        <stringProp name="fileEncoding">UTF-8</stringProp>
+        <stringProp name="delimiter">,</stringProp>
+        <stringProp name="variableNames">{variable_names}</stringProp>
+        <boolProp name="ignoreFirstLine">true</boolProp>
+        <boolProp name="randomOrder">true</boolProp>
+        <boolProp name="rewindOnTheEndOfList">true</boolProp>
+        <boolProp name="independentListPerThread">false</boolProp>
+      </com.blazemeter.jmeter.RandomCSVDataSetConfig>
+      <hashTree/>'''
+
+    return f'''
+      <CSVDataSet guiclass="TestBeanGUI" testclass="CSVDataSet" testname="Data Feeder" enabled="true">
+        <stringProp name="filename">{csv_path}</stringProp>
+        <stringProp name="fileEncoding">UTF-8</stringProp>
+        <stringProp name="variableNames">{variable_names}</stringProp>
+        <boolProp name="ignoreFirstLine">true</boolProp>
+        <stringProp name="delimiter">,</stringProp>
+        <boolProp name="quotedData">true</boolProp>
+        <boolProp name="recycle">true</boolProp>
+        <boolProp name="stopThread">false</boolProp>
+        <stringProp name="shareMode">shareMode.all</stringProp>
+      </CSVDataSet>
+      <hashTree/>'''
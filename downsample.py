@@ -0,0 +1,97 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 시리즈 하나당 Plotly로 보내는 최대 점 수
+DEFAULT_MAX_POINTS = 2000
+
+
+def _as_float(values) -> np.ndarray:
+    """숫자/시각 값을 면적 계산용 float 배열로 변환"""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype("datetime64[ms]").astype(np.int64)
+    return values.astype(float)
+
+
+def lttb_indices(x, y, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: 모양(피크 포함)을 유지하는 threshold개 점의 인덱스
+    첫/마지막 점은 항상 포함, 나머지 구간마다 직전 선택점과 다음 구간 평균으로 이루는 삼각형 면적이 최대인 점 선택
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = _as_float(x)
+    y = _as_float(y)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_end = max(next_end, next_start + 1)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = np.nanmean(y[next_start:next_end]) if not np.isnan(y[next_start:next_end]).all() else 0.0
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, threshold: int) -> np.ndarray:
+    """구간별 최소/최대 점만 남기는 인덱스 (스파이크 보존, threshold/2개 구간)"""
+    n = len(y)
+    if threshold >= n or threshold < 2:
+        return np.arange(n)
+
+    y = _as_float(y)
+    selected = [0, n - 1]
+    for bucket in np.array_split(np.arange(n), threshold // 2):
+        values = np.nan_to_num(y[bucket], nan=0.0)
+        selected.extend((bucket[np.argmin(values)], bucket[np.argmax(values)]))
+    return np.unique(selected)
+
+
+def downsample_frame(df: pd.DataFrame, x: str, columns: List[str], max_points: int = DEFAULT_MAX_POINTS,
+                     method: str = "lttb", by: Optional[str] = None) -> pd.DataFrame:
+    """
+    차트에 그릴 DataFrame 축소
+    각 y 컬럼별로 선택된 인덱스의 합집합만 남기므로 같은 x를 공유하는 여러 트레이스에 그대로 사용 가능
+    Args:
+        df: x 기준으로 정렬된 DataFrame
+        x: x축 컬럼
+        columns: y축 컬럼 목록
+        max_points: 시리즈(및 by 그룹)당 최대 점 수
+        method: "lttb" 또는 "minmax"
+        by: 그룹 컬럼 (px의 color 등), 그룹별로 따로 축소
+    """
+    if by is not None:
+        groups = [downsample_frame(group, x, columns, max_points, method) for _, group in df.groupby(by, sort=False)]
+        return pd.concat(groups) if groups else df
+
+    if len(df) <= max_points:
+        return df
+
+    selected = set()
+    for column in columns:
+        if method == "minmax":
+            indices = minmax_indices(df[column].values, max_points)
+        else:
+            indices = lttb_indices(df[x].values, df[column].values, max_points)
+        selected.update(indices.tolist())
+    return df.iloc[sorted(selected)]
+
+
+def select_window(df: pd.DataFrame, x: str, window: Optional[Tuple]) -> pd.DataFrame:
+    """확대 구간(x 범위)만 남김 - 구간을 좁히면 같은 max_points 안에서 더 세밀한 점이 표시됨"""
+    if window is None:
+        return df
+    low, high = window
+    return df[(df[x] >= low) & (df[x] <= high)]
@@ -0,0 +1,112 @@
+import multiprocessing
+from typing import Dict, List, Optional, Tuple
+
+from data_feeder import create_feeder
+from error_taxonomy import get_error_sampling
+from generator_monitor import start_generator_monitor
+from native_engine import run_native_test
+
+
+def _engine_main(channel, config: Dict):
+    """
+    엔진 프로세스 본체: 단계 명령을 받아 네이티브 엔진 실행을 반복
+    커넥션 캐시를 단계 간 유지하므로 다음 단계는 이전 단계의 keep-alive 커넥션으로 바로 시작
+    """
+    feeder = create_feeder(config)
+    error_sampling = get_error_sampling(config)
+    connections = {}
+    try:
+        while True:
+            message = channel.recv()
+            if message["command"] == "stop":
+                break
+
+            phase = message["phase"]
+            # 부하 발생기 감시는 실제로 부하를 만드는 이 프로세스의 CPU/스케줄러 지연을 측정
+            generator_monitor = start_generator_monitor(config, phase["results_dir"])
+            success, result_file = run_native_test(
+                config["server_config"], phase["results_dir"], phase["thread_count"], phase["duration"],
+                phase["request_specs"], feeder, phase["scenario_steps"], phase["load_profile"], connections,
+                error_sampling
+            )
+            generator_stats = generator_monitor.stop() if generator_monitor else None
+            channel.send({"success": success, "result_file": result_file, "generator_stats": generator_stats})
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        for conn in connections.values():
+            conn.close()
+        if feeder:
+            feeder.close()
+
+
+class EngineProcess:
+    def __init__(self, config: Dict):
+        """
+        캠페인 동안 살아 있는 네이티브 엔진 프로세스
+        단계마다 프로세스/커넥션을 새로 만들지 않고 제어 채널(Pipe)로 단계 파라미터만 전달
+        Args:
+            config: 대상별 설정 (server_config, data_feeder, generator_monitor 사용)
+        """
+        self._config = config
+        self._spawn()
+
+    def _spawn(self):
+        # 플랫폼과 관계없이 spawn (Windows 기본값과 같고, 다중 대상 실행의 스레드에서 fork하지 않음)
+        context = multiprocessing.get_context("spawn")
+        self._channel, child_channel = context.Pipe()
+        self._process = context.Process(target=_engine_main, args=(child_channel, self._config), daemon=True)
+
+    def start(self):
+        self._process.start()
+        return self
+
+    def _restart(self):
+        """엔진 프로세스가 비정상 종료된 경우 다음 단계를 위해 새 프로세스로 교체 (커넥션 캐시는 새로 시작)"""
+        self._channel.close()
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join()
+        self._spawn()
+        self.start()
+
+    def run_phase(self, results_dir: str, thread_count: int, duration: int, request_specs: List[Dict],
+                  scenario_steps: Optional[List[Dict]] = None,
+                  load_profile: Optional[Dict] = None) -> Tuple[bool, Optional[str], Optional[Dict]]:
+        """
+        단계 하나 실행 (run_native_test와 같은 파라미터)
+        :return: (성공 여부, 결과 파일 경로, 부하 발생기 감시 요약)
+        """
+        # 엔진 프로세스가 이미 종료된 경우 send에서도 BrokenPipeError(OSError)가 발생
+        try:
+            self._channel.send({"command": "run", "phase": {
+                "results_dir": results_dir,
+                "thread_count": thread_count,
+                "duration": duration,
+                "request_specs": request_specs,
+                "scenario_steps": scenario_steps,
+                "load_profile": load_profile
+            }})
+            reply = self._channel.recv()
+        except (EOFError, OSError):
+            print("❌ 엔진 프로세스가 종료되었습니다 (새 프로세스로 다시 시작)")
+            self._restart()
+            return False, None, None
+        return reply["success"], reply["result_file"], reply["generator_stats"]
+
+    def stop(self):
+        # is_alive() 확인 후에도 프로세스가 종료될 수 있으므로 send 실패는 무시
+        try:
+            self._channel.send({"command": "stop"})
+        except (EOFError, OSError):
+            pass
+        self._process.join()
+        self._channel.close()
+
+
+def start_engine_process(config: Dict) -> Optional[EngineProcess]:
+    """engine_config.type이 native이고 persistent가 켜져 있으면 장기 실행 엔진 프로세스 시작 (아니면 None)"""
+    engine_config = config.get("engine_config", {})
+    if engine_config.get("type", "jmeter") != "native" or not engine_config.get("persistent", False):
+        return None
+    return EngineProcess(config).start()
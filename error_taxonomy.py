@@ -0,0 +1,171 @@
+import html
+import json
+import os
+import random
+import threading
+from typing import Dict, List
+
+import pandas as pd
+
+ERROR_BREAKDOWN_FILE = "phase_errors.csv"
+ERROR_SAMPLES_FILE = "error_samples.jsonl"
+
+DEFAULT_ERROR_SAMPLING = {
+    # 단계마다 보관할 실패 응답 수 (저수지 샘플링)
+    "reservoir_size": 50,
+    # 응답 body 최대 저장 길이
+    "max_body_bytes": 2048
+}
+
+# (분류, 코드/메시지에 포함된 문구) - 위에서부터 먼저 맞는 분류 사용
+# JMeter("Non HTTP response message: Read timed out")와 네이티브 엔진(예외 이름/메시지)을 모두 처리
+ERROR_PATTERNS = [
+    ("connect_timeout", ("connect timed out", "connecttimeout")),
+    ("read_timeout", ("timed out", "timeout")),
+    ("connection_refused", ("refused",)),
+    ("connection_reset", ("reset", "broken pipe", "closed connection", "remotedisconnected", "aborted")),
+]
+
+
+def get_error_sampling(config: Dict) -> Dict:
+    """error_sampling 설정에 기본값 채우기"""
+    error_sampling = dict(DEFAULT_ERROR_SAMPLING)
+    error_sampling.update(config.get("error_sampling", {}))
+    return error_sampling
+
+
+def classify_error(code, message) -> str:
+    """
+    실패 샘플 분류
+    HTTP 4xx/5xx는 http_<코드>, HTTP 응답은 정상인데 실패면 assertion, 그 외는 연결 오류 종류
+    """
+    code = str(code)
+    if code.isdigit():
+        return f"http_{code}" if int(code) >= 400 else "assertion"
+    text = f"{code} {message}".lower()
+    for category, patterns in ERROR_PATTERNS:
+        if any(pattern in text for pattern in patterns):
+            return category
+    return "other"
+
+
+def compute_error_breakdown(df: pd.DataFrame, start_ms: int, window_seconds: float = 1) -> pd.DataFrame:
+    """
+    엔드포인트 × 시간 구간 × 오류 분류별 실패 수
+    :param start_ms: 구간 기준 시각 (단계 첫 샘플 timeStamp)
+    :return: second, label, category, count 컬럼 DataFrame
+    """
+    failed = df[df['success'] == False]
+    if failed.empty:
+        return pd.DataFrame(columns=["second", "label", "category", "count"])
+
+    # 같은 (코드, 메시지) 조합은 한 번만 분류
+    pairs = failed[['responseCode', 'responseMessage']].astype(str).drop_duplicates()
+    categories = {(code, message): classify_error(code, message) for code, message in pairs.itertuples(index=False)}
+    category = [categories[pair] for pair in zip(failed['responseCode'].astype(str), failed['responseMessage'].astype(str))]
+
+    window_ms = window_seconds * 1000
+    breakdown = pd.DataFrame({
+        "second": ((failed['timeStamp'] - start_ms) // window_ms * window_seconds).astype('int64'),
+        "label": failed['label'],
+        "category": category
+    }).groupby(["second", "label", "category"]).size().rename("count").reset_index()
+    return breakdown
+
+
+def summarize_error_breakdown(breakdown: pd.DataFrame) -> Dict[str, Dict[str, int]]:
+    """엔드포인트별 오류 분류 합계 {엔드포인트: {분류: 수}}"""
+    totals = breakdown.groupby(["label", "category"])["count"].sum()
+    summary: Dict[str, Dict[str, int]] = {}
+    for (label, category), count in totals.items():
+        summary.setdefault(label, {})[category] = int(count)
+    return summary
+
+
+def save_error_breakdown(df: pd.DataFrame, results_dir: str, start_ms: int, window_seconds: float = 1):
+    """
+    오류 분류 시계열을 phase 폴더에 저장
+    :return: (저장 파일 경로, 엔드포인트별 분류 합계)
+    """
+    breakdown = compute_error_breakdown(df, start_ms, window_seconds)
+    breakdown_file = os.path.join(results_dir, ERROR_BREAKDOWN_FILE)
+    breakdown.to_csv(breakdown_file, index=False)
+    return breakdown_file, summarize_error_breakdown(breakdown)
+
+
+class ErrorReservoir:
+    def __init__(self, reservoir_size: int, max_body_bytes: int):
+        """
+        실패 응답 저수지 샘플 (Algorithm R)
+        실패가 몇 건이든 모든 실패가 같은 확률로 남도록 reservoir_size 건만 보관
+        """
+        self.reservoir_size = reservoir_size
+        self.max_body_bytes = max_body_bytes
+        self.seen = 0
+        self.samples: List[Dict] = []
+        self._random = random.Random()
+        self._lock = threading.Lock()
+
+    def offer(self, timestamp: int, label: str, code: str, message: str, body: bytes):
+        with self._lock:
+            self.seen += 1
+            if len(self.samples) < self.reservoir_size:
+                slot = len(self.samples)
+                self.samples.append(None)
+            else:
+                slot = self._random.randrange(self.seen)
+                if slot >= self.reservoir_size:
+                    return
+        # body 디코딩은 잠금 밖에서 (자리만 확보)
+        self.samples[slot] = {
+            "timestamp": timestamp,
+            "label": label,
+            "code": code,
+            "message": message,
+            "category": classify_error(code, message),
+            "body": body[:self.max_body_bytes].decode('utf-8', errors='replace')
+        }
+
+    def save(self, results_dir: str) -> str:
+        samples_file = os.path.join(results_dir, ERROR_SAMPLES_FILE)
+        with open(samples_file, 'w', encoding='utf-8') as f:
+            for sample in self.samples:
+                if sample is not None:
+                    f.write(json.dumps(sample, ensure_ascii=False) + "\n")
+        return samples_file
+
+
+def create_error_sampler_xml(results_dir: str, error_sampling: Dict) -> str:
+    """
+    JMeter용 실패 응답 저수지 샘플러 (JSR223 Listener, Groovy)
+    JTL(CSV)에는 응답 body가 남지 않으므로 네이티브 엔진과 같은 error_samples.jsonl을 직접 기록
+    """
+    samples_file = os.path.abspath(os.path.join(results_dir, ERROR_SAMPLES_FILE)).replace("\\", "/")
+    script = f'''import groovy.json.JsonOutput
+if (!prev.isSuccessful()) {{
+    synchronized (props) {{
+        def seen = (props.get('errorSamplesSeen') ?: 0) + 1
+        props.put('errorSamplesSeen', seen)
+        def samples = props.get('errorSamples') ?: []
+        props.put('errorSamples', samples)
+        def slot = samples.size() < {error_sampling["reservoir_size"]} ? samples.size() : new Random().nextInt(seen)
+        if (slot < {error_sampling["reservoir_size"]}) {{
+            def body = prev.getResponseDataAsString()
+            def sample = [timestamp: prev.getTimeStamp(), label: prev.getSampleLabel(), code: prev.getResponseCode(),
+                          message: prev.getResponseMessage(),
+                          body: body.length() > {error_sampling["max_body_bytes"]} ? body.substring(0, {error_sampling["max_body_bytes"]}) : body]
+            if (slot == samples.size()) {{ samples.add(sample) }} else {{ samples[slot] = sample }}
+            new File('{samples_file}').text = samples.collect {{ JsonOutput.toJson(it) }}.join('\\n') + '\\n'
+        }}
+    }}
+}}'''
+    return f'''
+      <JSR223Listener guiclass="TestBeanGUI" testclass="JSR223Listener" testname="Error Reservoir" enabled="true">
+        <stringProp name="scriptLanguage">groovy</stringProp>
+        <stringProp name="parameters"></stringProp>
+        <stringProp name="filename"></stringProp>
+        <stringProp name="cacheKey">true</stringProp>
+        <stringProp name="script">{html.escape(script, quote=False)}</stringProp>
+      </JSR223Listener>
+      <hashTree/>'''
+
@@ -0,0 +1,301 @@
+import csv
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from resource_sampler import read_proc_sample
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+GENERATOR_FILE = "generator_metrics.csv"
+
+GENERATOR_FIELDS = [
+    "timestamp", "cpu_pct", "process_cpu_pct", "scheduler_lag_ms",
+    "established", "time_wait", "port_usage_pct", "send_queue_bytes"
+]
+
+DEFAULT_MONITOR_CONFIG = {
+    "enabled": True,
+    "interval_seconds": 1,
+    "max_cpu_pct": 90,
+    "max_scheduler_lag_ms": 100,
+    "max_port_usage_pct": 80,
+    "saturation_pause_seconds": 60,
+    "max_saturation_retries": 2
+}
+
+# /proc/net/tcp 상태 코드
+TCP_ESTABLISHED = "01"
+TCP_TIME_WAIT = "06"
+
+# Windows 기본 동적 포트 범위
+WINDOWS_PORT_RANGE = (49152, 65535)
+
+
+def get_monitor_config(config: Dict) -> Dict:
+    """generator_monitor 설정에 기본값 채우기"""
+    monitor_config = dict(DEFAULT_MONITOR_CONFIG)
+    monitor_config.update(config.get("generator_monitor", {}))
+    return monitor_config
+
+
+def _ephemeral_port_range(proc_root: str = "/proc"):
+    try:
+        with open(os.path.join(proc_root, "sys/net/ipv4/ip_local_port_range")) as f:
+            low, high = (int(v) for v in f.read().split())
+            return low, high
+    except (OSError, ValueError):
+        return 32768, 60999
+
+
+def read_socket_stats(proc_root: str = "/proc") -> Dict:
+    """
+    /proc/net/tcp(6)에서 소켓 상태 집계
+    :return: ESTABLISHED/TIME_WAIT 수, 사용 중인 임시 포트 수, 송신 큐 적체 바이트
+    """
+    low, high = _ephemeral_port_range(proc_root)
+    established = time_wait = send_queue = 0
+    ephemeral_ports = set()
+
+    for name in ("net/tcp", "net/tcp6"):
+        path = os.path.join(proc_root, name)
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            next(f)
+            for line in f:
+                parts = line.split()
+                state = parts[3]
+                if state == TCP_ESTABLISHED:
+                    established += 1
+                elif state == TCP_TIME_WAIT:
+                    time_wait += 1
+                else:
+                    continue
+                local_port = int(parts[1].rsplit(":", 1)[1], 16)
+                if low <= local_port <= high:
+                    ephemeral_ports.add(local_port)
+                send_queue += int(parts[4].split(":")[0], 16)
+
+    return {
+        "established": established,
+        "time_wait": time_wait,
+        "port_usage_pct": round(len(ephemeral_ports) / (high - low + 1) * 100, 2),
+        "send_queue_bytes": send_queue
+    }
+
+
+def read_socket_stats_psutil() -> Dict:
+    """/proc이 없는 환경(Windows)용 소켓 상태 집계 (송신 큐 적체는 제공되지 않아 0)"""
+    low, high = WINDOWS_PORT_RANGE if os.name == "nt" else _ephemeral_port_range()
+    established = time_wait = 0
+    ephemeral_ports = set()
+    try:
+        connections = psutil.net_connections(kind="tcp")
+    except psutil.AccessDenied:
+        connections = []
+    for conn in connections:
+        if conn.status == psutil.CONN_ESTABLISHED:
+            established += 1
+        elif conn.status == psutil.CONN_TIME_WAIT:
+            time_wait += 1
+        else:
+            continue
+        if conn.laddr and low <= conn.laddr.port <= high:
+            ephemeral_ports.add(conn.laddr.port)
+
+    return {
+        "established": established,
+        "time_wait": time_wait,
+        "port_usage_pct": round(len(ephemeral_ports) / (high - low + 1) * 100, 2),
+        "send_queue_bytes": 0
+    }
+
+
+def read_cpu_times() -> Dict:
+    """호스트 CPU 누적 시간 (/proc, 없으면 psutil)"""
+    if os.path.exists("/proc/stat"):
+        sample = read_proc_sample()
+        return {"timestamp": sample["timestamp"], "total": sample["cpu_total"],
+                "idle": sample["cpu_idle"] + sample["cpu_iowait"]}
+    times = psutil.cpu_times()
+    return {"timestamp": int(time.time() * 1000), "total": sum(times),
+            "idle": times.idle + getattr(times, "iowait", 0)}
+
+
+def _proc_tree_cpu_seconds(pid: int, proc_root: str = "/proc") -> Optional[float]:
+    # psutil이 없는 Linux: /proc/<pid>/stat의 ppid로 하위 프로세스를 찾아 utime+stime 합산
+    usage, children = {}, {}
+    for name in os.listdir(proc_root):
+        if not name.isdigit():
+            continue
+        try:
+            with open(os.path.join(proc_root, name, "stat")) as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        usage[int(name)] = int(fields[11]) + int(fields[12])
+        children.setdefault(int(fields[1]), []).append(int(name))
+    if pid not in usage:
+        return None
+
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        total += usage.get(current, 0)
+        pending.extend(children.get(current, []))
+    return total / os.sysconf("SC_CLK_TCK")
+
+
+def process_tree_cpu_seconds(pid: int) -> Optional[float]:
+    """
+    pid와 모든 하위 프로세스의 누적 CPU 시간 (초, 프로세스가 끝났으면 None)
+    JMeter는 셸/jmeter.bat 아래의 JVM이 부하를 만들므로 하위 프로세스까지 합산
+    """
+    if pid == os.getpid():
+        return time.process_time()
+    if psutil is None:
+        return _proc_tree_cpu_seconds(pid)
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return None
+    total = 0.0
+    for process in processes:
+        try:
+            times = process.cpu_times()
+        except psutil.NoSuchProcess:
+            continue
+        total += times.user + times.system
+    return total
+
+
+class GeneratorMonitor:
+    def __init__(self, results_dir: str, monitor_config: Dict):
+        """
+        부하 발생기(이 장비) 자체의 포화 여부 감시
+        CPU, 부하 발생 프로세스 CPU, 스케줄러 지연(sleep 초과 시간), 소켓/임시 포트 사용량, 송신 큐 적체를 수집
+        /proc이 있으면 /proc, 없으면(Windows) psutil 사용
+        부하 발생 프로세스는 기본이 이 프로세스(네이티브 엔진)이고, JMeter는 attach로 JVM 프로세스를 지정
+        (스케줄러 지연은 이 감시 스레드 기준이므로 외부 JVM에서는 호스트 실행 대기열 지연의 근사값)
+        Args:
+            results_dir: 결과 저장 디렉토리 (phase 폴더)
+            monitor_config: get_monitor_config 결과
+        """
+        self.output_file = os.path.join(results_dir, GENERATOR_FILE)
+        self.config = monitor_config
+        self.pid = os.getpid()
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        interval = self.config["interval_seconds"]
+        read_sockets = read_socket_stats if os.path.exists("/proc/net/tcp") else read_socket_stats_psutil
+        previous = read_cpu_times()
+        pid = self.pid
+        previous_process = process_tree_cpu_seconds(pid)
+        expected = time.monotonic() + interval
+
+        with open(self.output_file, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=GENERATOR_FIELDS)
+            writer.writeheader()
+            while not self._stop.wait(max(expected - time.monotonic(), 0)):
+                # 예정 시각보다 늦게 깨어난 만큼이 스케줄러(및 GIL) 지연
+                lag_ms = max(time.monotonic() - expected, 0) * 1000
+                expected = time.monotonic() + interval
+
+                if self.pid != pid:
+                    # 외부 부하 발생기(JMeter JVM)가 시작되면 그 프로세스 트리로 전환
+                    pid = self.pid
+                    previous_process = process_tree_cpu_seconds(pid)
+                current = read_cpu_times()
+                current_process = process_tree_cpu_seconds(pid)
+                cpu_delta = max(current["total"] - previous["total"], 1e-6)
+                idle_delta = current["idle"] - previous["idle"]
+                elapsed = max((current["timestamp"] - previous["timestamp"]) / 1000, 1e-3)
+                process_delta = (current_process - previous_process
+                                 if current_process is not None and previous_process is not None else 0)
+
+                sample = {
+                    "timestamp": current["timestamp"],
+                    "cpu_pct": round((cpu_delta - idle_delta) / cpu_delta * 100, 2),
+                    "process_cpu_pct": round(process_delta / elapsed / (os.cpu_count() or 1) * 100, 2),
+                    "scheduler_lag_ms": round(lag_ms, 2)
+                }
+                sample.update(read_sockets())
+                writer.writerow(sample)
+                f.flush()
+                self.samples.append(sample)
+                previous = current
+                if current_process is not None:
+                    previous_process = current_process
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def attach(self, pid: int):
+        """부하를 만드는 외부 프로세스(JMeter 실행 셸/JVM) 지정, 하위 프로세스 CPU까지 합산"""
+        self.pid = pid
+
+    def stop(self) -> Dict:
+        """수집 종료 후 요약 및 포화 판정 반환"""
+        self._stop.set()
+        self._thread.join()
+        return summarize_generator_samples(self.samples, self.config)
+
+
+def summarize_generator_samples(samples, monitor_config: Dict) -> Dict:
+    """
+    부하 발생기 지표 요약
+    p95 CPU, p95 스케줄러 지연, 최대 임시 포트 사용률 중 하나라도 한도를 넘으면 saturated
+    """
+    if not samples:
+        return {"saturated": False, "reasons": [], "samples": 0}
+
+    cpu = np.array([s["cpu_pct"] for s in samples])
+    process_cpu = np.array([s["process_cpu_pct"] for s in samples])
+    lag = np.array([s["scheduler_lag_ms"] for s in samples])
+    ports = np.array([s["port_usage_pct"] for s in samples])
+    send_queue = np.array([s["send_queue_bytes"] for s in samples])
+
+    summary = {
+        "samples": len(samples),
+        "cpu_p95": float(np.percentile(cpu, 95)),
+        "process_cpu_p95": float(np.percentile(process_cpu, 95)),
+        "scheduler_lag_p95_ms": float(np.percentile(lag, 95)),
+        "max_port_usage_pct": float(ports.max()),
+        "max_established": int(max(s["established"] for s in samples)),
+        "max_time_wait": int(max(s["time_wait"] for s in samples)),
+        "max_send_queue_bytes": int(send_queue.max()),
+        "reasons": []
+    }
+
+    if summary["cpu_p95"] > monitor_config["max_cpu_pct"]:
+        summary["reasons"].append(f"부하 발생기 CPU p95 {summary['cpu_p95']:.1f}% > {monitor_config['max_cpu_pct']}%")
+    if summary["scheduler_lag_p95_ms"] > monitor_config["max_scheduler_lag_ms"]:
+        summary["reasons"].append(f"스케줄러 지연 p95 {summary['scheduler_lag_p95_ms']:.1f}ms > {monitor_config['max_scheduler_lag_ms']}ms")
+    if summary["max_port_usage_pct"] > monitor_config["max_port_usage_pct"]:
+        summary["reasons"].append(f"임시 포트 사용률 {summary['max_port_usage_pct']:.1f}% > {monitor_config['max_port_usage_pct']}%")
+
+    summary["saturated"] = bool(summary["reasons"])
+    return summary
+
+
+def start_generator_monitor(config: Dict, results_dir: str) -> Optional[GeneratorMonitor]:
+    """설정에 따라 부하 발생기 감시 시작 (비활성화 시 None)"""
+    monitor_config = get_monitor_config(config)
+    if not monitor_config["enabled"]:
+        return None
+    if not os.path.exists("/proc/stat") and psutil is None:
+        print("⚠️ /proc과 psutil을 사용할 수 없어 부하 발생기 감시를 건너뜁니다 (pip install psutil)")
+        return None
+    return GeneratorMonitor(results_dir, monitor_config).start()
@@ -0,0 +1,169 @@
+import argparse
+import io
+import mmap
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from result_storage import CHUNK_BYTES, CODEC_EXTENSIONS, find_raw_file, open_raw_file
+
+JTL_INDEX_FILE = "jtl_index.npz"
+JTL_INDEX_ROWS_FILE = "jtl_index_rows.npy"
+# 원본과 함께 관리(보존 기간 삭제 등)할 인덱스 파일
+JTL_INDEX_FILES = (JTL_INDEX_FILE, JTL_INDEX_ROWS_FILE)
+
+# 행별 JTL 바이트 구간 (버킷 순서로 정렬, 행당 12바이트)
+ROW_DTYPE = np.dtype([("start", np.int64), ("length", np.uint32)])
+
+
+def _line_offsets(jtl_file: str) -> np.ndarray:
+    """
+    JTL 각 줄의 시작 바이트 오프셋 (헤더 포함, 마지막 값은 파일 끝)
+    압축 파일도 읽을 수 있도록 청크 단위로 읽으며 계산 (오프셋은 압축 해제 기준)
+    """
+    chunks = [np.zeros(1, dtype=np.int64)]
+    size = 0
+    with open_raw_file(jtl_file) as f:
+        while True:
+            chunk = f.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            chunks.append(np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == ord("\n")).astype(np.int64) + size + 1)
+            size += len(chunk)
+    offsets = np.concatenate(chunks)
+    if size == 0:
+        return offsets
+    if offsets[-1] != size:
+        offsets = np.append(offsets, size)
+    return offsets
+
+
+def _read_ranges(jtl_file: str, ranges) -> bytes:
+    """
+    JTL에서 (시작, 끝) 바이트 구간들만 읽기
+    일반 파일은 메모리 매핑, 압축 파일은 순서대로 압축을 풀며 앞으로만 이동
+    """
+    if not jtl_file.endswith(tuple(CODEC_EXTENSIONS.values())):
+        with open(jtl_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return b"".join(mm[start:end] for start, end in ranges)
+
+    parts = []
+    position = 0
+    with open_raw_file(jtl_file) as f:
+        for start, end in ranges:
+            while position < start:
+                position += len(f.read(min(CHUNK_BYTES, start - position)))
+            parts.append(f.read(end - start))
+            position = end
+    return b"".join(parts)
+
+
+def build_jtl_index(jtl_file: str, results_dir: str, df: pd.DataFrame) -> Optional[str]:
+    """
+    JTL 드릴다운용 보조 인덱스 저장
+    행을 (단계 시작 기준 초, 라벨, 응답 코드, 실패 여부) 버킷 순으로 정렬해 행별 바이트 구간만 jtl_index_rows.npy에 두고,
+    jtl_index.npz에는 버킷별 (키, 행 범위) 표만 저장 (조회 시 행 파일은 메모리 매핑으로 필요한 버킷만 읽음)
+    :param df: 분석에 사용한 JTL 전체 DataFrame (파일의 행 순서 그대로)
+    :return: 인덱스 파일 경로, 줄 수가 행 수와 다르면(값 안의 줄바꿈 등) None
+    """
+    offsets = _line_offsets(jtl_file)
+    if len(offsets) - 2 != len(df):
+        print(f"⚠️ JTL 줄 수와 샘플 수가 달라 드릴다운 인덱스를 만들지 않습니다: {jtl_file}")
+        return None
+
+    label_ids, labels = pd.factorize(df['label'].astype(str))
+    code_ids, codes = pd.factorize(df['responseCode'].astype(str))
+    start = int(df['timeStamp'].min()) if len(df) else 0
+    second = ((df['timeStamp'].to_numpy() - start) // 1000).astype(np.int32)
+    failed = (df['success'] != True).to_numpy()
+
+    # lexsort는 마지막 키가 1순위
+    order = np.lexsort((failed, code_ids, label_ids, second))
+    keys = np.stack([second[order], label_ids[order], code_ids[order], failed[order]]).astype(np.int64)
+    if len(order):
+        first = np.concatenate(([0], np.flatnonzero((np.diff(keys, axis=1) != 0).any(axis=0)) + 1))
+    else:
+        first = np.zeros(0, dtype=np.int64)
+
+    rows = np.empty(len(order), dtype=ROW_DTYPE)
+    rows["start"] = offsets[order + 1]
+    rows["length"] = offsets[order + 2] - offsets[order + 1]
+    np.save(os.path.join(results_dir, JTL_INDEX_ROWS_FILE), rows)
+
+    index_file = os.path.join(results_dir, JTL_INDEX_FILE)
+    np.savez(
+        index_file,
+        second=keys[0][first].astype(np.int32),
+        label_id=keys[1][first].astype(np.int32),
+        code_id=keys[2][first].astype(np.int32),
+        failed=keys[3][first].astype(bool),
+        bounds=np.append(first, len(order)).astype(np.int64),
+        labels=np.asarray(labels, dtype=str),
+        codes=np.asarray(codes, dtype=str),
+        header_end=np.int64(offsets[1]),
+        start=np.int64(start)
+    )
+    return index_file
+
+
+def query_jtl(phase_dir: str, second: Optional[int] = None, label: Optional[str] = None,
+              code: Optional[str] = None, errors_only: bool = False, limit: Optional[int] = None) -> pd.DataFrame:
+    """
+    버킷 표로 조건에 맞는 행만 골라 JTL에서 해당 줄만 읽기 (파일 전체를 파싱하지 않음, 압축된 JTL도 지원)
+    :param second: 단계 시작 기준 초
+    :param label: 엔드포인트(라벨)
+    :param code: 응답 코드
+    :param errors_only: 실패 샘플만
+    :param limit: 최대 행 수 (파일 앞쪽 행부터)
+    """
+    jtl_file = find_raw_file(phase_dir)
+    with np.load(os.path.join(phase_dir, JTL_INDEX_FILE)) as index:
+        mask = np.ones(len(index['second']), dtype=bool)
+        if second is not None:
+            mask &= index['second'] == second
+        if label is not None:
+            mask &= index['label_id'] == _lookup(index['labels'], label)
+        if code is not None:
+            mask &= index['code_id'] == _lookup(index['codes'], code)
+        if errors_only:
+            mask &= index['failed']
+        bounds = index['bounds']
+        header_end = int(index['header_end'])
+
+    rows = np.load(os.path.join(phase_dir, JTL_INDEX_ROWS_FILE), mmap_mode='r')
+    selected = [rows[bounds[bucket]:bounds[bucket + 1]] for bucket in np.flatnonzero(mask)]
+    # 압축 파일은 앞으로만 읽으므로 파일 순서로 정렬
+    selected = np.sort(np.concatenate(selected), order="start")[:limit] if selected else rows[:0]
+
+    ranges = [(0, header_end)] + [(int(row["start"]), int(row["start"]) + int(row["length"])) for row in selected]
+    return pd.read_csv(io.BytesIO(_read_ranges(jtl_file, ranges)))
+
+
+def _lookup(values: np.ndarray, value: str) -> int:
+    matches = np.flatnonzero(values == value)
+    return int(matches[0]) if len(matches) else -1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="phase 폴더의 JTL에서 조건에 맞는 샘플만 조회")
+    parser.add_argument("phase_dir", help="phase_threads_* 폴더")
+    parser.add_argument("--second", type=int, help="단계 시작 기준 초")
+    parser.add_argument("--label", help="엔드포인트(라벨)")
+    parser.add_argument("--code", help="응답 코드")
+    parser.add_argument("--errors", action="store_true", help="실패 샘플만")
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    # 인덱스 기능 이전의 결과는 한 번 전체를 읽어 인덱스 생성
+    if not all(os.path.exists(os.path.join(args.phase_dir, name)) for name in JTL_INDEX_FILES):
+        jtl_file = find_raw_file(args.phase_dir)
+        if jtl_file is None:
+            raise SystemExit(f"JTL 파일이 없습니다: {args.phase_dir}")
+        if build_jtl_index(jtl_file, args.phase_dir, pd.read_csv(jtl_file)) is None:
+            raise SystemExit(1)
+
+    selected = query_jtl(args.phase_dir, args.second, args.label, args.code, args.errors, args.limit)
+    with pd.option_context('display.max_columns', None, 'display.width', 200):
+        print(selected)
@@ -0,0 +1,160 @@
+import csv
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+LIVE_METRICS_FILE = "live_metrics.json"
+
+
+class LiveMetricsTailer:
+    def __init__(self, jtl_file: str, results_dir: str, window_seconds: int = 1,
+                 max_points: int = 600, flush_interval: float = 1):
+        """
+        단계 진행 중 기록되는 JTL을 따라 읽으며 구간별 집계만 live_metrics.json에 저장
+        대시보드는 원본 샘플이 아닌 최근 max_points 개 구간의 집계만 받음
+        Args:
+            jtl_file: 엔진이 기록 중인 JTL 경로
+            results_dir: 결과 저장 디렉토리 (phase 폴더)
+            window_seconds: 집계 구간 크기 (초)
+            max_points: 파일에 유지할 최근 구간 수
+            flush_interval: 파일 갱신 간격 (초)
+        """
+        self.jtl_file = jtl_file
+        self.output_file = os.path.join(results_dir, LIVE_METRICS_FILE)
+        self.window_ms = window_seconds * 1000
+        self.window_seconds = window_seconds
+        self.max_points = max_points
+        self.flush_interval = flush_interval
+        self._buckets: Dict[int, List] = {}
+        self._points: List[Dict] = []
+        self._last_finalized = -1
+        self._columns = None
+        self._partial = b""
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _parse_lines(self, lines: List[str]):
+        for row in csv.reader(lines):
+            if not row:
+                continue
+            if self._columns is None:
+                self._columns = (row.index("timeStamp"), row.index("elapsed"), row.index("success"))
+                continue
+            ts_index, elapsed_index, success_index = self._columns
+            try:
+                elapsed = int(row[elapsed_index])
+                # 완료 시각 기준으로 묶어야 기록 순서와 구간 순서가 일치함
+                bucket = (int(row[ts_index]) + elapsed) // self.window_ms
+            except (ValueError, IndexError):
+                continue
+            if bucket <= self._last_finalized:
+                continue
+            samples = self._buckets.setdefault(bucket, [[], 0])
+            samples[0].append(elapsed)
+            if row[success_index] != "true":
+                samples[1] += 1
+
+    def _finalize(self, final: bool = False):
+        """완료된 구간(늦게 기록되는 샘플을 위해 최근 2개 구간 제외)을 집계값으로 변환하고 원본 샘플 폐기"""
+        if not self._buckets:
+            return
+        latest = max(self._buckets)
+        for bucket in sorted(self._buckets):
+            if bucket >= latest - 1 and not final:
+                break
+            elapsed, errors = self._buckets.pop(bucket)
+            self._last_finalized = bucket
+            values = np.array(elapsed)
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            self._points.append({
+                "timestamp": bucket * self.window_ms,
+                "rps": round(len(values) / self.window_seconds, 2),
+                "error_rate": round(errors / len(values) * 100, 2),
+                "mean": round(float(values.mean()), 2),
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99)
+            })
+        del self._points[:-self.max_points]
+
+    def _write(self, running: bool):
+        temp_file = self.output_file + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump({"running": running, "updated": int(time.time() * 1000), "points": self._points}, f)
+        os.replace(temp_file, self.output_file)
+
+    def _read_new(self, f):
+        data = f.read()
+        if not data:
+            return
+        data = self._partial + data
+        # 마지막 줄이 아직 쓰는 중이면 다음 읽기로 미룸
+        complete, _, self._partial = data.rpartition(b"\n")
+        if complete:
+            self._parse_lines(complete.decode("utf-8", errors="replace").split("\n"))
+
+    def _run(self):
+        while not os.path.exists(self.jtl_file):
+            if self._stop.wait(0.5):
+                return
+
+        with open(self.jtl_file, "rb") as f:
+            while not self._stop.wait(self.flush_interval):
+                self._read_new(f)
+                self._finalize()
+                self._write(running=True)
+            self._read_new(f)
+            self._finalize(final=True)
+            self._write(running=False)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def start_live_metrics(config: Dict, jtl_file: str, results_dir: str) -> Optional[LiveMetricsTailer]:
+    """설정에 따라 실시간 집계 시작 (비활성화 시 None)"""
+    live_config = config.get("live_metrics", {})
+    if not live_config.get("enabled", True):
+        return None
+    return LiveMetricsTailer(
+        jtl_file,
+        results_dir,
+        window_seconds=live_config.get("window_seconds", 1),
+        max_points=live_config.get("max_points", 600),
+        flush_interval=live_config.get("flush_interval", 1)
+    ).start()
+
+
+def load_live_metrics(phase_dir: str) -> Optional[Dict]:
+    """live_metrics.json 로드 (없으면 None)"""
+    live_file = os.path.join(phase_dir, LIVE_METRICS_FILE)
+    if not os.path.exists(live_file):
+        return None
+    with open(live_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def find_running_phase(base_dir: str, stale_seconds: float = 30) -> Optional[str]:
+    """
+    실행 중인(live_metrics.json의 running이 true인) 가장 최근 phase 폴더 반환
+    stale_seconds 동안 갱신되지 않은 파일은 중단된 실행으로 보고 무시
+    """
+    candidates = []
+    for folder in os.listdir(base_dir):
+        live_file = os.path.join(base_dir, folder, LIVE_METRICS_FILE)
+        if folder.startswith("phase_") and os.path.exists(live_file):
+            candidates.append((os.path.getmtime(live_file), folder))
+    for _, folder in sorted(candidates, reverse=True):
+        live = load_live_metrics(os.path.join(base_dir, folder))
+        if live and live.get("running") and time.time() * 1000 - live["updated"] < stale_seconds * 1000:
+            return os.path.join(base_dir, folder)
+    return None
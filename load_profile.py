@@ -0,0 +1,179 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_LOAD_PROFILE = {
+    # constant(기존 동작) | linear | stepped | spike | sine
+    "type": "constant",
+    # 시작 후 목표 부하까지 올리는 시간 (초), constant는 ThreadGroup ramp_time
+    "ramp_seconds": 1,
+    # stepped: 단계 수
+    "steps": 5,
+    # spike: 평상시 부하 비율, 스파이크 시작 시점(없으면 단계 중간)과 지속 시간
+    "base_pct": 10,
+    "spike_start_seconds": None,
+    "spike_seconds": None,
+    # sine: 최저 부하 비율과 주기 (없으면 단계 지속시간)
+    "min_pct": 50,
+    "period_seconds": None,
+    # 램프 구간(워밍업)을 통계에서 제외
+    "exclude_warmup": True
+}
+
+PROFILE_TYPES = ("constant", "linear", "stepped", "spike", "sine")
+
+
+def get_load_profile(config: Dict) -> Dict:
+    """load_profile 설정에 기본값 채우기"""
+    profile = dict(DEFAULT_LOAD_PROFILE)
+    profile.update(config.get("load_profile", {}))
+    if profile["type"] not in PROFILE_TYPES:
+        raise ValueError(f"지원하지 않는 부하 프로파일입니다: {profile['type']}")
+    return profile
+
+
+def _ramp_seconds(profile: Dict, duration: int) -> float:
+    return min(profile["ramp_seconds"], duration)
+
+
+def target_threads(profile: Dict, thread_count: int, duration: int, elapsed: float) -> int:
+    """
+    단계 시작 후 elapsed 초 시점의 활성 가상 사용자 수
+    :param thread_count: 단계의 최대(목표) 쓰레드 수
+    """
+    ramp = _ramp_seconds(profile, duration)
+    kind = profile["type"]
+
+    if kind in ("constant", "linear"):
+        fraction = min(elapsed / ramp, 1.0) if ramp > 0 else 1.0
+        return max(math.ceil(thread_count * fraction), 1)
+
+    if kind == "stepped":
+        steps = max(int(profile["steps"]), 1)
+        step = min(int(elapsed // (ramp / steps)) + 1, steps) if ramp > 0 else steps
+        return max(thread_count * step // steps, 1)
+
+    if kind == "spike":
+        base = max(thread_count * profile["base_pct"] // 100, 1)
+        spike_start = profile["spike_start_seconds"]
+        spike_start = duration / 2 if spike_start is None else spike_start
+        spike_seconds = profile["spike_seconds"] or max(duration // 10, 1)
+        if spike_start <= elapsed < spike_start + spike_seconds:
+            return thread_count
+        fraction = min(elapsed / ramp, 1.0) if ramp > 0 else 1.0
+        return max(math.ceil(base * fraction), 1)
+
+    # sine: 최저 부하에서 시작해 주기마다 최대 부하까지 오르내림
+    period = profile["period_seconds"] or duration
+    low = profile["min_pct"] / 100
+    level = low + (1 - low) * (1 - math.cos(2 * math.pi * elapsed / period)) / 2
+    return max(round(thread_count * level), 1)
+
+
+def get_warmup_seconds(profile: Dict, duration: int) -> float:
+    """
+    통계에서 제외할 워밍업 시간
+    constant의 기본 1초 ramp_time은 기존과 같이 제외하지 않고, 더 긴 램프를 지정한 경우만 제외
+    """
+    if not profile["exclude_warmup"]:
+        return 0
+    if profile["type"] == "constant" and profile["ramp_seconds"] <= 1:
+        return 0
+    return _ramp_seconds(profile, duration)
+
+
+def apply_profile_warmup(analysis_config: Optional[Dict], profile: Dict, duration: int) -> Dict:
+    """analysis_config의 warmup_seconds를 프로파일 램프 구간 이상으로 맞춤"""
+    analysis_config = dict(analysis_config or {})
+    warmup = get_warmup_seconds(profile, duration)
+    analysis_config["warmup_seconds"] = max(analysis_config.get("warmup_seconds", 0), warmup)
+    return analysis_config
+
+
+def build_schedule_rows(profile: Dict, thread_count: int, duration: int) -> List[Tuple[int, int, int]]:
+    """
+    초 단위 목표 쓰레드 수를 Ultimate Thread Group 행(쓰레드 수, 시작 지연, 유지 시간)으로 분해
+    증가분은 새 행으로 추가하고 감소분은 가장 최근에 시작한 행부터 종료(LIFO)
+    """
+    rows = []
+    active = []
+    current = 0
+    for second in range(duration):
+        level = target_threads(profile, thread_count, duration, second)
+        if level > current:
+            active.append([level - current, second])
+        remaining = current - level
+        while remaining > 0:
+            count, start = active[-1]
+            ended = min(count, remaining)
+            rows.append((ended, start, second - start))
+            if ended == count:
+                active.pop()
+            else:
+                active[-1][0] -= ended
+            remaining -= ended
+        current = level
+    rows.extend((count, start, duration - start) for count, start in active)
+    return [row for row in rows if row[2] > 0]
+
+
+def create_profile_thread_group_xml(profile: Dict, testname: str, thread_count: int, duration: int) -> str:
+    """
+    부하 프로파일용 쓰레드 그룹 설정 요소 생성 (jmeter-plugins 필요, 하위 요소용 hashTree를 열어 둔 상태로 반환)
+    linear/stepped는 Concurrency Thread Group, spike/sine은 Ultimate Thread Group 사용
+    """
+    if profile["type"] in ("linear", "stepped"):
+        ramp = int(_ramp_seconds(profile, duration))
+        steps = profile["steps"] if profile["type"] == "stepped" else ""
+        return f'''
+      <com.blazemeter.jmeter.threads.concurrency.ConcurrencyThreadGroup guiclass="com.blazemeter.jmeter.threads.concurrency.ConcurrencyThreadGroupGui" testclass="com.blazemeter.jmeter.threads.concurrency.ConcurrencyThreadGroup" testname="{testname}" enabled="true">
+        <elementProp name="ThreadGroup.main_controller" elementType="com.blazemeter.jmeter.control.VirtualUserController"/>
+        <stringProp name="ThreadGroup.on_sample_error">continue</stringProp>
+        <stringProp name="TargetLevel">{thread_count}</stringProp>
+        <stringProp name="RampUp">{ramp}</stringProp>
+        <stringProp name="Steps">{steps}</stringProp>
+        <stringProp name="Hold">{duration - ramp}</stringProp>
+        <stringProp name="LogFilename"></stringProp>
+        <stringProp name="Iterations"></stringProp>
+        <stringProp name="Unit">S</stringProp>
+      </com.blazemeter.jmeter.threads.concurrency.ConcurrencyThreadGroup>
+      <hashTree>'''
+
+    rows_xml = ""
+    for index, (count, start, hold) in enumerate(build_schedule_rows(profile, thread_count, duration)):
+        rows_xml += f'''
+          <collectionProp name="{index}">
+            <stringProp name="1">{count}</stringProp>
+            <stringProp name="2">{start}</stringProp>
+            <stringProp name="3">0</stringProp>
+            <stringProp name="4">{hold}</stringProp>
+            <stringProp name="5">0</stringProp>
+          </collectionProp>'''
+    return f'''
+      <kg.apc.jmeter.threads.UltimateThreadGroup guiclass="kg.apc.jmeter.threads.UltimateThreadGroupGui" testclass="kg.apc.jmeter.threads.UltimateThreadGroup" testname="{testname}" enabled="true">
+        <collectionProp name="ultimatethreadgroupdata">{rows_xml}
+        </collectionProp>
+        <elementProp name="ThreadGroup.main_controller" elementType="LoopController" guiclass="LoopControlPanel" testclass="LoopController" testname="Loop Controller" enabled="true">
+          <boolProp name="LoopController.continue_forever">false</boolProp>
+          <intProp name="LoopController.loops">-1</intProp>
+        </elementProp>
+        <stringProp name="ThreadGroup.on_sample_error">continue</stringProp>
+      </kg.apc.jmeter.threads.UltimateThreadGroup>
+      <hashTree>'''
+
+
+class LoadGate:
+    def __init__(self, profile: Dict, thread_count: int, duration: int, start: float):
+        """
+        네이티브 엔진용 가상 사용자 게이트
+        모든 가상 사용자 스레드를 미리 만들고, 번호가 현재 목표 쓰레드 수보다 작은 사용자만 요청을 보냄
+        """
+        self.profile = profile
+        self.thread_count = thread_count
+        self.duration = duration
+        self.start = start
+
+    def level(self, now: float) -> int:
+        return target_threads(self.profile, self.thread_count, self.duration, now - self.start)
+
+    def admit(self, index: int, now: float) -> bool:
+        return index < self.level(now)
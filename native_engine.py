@@ -0,0 +1,474 @@
+import csv
+import http.client
+import json
+import os
+import queue
+import select
+import socket
+import threading
+import time
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from data_feeder import DataFeeder, render
+from error_taxonomy import ErrorReservoir
+from load_profile import LoadGate
+from scenario import NOT_FOUND, extract_json_path
+
+ENGINE_VERSION = "native-1.0"
+
+# JMeter CSV(JTL) 출력과 동일한 컬럼 순서 - analyze_results를 그대로 사용하기 위함
+JTL_FIELDS = [
+    "timeStamp", "elapsed", "label", "responseCode", "responseMessage",
+    "threadName", "dataType", "success", "failureMessage", "bytes",
+    "sentBytes", "grpThreads", "allThreads", "URL", "Latency", "IdleTime", "Connect"
+]
+
+
+DEFAULT_CONNECTION_SETTINGS = {
+    "keep_alive": True,
+    "connect_timeout": 5000,
+    "response_timeout": 30000,
+    "pool_size": 0,
+    "http_version": "HTTP/1.1"
+}
+SUPPORTED_HTTP_VERSIONS = ("HTTP/1.1",)
+
+# 부하 프로파일에서 대기 중인 가상 사용자가 게이트를 다시 확인하는 간격 (초)
+GATE_POLL_SECONDS = 0.05
+
+# 고정 폭 샘플 레코드 (문자열 컬럼은 StringTable id로 저장)
+SAMPLE_DTYPE = np.dtype([
+    ("timeStamp", "i8"), ("elapsed", "i4"), ("label", "i4"), ("code", "i4"), ("message", "i4"),
+    ("thread", "i4"), ("success", "?"), ("bytes", "i8"), ("sentBytes", "i4"), ("threads", "i4"),
+    ("url", "i4"), ("latency", "i4"), ("connect", "i4")
+])
+# 가상 사용자 버퍼의 최대 보관 시간 (실시간 집계가 2개 구간 늦게 확정하므로 1초보다 짧게)
+SAMPLE_FLUSH_SECONDS = 0.5
+# 플러시 주기 동안 전체 가상 사용자가 기록할 수 있는 샘플 수 (0.5초에 65536건 = 초당 약 13만 건)
+# 전체 처리량은 가상 사용자가 나눠 가지므로 가상 사용자별 버퍼는 이 값을 가상 사용자 수로 나눈 크기
+SAMPLE_BATCH_ROWS = 65536
+SAMPLE_BUFFER_MIN_ROWS = 64
+SAMPLE_BUFFER_MAX_ROWS = 4096
+
+
+class ConnectTimeout(TimeoutError):
+    """연결 단계 타임아웃 (응답 대기 타임아웃과 구분하기 위해 JMeter와 같은 메시지 사용)"""
+
+
+class StringTable:
+    def __init__(self):
+        """라벨/응답 코드/메시지/쓰레드 이름/URL 문자열을 정수 id로 변환 (같은 문자열은 한 번만 보관)"""
+        self.values: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def id(self, value: str) -> int:
+        found = self._ids.get(value)
+        if found is None:
+            with self._lock:
+                found = self._ids.get(value)
+                if found is None:
+                    # values에 먼저 추가해야 다른 스레드가 받은 id를 기록기가 항상 조회할 수 있음
+                    self.values.append(value)
+                    found = self._ids[value] = len(self.values) - 1
+        return found
+
+
+def sample_buffer_rows(virtual_users: int) -> int:
+    """가상 사용자별 샘플 버퍼 크기 (가상 사용자가 많을수록 작게, SAMPLE_BUFFER_MIN_ROWS ~ SAMPLE_BUFFER_MAX_ROWS)"""
+    return min(SAMPLE_BUFFER_MAX_ROWS, max(SAMPLE_BUFFER_MIN_ROWS, SAMPLE_BATCH_ROWS // max(virtual_users, 1)))
+
+
+class SampleSink:
+    def __init__(self, errors: Optional[ErrorReservoir] = None, buffer_rows: int = SAMPLE_BUFFER_MAX_ROWS):
+        """
+        가상 사용자들이 채운 샘플 버퍼를 기록기로 넘기는 통로
+        기록이 끝난 버퍼는 재사용하여 부하 발생 중 메모리 할당과 GC를 줄임
+        :param errors: 실패 응답 저수지 샘플 (None이면 수집 안 함)
+        :param buffer_rows: 가상 사용자별 버퍼 크기 (sample_buffer_rows 결과)
+        """
+        self.errors = errors
+        self.buffer_rows = buffer_rows
+        self.strings = StringTable()
+        self.batches = queue.SimpleQueue()
+        self._free = queue.SimpleQueue()
+
+    def take_buffer(self) -> np.ndarray:
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return np.empty(self.buffer_rows, dtype=SAMPLE_DTYPE)
+
+    def recycle(self, buffer: np.ndarray):
+        self._free.put(buffer)
+
+
+class SampleRecorder:
+    def __init__(self, sink: SampleSink, thread_name: str):
+        """
+        가상 사용자 하나의 샘플 버퍼
+        버퍼가 차거나 SAMPLE_FLUSH_SECONDS가 지나면 통째로 기록기에 넘김
+        """
+        self.sink = sink
+        self.strings = sink.strings
+        self.thread_id = sink.strings.id(thread_name)
+        self._buffer = sink.take_buffer()
+        self._count = 0
+        self._flushed = time.time()
+
+    def record(self, timestamp: int, elapsed: int, label: str, code: str, message: str, success: bool,
+               received: int, sent: int, threads: int, url: str, latency: int, connect: int):
+        strings = self.strings
+        self._buffer[self._count] = (
+            timestamp, elapsed, strings.id(label), strings.id(code), strings.id(message), self.thread_id,
+            success, received, sent, threads, strings.id(url), latency, connect
+        )
+        self._count += 1
+        if self._count == len(self._buffer) or time.time() - self._flushed >= SAMPLE_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        if self._count:
+            self.sink.batches.put((self._buffer, self._count))
+            self._buffer = self.sink.take_buffer()
+            self._count = 0
+        self._flushed = time.time()
+
+
+def resolve_connection_settings(connection_config: Optional[Dict], endpoint: str) -> Dict:
+    """
+    엔드포인트의 커넥션 설정 결정 (기본값 < "default" < 엔드포인트별 설정 순으로 덮어씀)
+    :param connection_config: stresstest_config.json의 connection_config
+    """
+    connection_config = connection_config or {}
+    settings = dict(DEFAULT_CONNECTION_SETTINGS)
+    settings.update(connection_config.get("default", {}))
+    settings.update(connection_config.get(endpoint, {}))
+
+    if settings['http_version'] not in SUPPORTED_HTTP_VERSIONS:
+        print(f"⚠️ {endpoint}: {settings['http_version']}은 지원하지 않아 HTTP/1.1로 실행합니다")
+        settings['http_version'] = "HTTP/1.1"
+    return settings
+
+
+def _open_connection(server_config: Dict, settings: Dict) -> http.client.HTTPConnection:
+    timeout = settings['connect_timeout'] / 1000 if settings['connect_timeout'] else None
+    if server_config['protocol'] == "https":
+        return http.client.HTTPSConnection(server_config['server_name'], int(server_config['port']), timeout=timeout)
+    return http.client.HTTPConnection(server_config['server_name'], int(server_config['port']), timeout=timeout)
+
+
+def _close_if_stale(conn: http.client.HTTPConnection):
+    """유휴 중 서버가 닫은 keep-alive 커넥션 정리 (읽을 데이터가 있으면 EOF) - 다음 요청에서 새로 연결"""
+    if conn.sock is not None and select.select([conn.sock], [], [], 0)[0]:
+        conn.close()
+
+
+def _reuse_connection(connections: Optional[Dict], key: Tuple, server_config: Dict,
+                      settings: Dict) -> http.client.HTTPConnection:
+    """
+    가상 사용자의 커넥션 (connections가 있으면 이전 단계에서 같은 가상 사용자가 쓰던 커넥션 재사용)
+    :param connections: 단계 간 유지하는 커넥션 캐시 (None이면 단계마다 새로 연결)
+    """
+    if connections is None:
+        return _open_connection(server_config, settings)
+    conn = connections.get(key)
+    if conn is None:
+        conn = connections[key] = _open_connection(server_config, settings)
+    else:
+        _close_if_stale(conn)
+    return conn
+
+
+class ConnectionPool:
+    def __init__(self, server_config: Dict, settings: Dict):
+        """
+        엔드포인트별 공유 커넥션 풀
+        pool_size 개까지만 커넥션을 만들고, 모두 사용 중이면 반납될 때까지 대기
+        """
+        self.server_config = server_config
+        self.settings = settings
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(settings['pool_size'])
+
+    def acquire(self) -> http.client.HTTPConnection:
+        self._slots.acquire()
+        try:
+            conn = self._idle.get_nowait()
+            _close_if_stale(conn)
+            return conn
+        except queue.Empty:
+            return _open_connection(self.server_config, self.settings)
+
+    def release(self, conn: http.client.HTTPConnection):
+        self._idle.put(conn)
+        self._slots.release()
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+
+def _send_request(conn: http.client.HTTPConnection, spec: Dict, settings: Dict,
+                  payload: Optional[bytes], headers: Dict, path: Optional[str] = None) -> Tuple:
+    """
+    요청 1건 전송
+    :param path: 요청 경로 (없으면 spec의 endpoint)
+    :return: (응답 코드, 메시지, 성공 여부, 수신 바이트, latency ms, connect ms, 응답 body)
+    """
+    start = time.time()
+    connect_ms = 0
+    if conn.sock is None:
+        try:
+            conn.connect()
+        except socket.timeout as e:
+            raise ConnectTimeout("Connect timed out") from e
+        connect_ms = int((time.time() - start) * 1000)
+        # 헤더와 body가 나뉘어 전송될 때 Nagle/delayed ACK로 ~40ms 지연되는 것 방지
+        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if settings['response_timeout']:
+            conn.sock.settimeout(settings['response_timeout'] / 1000)
+
+    conn.request(spec['method'], path or spec['endpoint'], body=payload, headers=headers)
+    response = conn.getresponse()
+    latency_ms = int((time.time() - start) * 1000)
+    data = response.read()
+
+    if not settings['keep_alive'] or response.getheader("Connection", "").lower() == "close":
+        conn.close()
+    return str(response.status), response.reason, 200 <= response.status < 400, len(data), latency_ms, connect_ms, data
+
+
+def _worker(server_config: Dict, spec: Dict, thread_name: str, deadline: float,
+            sink: SampleSink, active: List[int], feeder: Optional[DataFeeder],
+            pool: Optional[ConnectionPool], gate: Optional[LoadGate] = None, index: int = 0,
+            connections: Optional[Dict] = None):
+    """
+    하나의 가상 사용자: deadline까지 같은 엔드포인트를 반복 호출
+    gate가 있으면 index가 현재 목표 쓰레드 수 안에 들 때만 요청
+    """
+    url = f"{server_config['protocol']}://{server_config['server_name']}:{server_config['port']}{spec['endpoint']}"
+    settings = spec['connection']
+    own_conn = None if pool else _reuse_connection(connections, (spec['endpoint'], index), server_config, settings)
+    recorder = SampleRecorder(sink, thread_name)
+
+    while time.time() < deadline:
+        if gate and not gate.admit(index, time.time()):
+            time.sleep(GATE_POLL_SECONDS)
+            continue
+        record = feeder.next_record() if feeder else None
+        body = render(spec['body'], record) if spec['body'] else None
+        headers = {key: render(value, record) for key, value in spec['headers'].items()}
+        if not settings['keep_alive']:
+            headers["Connection"] = "close"
+        payload = body.encode('utf-8') if body else None
+
+        conn = pool.acquire() if pool else own_conn
+        start = time.time()
+        try:
+            code, message, success, received, latency_ms, connect_ms, data = _send_request(conn, spec, settings, payload, headers)
+        except Exception as e:
+            code, message, success, received, latency_ms, connect_ms, data = type(e).__name__, str(e), False, 0, 0, 0, b""
+            conn.close()
+        finally:
+            if pool:
+                pool.release(conn)
+        if not success and sink.errors:
+            sink.errors.offer(int(start * 1000), spec['endpoint'], code, message, data)
+
+        elapsed_ms = int((time.time() - start) * 1000)
+        recorder.record(int(start * 1000), elapsed_ms, spec['endpoint'], code, message, success,
+                        received, len(payload) if payload else 0, active[0], url, latency_ms, connect_ms)
+
+    recorder.flush()
+    if own_conn and connections is None:
+        own_conn.close()
+
+
+def _extract_variables(step: Dict, data: bytes, variables: Dict[str, str]):
+    """응답 body(JSON)에서 단계의 추출 규칙대로 변수 저장 (실패 시 JMeter와 같이 NOT_FOUND)"""
+    try:
+        document = json.loads(data)
+    except ValueError:
+        document = None
+    for item in step['extract']:
+        value = extract_json_path(document, item['tokens']) if document is not None else None
+        variables[item['variable']] = NOT_FOUND if value is None else value
+
+
+def _scenario_worker(server_config: Dict, steps: List[Dict], thread_name: str, deadline: float,
+                     sink: SampleSink, active: List[int], feeder: Optional[DataFeeder],
+                     gate: Optional[LoadGate] = None, index: int = 0, connections: Optional[Dict] = None):
+    """
+    시나리오 가상 사용자: deadline까지 단계들을 순서대로 반복
+    한 반복(세션) 동안 피더 레코드와 추출 변수를 공유하고, 실제 클라이언트처럼 하나의 커넥션을 재사용
+    gate가 있으면 반복(세션) 시작 시점에만 확인하여 진행 중인 세션은 끝까지 실행
+    """
+    base_url = f"{server_config['protocol']}://{server_config['server_name']}:{server_config['port']}"
+    conn = _reuse_connection(connections, ("scenario", index), server_config, steps[0]['connection'])
+    recorder = SampleRecorder(sink, thread_name)
+
+    while time.time() < deadline:
+        if gate and not gate.admit(index, time.time()):
+            time.sleep(GATE_POLL_SECONDS)
+            continue
+        variables = dict(feeder.next_record()) if feeder else {}
+        for step in steps:
+            if step['think_time_ms']:
+                time.sleep(step['think_time_ms'] / 1000)
+            if time.time() >= deadline:
+                break
+
+            settings = step['connection']
+            path = render(step['path'], variables)
+            body = render(step['body'], variables) if step['body'] else None
+            headers = {key: render(value, variables) for key, value in step['headers'].items()}
+            if not settings['keep_alive']:
+                headers["Connection"] = "close"
+            payload = body.encode('utf-8') if body else None
+
+            start = time.time()
+            try:
+                code, message, success, received, latency_ms, connect_ms, data = _send_request(
+                    conn, step, settings, payload, headers, path)
+            except Exception as e:
+                code, message, success, received, latency_ms, connect_ms, data = type(e).__name__, str(e), False, 0, 0, 0, b""
+                conn.close()
+            if step['extract']:
+                _extract_variables(step, data, variables)
+            if not success and sink.errors:
+                sink.errors.offer(int(start * 1000), step['label'], code, message, data)
+
+            elapsed_ms = int((time.time() - start) * 1000)
+            recorder.record(int(start * 1000), elapsed_ms, step['label'], code, message, success,
+                            received, len(payload) if payload else 0, active[0], base_url + path,
+                            latency_ms, connect_ms)
+
+    recorder.flush()
+    if connections is None:
+        conn.close()
+
+
+def _writer(result_file: str, sink: SampleSink, stop: threading.Event):
+    """샘플 버퍼를 받아 한 번에 JTL(CSV) 행으로 변환하여 기록하고 버퍼 반납"""
+    lookup = sink.strings.values.__getitem__
+    with open(result_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(JTL_FIELDS)
+        while not (stop.is_set() and sink.batches.empty()):
+            try:
+                buffer, count = sink.batches.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            rows = buffer[:count]
+            success = rows['success'].tolist()
+            messages = list(map(lookup, rows['message'].tolist()))
+            threads = rows['threads'].tolist()
+            writer.writerows(zip(
+                rows['timeStamp'].tolist(), rows['elapsed'].tolist(), map(lookup, rows['label'].tolist()),
+                map(lookup, rows['code'].tolist()), messages, map(lookup, rows['thread'].tolist()), repeat("text"),
+                ["true" if ok else "false" for ok in success],
+                ["" if ok else message for ok, message in zip(success, messages)],
+                rows['bytes'].tolist(), rows['sentBytes'].tolist(), threads, threads,
+                map(lookup, rows['url'].tolist()), rows['latency'].tolist(), repeat(0), rows['connect'].tolist()
+            ))
+            sink.recycle(buffer)
+
+
+def run_native_test(server_config: Dict, results_dir: str, thread_count: int, duration: int,
+                    request_specs: List[Dict], feeder: Optional[DataFeeder] = None,
+                    scenario_steps: Optional[List[Dict]] = None,
+                    load_profile: Optional[Dict] = None,
+                    connections: Optional[Dict] = None,
+                    error_sampling: Optional[Dict] = None) -> Tuple[bool, Optional[str]]:
+    """
+    JMeter 없이 파이썬 스레드로 부하 발생
+    엔드포인트마다 thread_count 개의 가상 사용자를 duration 초 동안 실행 (JMX의 ThreadGroup 구성과 동일)
+    scenario_steps가 있으면 thread_count 개의 가상 사용자가 단계들을 순서대로 반복 (JMX 시나리오 쓰레드 그룹과 동일)
+    :param request_specs: [{"endpoint", "method", "headers", "body", "connection"}] 요청 템플릿 목록
+    :param scenario_steps: build_scenario_steps 결과
+    :param load_profile: get_load_profile 결과 (constant가 아니거나 램프 시간이 있으면 시간에 따라 활성 가상 사용자 수 조절)
+    :param connections: 단계 간 커넥션 캐시 (장기 실행 엔진 프로세스가 전달, 단계가 끝나도 커넥션을 닫지 않음)
+    :param error_sampling: get_error_sampling 결과 (실패 응답 body를 phase 폴더에 저수지 샘플로 저장)
+    :return: (성공 여부, 결과 파일 경로)
+    """
+    result_file = os.path.join(results_dir, "test_results.jtl")
+
+    print(f"🚀 네이티브 엔진 테스트 실행 중...")
+    print(f"📁 결과 디렉토리: {results_dir}")
+
+    groups = 1 if scenario_steps else len(request_specs)
+    errors = ErrorReservoir(error_sampling['reservoir_size'], error_sampling['max_body_bytes']) if error_sampling else None
+    sink = SampleSink(errors, sample_buffer_rows(thread_count * groups))
+    stop = threading.Event()
+    writer = threading.Thread(target=_writer, args=(result_file, sink, stop), daemon=True)
+    writer.start()
+
+    active = [thread_count * groups]
+    start = time.time()
+    deadline = start + duration
+    gate = None
+    # constant도 램프 시간이 있으면 JMeter ThreadGroup.ramp_time처럼 가상 사용자를 나눠 시작
+    if load_profile and (load_profile['type'] != "constant" or load_profile['ramp_seconds'] > 1):
+        gate = LoadGate(load_profile, thread_count, duration, start)
+        active[0] = gate.level(start) * groups
+    workers = []
+    pools = []
+    try:
+        if scenario_steps:
+            for i in range(thread_count):
+                worker = threading.Thread(
+                    target=_scenario_worker,
+                    args=(server_config, scenario_steps, f"Scenario 1-{i + 1}", deadline, sink, active, feeder,
+                          gate, i, connections),
+                    daemon=True
+                )
+                worker.start()
+                workers.append(worker)
+
+        for spec in ([] if scenario_steps else request_specs):
+            # pool_size가 0이면 JMeter처럼 가상 사용자마다 전용 커넥션 사용
+            pool = None
+            if spec['connection']['pool_size']:
+                pool_key = ("pool", spec['endpoint'])
+                pool = connections.get(pool_key) if connections is not None else None
+                if pool is None:
+                    pool = ConnectionPool(server_config, spec['connection'])
+                    if connections is None:
+                        pools.append(pool)
+                    else:
+                        connections[pool_key] = pool
+            for i in range(thread_count):
+                worker = threading.Thread(
+                    target=_worker,
+                    args=(server_config, spec, f"{spec['endpoint']} Test 1-{i + 1}", deadline, sink, active, feeder, pool,
+                          gate, i, connections),
+                    daemon=True
+                )
+                worker.start()
+                workers.append(worker)
+
+        # 프로파일 실행 중에는 JTL의 grpThreads/allThreads가 현재 활성 가상 사용자 수를 따르도록 갱신
+        while gate and time.time() < deadline:
+            active[0] = gate.level(time.time()) * groups
+            time.sleep(GATE_POLL_SECONDS)
+
+        for worker in workers:
+            worker.join()
+    except Exception as e:
+        print(f"❌ 오류 발생: {str(e)}")
+        return False, None
+    finally:
+        stop.set()
+        writer.join()
+        for pool in pools:
+            pool.close()
+        if errors:
+            errors.save(results_dir)
+
+    print("✅ 네이티브 엔진 테스트 완료!")
+    return True, result_file
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from native_engine import ENGINE_VERSION
+
+DEFAULT_CACHE_CONFIG = {
+    "enabled": False,
+    "ttl_hours": 24,
+    # 상대 경로는 실행 위치와 관계없이 이 모듈이 있는 프로젝트 폴더 기준
+    "index_file": "phase_cache.jsonl"
+}
+
+
+def get_cache_config(config: Dict) -> Dict:
+    """phase_cache 설정에 기본값 채우기"""
+    cache_config = dict(DEFAULT_CACHE_CONFIG)
+    cache_config.update(config.get("phase_cache", {}))
+    cache_config["index_file"] = os.path.join(os.path.dirname(os.path.abspath(__file__)), cache_config["index_file"])
+    return cache_config
+
+
+@lru_cache(maxsize=None)
+def jmeter_identity(jmeter_path: str) -> Dict:
+    """
+    JMeter 설치 식별 정보 (실행마다 한 번만 계산)
+    실행 파일의 실제 경로와 ApacheJMeter.jar, lib/ext 플러그인 jar의 크기/수정 시각
+    (JMeter 업그레이드나 플러그인 교체 시 지문이 바뀌도록 함)
+    """
+    path = os.path.realpath(jmeter_path)
+    bin_dir = os.path.dirname(path)
+    jars = [os.path.join(bin_dir, "ApacheJMeter.jar")]
+    ext_dir = os.path.join(os.path.dirname(bin_dir), "lib", "ext")
+    if os.path.isdir(ext_dir):
+        jars.extend(os.path.join(ext_dir, name) for name in sorted(os.listdir(ext_dir)) if name.endswith(".jar"))
+    stats = {os.path.basename(jar): os.stat(jar) for jar in jars if os.path.exists(jar)}
+    return {
+        "path": path,
+        "jars": {name: [stat.st_size, stat.st_mtime_ns] for name, stat in stats.items()}
+    }
+
+
+def phase_fingerprint(config: Dict, request_specs: List[Dict], thread_count: int, duration: int,
+                      scenario_steps: Optional[List[Dict]] = None, load_profile: Optional[Dict] = None,
+                      jmeter_path: Optional[str] = None) -> str:
+    """
+    단계 결과를 식별하는 지문 (같은 지문이면 같은 조건으로 실행한 단계)
+    해석된 요청 템플릿, 대상 서버, 쓰레드 수, 지속시간, 엔진 종류/버전, 부하 프로파일, 분석 설정과
+    데이터 피더(설정, 파일 크기/수정 시각)로 계산
+    :param jmeter_path: JMeter 실행 파일 경로 (jmeter 엔진의 버전 식별에 사용)
+    """
+    engine = config.get("engine_config", {}).get("type", "jmeter")
+    feeder_config = config.get("data_feeder", {})
+    feeder = None
+    if feeder_config.get("enabled", False):
+        # 템플릿에는 ${컬럼}만 남으므로 피더 파일이 바뀌면 지문도 바뀌도록 파일 상태 포함
+        stat = os.stat(feeder_config["file"])
+        feeder = dict(feeder_config, path=os.path.abspath(feeder_config["file"]),
+                      size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+    if engine == "native":
+        engine_version = ENGINE_VERSION
+    else:
+        engine_version = jmeter_identity(jmeter_path) if jmeter_path else None
+    key = {
+        "server": config["server_config"],
+        "requests": scenario_steps or request_specs,
+        "thread_count": thread_count,
+        "duration": duration,
+        "engine": engine,
+        "engine_version": engine_version,
+        "load_profile": load_profile,
+        "analysis_config": config.get("analysis_config"),
+        "feeder": feeder
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def find_cached_phase(cache_config: Dict, fingerprint: str) -> Optional[Dict]:
+    """TTL 이내에 같은 지문으로 기록된 가장 최근 단계 (결과 파일이 남아 있는 것만)"""
+    index_file = cache_config["index_file"]
+    if not os.path.exists(index_file):
+        return None
+
+    oldest = time.time() - cache_config["ttl_hours"] * 3600
+    found = None
+    with open(index_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            entry = json.loads(line)
+            if entry["fingerprint"] != fingerprint or entry["created"] < oldest:
+                continue
+            if os.path.exists(os.path.join(entry["phase_dir"], entry["results_file"])):
+                found = entry
+    return found
+
+
+def record_cached_phase(cache_config: Dict, fingerprint: str, phase_dir: str, stats: Dict):
+    """분석이 끝난 유효 단계를 캐시 인덱스(JSON Lines)에 추가 (부하 발생기 포화 단계는 재사용하지 않음)"""
+    if not stats["valid"]:
+        return
+    entry = {
+        "fingerprint": fingerprint,
+        "phase_dir": os.path.abspath(phase_dir),
+        "results_file": stats["results_file"],
+        "created": time.time()
+    }
+    with open(cache_config["index_file"], 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def _link_or_copy(src: str, dst: str):
+    # 같은 파일 시스템이면 하드 링크로 JTL 등 큰 파일 복사 비용 절약
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def reuse_cached_phase(entry: Dict, phase_dir: str) -> Dict:
+    """
+    캐시된 단계 결과를 새 phase 폴더로 가져오기
+    :return: 캐시된 단계의 통계 (cached_from에 원본 phase 폴더 기록)
+    """
+    shutil.copytree(entry["phase_dir"], phase_dir, copy_function=_link_or_copy, dirs_exist_ok=True)
+    with open(os.path.join(phase_dir, entry["results_file"]), 'r', encoding='utf-8') as f:
+        stats = json.load(f)
+    stats["cached_from"] = entry["phase_dir"]
+    return stats
@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from dashboard_data import find_run_dirs, find_target_dirs, parse_phase_folder
+from load_profile import get_load_profile, get_warmup_seconds, apply_profile_warmup
+from result_analysis import ANALYSIS_VERSION, analyze_results
+from result_storage import find_raw_file
+from results_db import ResultsDB, DEFAULT_DB_PATH
+from run_manifest import has_manifest, read_manifest, rewrite_manifest
+from run_pivots import rebuild_run_pivots
+
+
+def _results_files(phase_dir: str) -> List[str]:
+    """phase 폴더의 분석 결과 JSON 이름 (오래된 순)"""
+    return sorted(
+        name for name in os.listdir(phase_dir)
+        if name.startswith('test_results_') and name.endswith('.json')
+    )
+
+
+def _read_latest_stats(phase_dir: str) -> Optional[Dict]:
+    results_files = _results_files(phase_dir)
+    if not results_files:
+        return None
+    with open(os.path.join(phase_dir, results_files[-1]), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def is_phase_current(phase_dir: str) -> bool:
+    """분석 결과가 현재 분석 버전으로 만들어졌고 원본 JTL보다 새로우면 True"""
+    jtl_file = find_raw_file(phase_dir)
+    results_files = _results_files(phase_dir)
+    if jtl_file is None or not results_files:
+        return False
+    results_file = os.path.join(phase_dir, results_files[-1])
+    with open(results_file, 'r', encoding='utf-8') as f:
+        if json.load(f).get("analysis_version") != ANALYSIS_VERSION:
+            return False
+    return os.path.getmtime(results_file) >= os.path.getmtime(jtl_file)
+
+
+def reanalyze_phase(phase_dir: str, config: Dict) -> Dict:
+    """
+    phase 폴더 하나를 원본 JTL로 다시 분석 (프로세스 풀 작업 단위)
+    이전 분석의 테스트 시간과 부하 발생기 감시 요약은 그대로 유지하고, 이전 결과 JSON/요약은 새 결과로 교체
+    :param config: 실행 당시 설정 (실행 폴더의 test_config.json)
+    :return: 매니페스트/DB 갱신에 필요한 단계 정보
+    """
+    jtl_file = find_raw_file(phase_dir)
+    thread_count, duration = parse_phase_folder(os.path.basename(phase_dir))
+    old_stats = _read_latest_stats(phase_dir) or {}
+    old_files = [
+        name for name in os.listdir(phase_dir)
+        if name.startswith(('test_results_', 'test_summary_'))
+    ]
+
+    load_profile = get_load_profile(config)
+    stats = analyze_results(
+        jtl_file, phase_dir, apply_profile_warmup(config.get('analysis_config'), load_profile, duration),
+        old_stats.get("generator"), get_warmup_seconds(load_profile, duration), old_stats.get("timestamp")
+    )
+
+    # 대시보드는 phase 폴더의 결과 JSON을 모두 읽으므로 이전 결과는 삭제
+    stamp = stats["results_file"][len('test_results_'):-len('.json')]
+    new_files = {f"test_results_{stamp}.json", f"test_summary_{stamp}.txt"}
+    for name in old_files:
+        if name not in new_files:
+            os.remove(os.path.join(phase_dir, name))
+
+    return {
+        "phase_dir": phase_dir,
+        "thread_count": thread_count,
+        "duration": duration,
+        "stats": stats
+    }
+
+
+def _load_run_config(run_dir: str) -> Dict:
+    config_file = os.path.join(run_dir, "test_config.json")
+    if not os.path.exists(config_file):
+        return {}
+    with open(config_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _run_id(run_dir: str) -> str:
+    """결과 DB 실행 ID (다중 대상 실행의 대상 폴더는 {실행}_{대상})"""
+    run_dir = os.path.normpath(run_dir)
+    parent = os.path.dirname(run_dir)
+    if os.path.basename(parent).startswith('stress_test_results'):
+        return f"{os.path.basename(parent)}_{os.path.basename(run_dir)}"
+    return os.path.basename(run_dir)
+
+
+def _update_manifest(run_dir: str, results: List[Dict]):
+    """다시 분석한 단계의 결과 파일 이름/유효 여부를 매니페스트에 반영"""
+    if not has_manifest(run_dir):
+        return
+    by_phase = {os.path.basename(result["phase_dir"]): result["stats"] for result in results}
+    entries, _ = read_manifest(run_dir)
+    for entry in entries:
+        stats = by_phase.get(entry["phase_dir"])
+        if stats:
+            entry.update(results_file=stats["results_file"], valid=stats["valid"], timestamp=stats["timestamp"])
+    rewrite_manifest(run_dir, entries)
+
+
+def reanalyze_runs(run_dirs: List[str], workers: Optional[int] = None, force: bool = False,
+                   db_path: Optional[str] = None) -> Dict[str, int]:
+    """
+    실행 폴더들의 phase를 프로세스 풀에서 병렬로 다시 분석하고 매니페스트/피벗(및 결과 DB)을 갱신
+    분석 결과가 최신인 phase는 건너뜀 (force면 모두 다시 분석)
+    :param workers: 프로세스 수 (None이면 CPU 수)
+    :return: 상태별 phase 수
+    """
+    # 다중 대상 실행은 대상 폴더 단위로 처리
+    expanded = []
+    for run_dir in run_dirs:
+        expanded.extend(find_target_dirs(run_dir) or [run_dir])
+
+    jobs = []
+    counts = {"reanalyzed": 0, "current": 0, "no_jtl": 0, "failed": 0}
+    for run_dir in expanded:
+        config = _load_run_config(run_dir)
+        for folder in sorted(os.listdir(run_dir)):
+            phase_dir = os.path.join(run_dir, folder)
+            if parse_phase_folder(folder) is None or not os.path.isdir(phase_dir):
+                continue
+            # 보존 기간이 지나 원본이 삭제된 phase는 기존 결과 유지
+            if find_raw_file(phase_dir) is None:
+                counts["no_jtl"] += 1
+                continue
+            if not force and is_phase_current(phase_dir):
+                counts["current"] += 1
+                continue
+            jobs.append((run_dir, phase_dir, config))
+
+    print(f"🔁 재분석 대상 phase {len(jobs)}개 (최신 {counts['current']}개, 원본 없음 {counts['no_jtl']}개 건너뜀)")
+    results_by_run: Dict[str, List[Dict]] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(reanalyze_phase, phase_dir, config): (run_dir, phase_dir)
+                   for run_dir, phase_dir, config in jobs}
+        for future in as_completed(futures):
+            run_dir, phase_dir = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ 재분석 실패: {phase_dir} ({str(e)})")
+                counts["failed"] += 1
+                continue
+            counts["reanalyzed"] += 1
+            results_by_run.setdefault(run_dir, []).append(result)
+
+    results_db = ResultsDB(db_path) if db_path else None
+    for run_dir, results in results_by_run.items():
+        _update_manifest(run_dir, results)
+        rebuild_run_pivots(run_dir)
+        if results_db:
+            run_id = _run_id(run_dir)
+            for result in results:
+                results_db.record_phase(run_id, os.path.basename(result["phase_dir"]),
+                                        result["thread_count"], result["duration"], result["stats"])
+        print(f"✅ 재분석 완료: {run_dir} (phase {len(results)}개)")
+    if results_db:
+        results_db.close()
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="저장된 실행 결과를 현재 분석 코드로 병렬 재분석")
+    parser.add_argument("run_dirs", nargs="*", help="stress_test_results_* 폴더 (없으면 전체)")
+    parser.add_argument("--workers", type=int, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--force", action="store_true", help="최신 결과도 다시 분석")
+    parser.add_argument("--db", nargs="?", const=DEFAULT_DB_PATH, help="결과 DB의 단계 통계도 갱신")
+    args = parser.parse_args()
+
+    # find_run_dirs는 다중 대상 실행을 이미 대상 폴더로 펼쳐서 반환
+    counts = reanalyze_runs(args.run_dirs or find_run_dirs(), args.workers, args.force, args.db)
+    print(json.dumps(counts, ensure_ascii=False))
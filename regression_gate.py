@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from dashboard_data import find_target_dirs, load_run
+
+DEFAULT_GATE_CONFIG = {
+    "baseline_file": "performance_baseline.json",
+    "p95_tolerance_pct": 10,
+    "p99_tolerance_pct": 15,
+    "rps_tolerance_pct": 10,
+    "max_threads_tolerance": 0
+}
+
+# 종료 코드
+EXIT_PASS = 0
+EXIT_REGRESSION = 1
+EXIT_ERROR = 2
+
+
+def get_gate_config(config: Dict) -> Dict:
+    """regression_gate 설정에 기본값 채우기"""
+    gate_config = dict(DEFAULT_GATE_CONFIG)
+    gate_config.update(config.get("regression_gate", {}))
+    return gate_config
+
+
+def summarize_run(run_dir: str, test_parameters: Dict) -> Optional[Dict]:
+    """
+    실행 결과를 게이트 비교용 요약으로 변환
+    max_sustainable_threads: 해당 쓰레드 수의 모든 유효 단계가 오류율/응답시간 임계값 이내이고 성능 저하가 없는 최대 쓰레드 수
+    """
+    data, endpoint_data = load_run(run_dir)
+    if data is None:
+        return None
+
+    passed = (data['error_rate'] <= test_parameters['error_threshold']) & \
+             (data['avg_response_time'] <= test_parameters['response_time_threshold'])
+    if 'degrading' in data.columns:
+        passed &= data['degrading'] != True
+    threads_passed = passed.groupby(data['thread_count']).all()
+    sustainable = threads_passed[threads_passed].index
+
+    endpoints = {}
+    if not endpoint_data.empty:
+        columns = [c for c in ['95th_percentile', '99th_percentile', 'requests_per_second'] if c in endpoint_data.columns]
+        grouped = endpoint_data.groupby(['endpoint', 'thread_count'])[columns].mean()
+        for (endpoint, thread_count), row in grouped.iterrows():
+            endpoints.setdefault(endpoint, {})[str(thread_count)] = {
+                "p95": row.get('95th_percentile'),
+                "p99": row.get('99th_percentile'),
+                "rps": row.get('requests_per_second')
+            }
+
+    return {
+        "run": os.path.basename(os.path.normpath(run_dir)),
+        "max_sustainable_threads": int(sustainable.max()) if len(sustainable) else 0,
+        "max_rps": float(data['requests_per_second'].max()),
+        "endpoints": endpoints
+    }
+
+
+def _change_pct(baseline: Optional[float], current: Optional[float]) -> Optional[float]:
+    if baseline is None or current is None or pd.isna(baseline) or pd.isna(current) or baseline == 0:
+        return None
+    return round((current - baseline) / baseline * 100, 2)
+
+
+def compare_to_baseline(summary: Dict, baseline: Dict, gate_config: Dict) -> Dict:
+    """기준 요약과 비교하여 허용치를 넘는 용량 회귀 목록 생성"""
+    regressions: List[Dict] = []
+
+    threads_drop = baseline["max_sustainable_threads"] - summary["max_sustainable_threads"]
+    if threads_drop > gate_config["max_threads_tolerance"]:
+        regressions.append({"metric": "max_sustainable_threads", "baseline": baseline["max_sustainable_threads"],
+                            "current": summary["max_sustainable_threads"]})
+
+    rps_change = _change_pct(baseline["max_rps"], summary["max_rps"])
+    if rps_change is not None and rps_change < -gate_config["rps_tolerance_pct"]:
+        regressions.append({"metric": "max_rps", "baseline": baseline["max_rps"],
+                            "current": summary["max_rps"], "change_pct": rps_change})
+
+    # 엔드포인트 × 쓰레드 수: 양쪽에 모두 있는 조합만 비교
+    checks = [("p95", "p95_tolerance_pct", 1), ("p99", "p99_tolerance_pct", 1), ("rps", "rps_tolerance_pct", -1)]
+    for endpoint, by_threads in baseline.get("endpoints", {}).items():
+        for thread_count, base_values in by_threads.items():
+            current_values = summary["endpoints"].get(endpoint, {}).get(thread_count)
+            if current_values is None:
+                continue
+            for metric, tolerance_key, direction in checks:
+                change = _change_pct(base_values.get(metric), current_values.get(metric))
+                if change is not None and change * direction > gate_config[tolerance_key]:
+                    regressions.append({"metric": metric, "endpoint": endpoint, "thread_count": int(thread_count),
+                                        "baseline": base_values[metric], "current": current_values[metric],
+                                        "change_pct": change})
+
+    return {
+        "run": summary["run"],
+        "baseline_run": baseline["run"],
+        "passed": not regressions,
+        "regressions": regressions,
+        "summary": {key: summary[key] for key in ("max_sustainable_threads", "max_rps")},
+        "baseline_summary": {key: baseline[key] for key in ("max_sustainable_threads", "max_rps")}
+    }
+
+
+def get_baseline_file(gate_config: Dict, target: Optional[str] = None) -> str:
+    """기준 파일 경로 (다중 대상 실행은 대상별로 파일 이름 뒤에 _대상 이름 추가)"""
+    if target is None:
+        return gate_config["baseline_file"]
+    stem, ext = os.path.splitext(gate_config["baseline_file"])
+    return f"{stem}_{target}{ext}"
+
+
+def _gate_run(run_dir: str, test_parameters: Dict, gate_config: Dict, baseline_file: str,
+              save_baseline: bool) -> Tuple[int, Dict]:
+    """결과 폴더 하나를 기준과 비교 (또는 기준으로 저장)"""
+    summary = summarize_run(run_dir, test_parameters)
+    if summary is None:
+        return EXIT_ERROR, {"passed": False, "error": f"결과 없음: {run_dir}"}
+
+    if save_baseline:
+        with open(baseline_file, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=4, ensure_ascii=False)
+        return EXIT_PASS, {"passed": True, "baseline_saved": baseline_file, "run": summary["run"]}
+
+    if not os.path.exists(baseline_file):
+        return EXIT_ERROR, {"passed": False, "error": f"기준 파일 없음: {baseline_file}"}
+
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    result = compare_to_baseline(summary, baseline, gate_config)
+    return (EXIT_PASS if result["passed"] else EXIT_REGRESSION), result
+
+
+def run_regression_gate(run_dir: str, config: Dict, save_baseline: bool = False,
+                        output_file: Optional[str] = None) -> int:
+    """
+    UI 없이 실행 결과를 기준과 비교하고 종료 코드 반환
+    다중 대상 실행은 대상별 기준 파일과 각각 비교하며 가장 나쁜 종료 코드 반환
+    :return: 0 통과, 1 회귀 발견, 2 비교 불가
+    """
+    gate_config = get_gate_config(config)
+    target_dirs = find_target_dirs(run_dir)
+
+    if not target_dirs:
+        exit_code, result = _gate_run(run_dir, config['test_parameters'], gate_config,
+                                      get_baseline_file(gate_config), save_baseline)
+    else:
+        exit_code, result = EXIT_PASS, {"passed": True, "targets": {}}
+        for target_dir in target_dirs:
+            target = os.path.basename(target_dir)
+            # 대상별로 덮어쓴 임계값은 대상 폴더의 test_config.json 기준
+            with open(os.path.join(target_dir, 'test_config.json'), 'r') as f:
+                test_parameters = json.load(f)['test_parameters']
+            target_code, target_result = _gate_run(target_dir, test_parameters, gate_config,
+                                                   get_baseline_file(gate_config, target), save_baseline)
+            exit_code = max(exit_code, target_code)
+            result["targets"][target] = target_result
+        result["passed"] = exit_code == EXIT_PASS
+
+    result_json = json.dumps(result, indent=4, ensure_ascii=False)
+    print(result_json)
+    if output_file:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(result_json)
+    return exit_code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="저장된 기준 대비 용량 회귀 검사 (CI용)")
+    parser.add_argument("run_dir", help="stress_test_results_* 폴더")
+    parser.add_argument("--config", default="stresstest_config.json")
+    parser.add_argument("--save-baseline", action="store_true", help="이 실행을 새 기준으로 저장")
+    parser.add_argument("--output", help="비교 결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        gate_run_config = json.load(f)
+    sys.exit(run_regression_gate(args.run_dir, gate_run_config, args.save_baseline, args.output))
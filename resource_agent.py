@@ -0,0 +1,35 @@
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from resource_sampler import read_proc_sample
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics 요청에 /proc 원본 샘플을 JSON으로 응답"""
+
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = json.dumps(read_proc_sample()).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    # 대상 서버에서 실행: python resource_agent.py --port 9100
+    # stresstest_config.json의 resource_sampler.agent_url에 http://<서버>:9100/metrics 지정
+    parser = argparse.ArgumentParser(description="서버 자원 사용량 에이전트")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+
+    print(f"📡 자원 사용량 에이전트 시작: http://{args.host}:{args.port}/metrics")
+    ThreadingHTTPServer((args.host, args.port), MetricsHandler).serve_forever()
@@ -0,0 +1,180 @@
+import csv
+import json
+import os
+import threading
+import time
+import urllib.request
+from typing import Dict, Optional
+
+import pandas as pd
+
+RESOURCES_FILE = "server_resources.csv"
+
+RESOURCE_FIELDS = [
+    "timestamp", "cpu_pct", "iowait_pct", "mem_used_pct", "load1",
+    "disk_read_kbps", "disk_write_kbps", "net_rx_kbps", "net_tx_kbps"
+]
+
+
+def _block_devices(proc_root: str):
+    sys_block = "/sys/block"
+    if proc_root == "/proc" and os.path.isdir(sys_block):
+        return set(os.listdir(sys_block))
+    return None
+
+
+def read_proc_sample(proc_root: str = "/proc") -> Dict:
+    """
+    /proc에서 누적 카운터 원본 값 읽기 (CPU jiffies, 메모리, 디스크 섹터, 네트워크 바이트)
+    비율 계산은 두 샘플 간 차이로 수행 (compute_rates)
+    """
+    sample = {"timestamp": int(time.time() * 1000)}
+
+    with open(os.path.join(proc_root, "stat")) as f:
+        cpu = [int(v) for v in f.readline().split()[1:]]
+    sample["cpu_total"] = sum(cpu[:8])
+    sample["cpu_idle"] = cpu[3]
+    sample["cpu_iowait"] = cpu[4] if len(cpu) > 4 else 0
+
+    meminfo = {}
+    with open(os.path.join(proc_root, "meminfo")) as f:
+        for line in f:
+            key, value = line.split(":", 1)
+            meminfo[key] = int(value.split()[0])
+    sample["mem_total_kb"] = meminfo.get("MemTotal", 0)
+    sample["mem_available_kb"] = meminfo.get("MemAvailable", meminfo.get("MemFree", 0))
+
+    with open(os.path.join(proc_root, "loadavg")) as f:
+        sample["load1"] = float(f.read().split()[0])
+
+    devices = _block_devices(proc_root)
+    sectors_read = sectors_written = 0
+    with open(os.path.join(proc_root, "diskstats")) as f:
+        for line in f:
+            parts = line.split()
+            if devices is not None and parts[2] not in devices:
+                continue
+            if parts[2].startswith(("loop", "ram")):
+                continue
+            sectors_read += int(parts[5])
+            sectors_written += int(parts[9])
+    sample["disk_read_sectors"] = sectors_read
+    sample["disk_write_sectors"] = sectors_written
+
+    rx_bytes = tx_bytes = 0
+    with open(os.path.join(proc_root, "net/dev")) as f:
+        for line in f.readlines()[2:]:
+            name, values = line.split(":", 1)
+            if name.strip() == "lo":
+                continue
+            values = values.split()
+            rx_bytes += int(values[0])
+            tx_bytes += int(values[8])
+    sample["net_rx_bytes"] = rx_bytes
+    sample["net_tx_bytes"] = tx_bytes
+
+    return sample
+
+
+def compute_rates(previous: Dict, current: Dict) -> Dict:
+    """두 원본 샘플 간 차이로 사용률/초당 처리량 계산"""
+    seconds = max((current["timestamp"] - previous["timestamp"]) / 1000, 1e-3)
+    cpu_delta = max(current["cpu_total"] - previous["cpu_total"], 1)
+    idle_delta = current["cpu_idle"] - previous["cpu_idle"]
+    iowait_delta = current["cpu_iowait"] - previous["cpu_iowait"]
+    mem_total = max(current["mem_total_kb"], 1)
+
+    return {
+        "timestamp": current["timestamp"],
+        "cpu_pct": round((cpu_delta - idle_delta - iowait_delta) / cpu_delta * 100, 2),
+        "iowait_pct": round(iowait_delta / cpu_delta * 100, 2),
+        "mem_used_pct": round((mem_total - current["mem_available_kb"]) / mem_total * 100, 2),
+        "load1": current["load1"],
+        # 섹터 = 512 bytes
+        "disk_read_kbps": round((current["disk_read_sectors"] - previous["disk_read_sectors"]) / 2 / seconds, 2),
+        "disk_write_kbps": round((current["disk_write_sectors"] - previous["disk_write_sectors"]) / 2 / seconds, 2),
+        "net_rx_kbps": round((current["net_rx_bytes"] - previous["net_rx_bytes"]) / 1024 / seconds, 2),
+        "net_tx_kbps": round((current["net_tx_bytes"] - previous["net_tx_bytes"]) / 1024 / seconds, 2)
+    }
+
+
+def fetch_agent_sample(agent_url: str, timeout: float = 2) -> Dict:
+    """대상 서버에서 실행 중인 resource_agent.py로부터 원본 샘플 조회"""
+    with urllib.request.urlopen(agent_url, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+class ResourceSampler:
+    def __init__(self, results_dir: str, interval_seconds: float = 1, agent_url: Optional[str] = None):
+        """
+        단계 진행 중 서버 자원 사용량을 일정 간격으로 수집하여 phase 폴더에 저장
+        Args:
+            results_dir: 결과 저장 디렉토리 (phase 폴더)
+            interval_seconds: 수집 간격 (초)
+            agent_url: 원격 에이전트 주소 (없으면 로컬 /proc 사용)
+        """
+        self.output_file = os.path.join(results_dir, RESOURCES_FILE)
+        self.interval_seconds = interval_seconds
+        self.agent_url = agent_url
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self) -> Dict:
+        if self.agent_url:
+            return fetch_agent_sample(self.agent_url)
+        return read_proc_sample()
+
+    def _run(self):
+        with open(self.output_file, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=RESOURCE_FIELDS)
+            writer.writeheader()
+            previous = None
+            while not self._stop.is_set():
+                try:
+                    current = self._sample()
+                    if previous:
+                        writer.writerow(compute_rates(previous, current))
+                        f.flush()
+                    previous = current
+                except Exception as e:
+                    print(f"⚠️ 자원 사용량 수집 실패: {str(e)}")
+                    previous = None
+                self._stop.wait(self.interval_seconds)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def start_resource_sampler(config: Dict, results_dir: str) -> Optional[ResourceSampler]:
+    """설정에 따라 자원 샘플러 시작 (비활성화 시 None)"""
+    sampler_config = config.get("resource_sampler", {})
+    if not sampler_config.get("enabled", False):
+        return None
+    return ResourceSampler(
+        results_dir,
+        interval_seconds=sampler_config.get("interval_seconds", 1),
+        agent_url=sampler_config.get("agent_url")
+    ).start()
+
+
+def load_resources(phase_dir: str) -> Optional[pd.DataFrame]:
+    """저장된 자원 사용량 시계열 로드 (없으면 None)"""
+    resources_file = os.path.join(phase_dir, RESOURCES_FILE)
+    if not os.path.exists(resources_file):
+        return None
+    return pd.read_csv(resources_file)
+
+
+def join_with_timeseries(series: pd.DataFrame, resources: pd.DataFrame) -> pd.DataFrame:
+    """구간별 처리량 시계열에 가장 가까운 시점의 자원 사용량 결합"""
+    return pd.merge_asof(
+        series.sort_values("timestamp"),
+        resources.sort_values("timestamp"),
+        on="timestamp",
+        direction="nearest"
+    )
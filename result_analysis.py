@@ -0,0 +1,179 @@
+import json
+import os
+from datetime import datetime
+from json import JSONEncoder
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# 구간별 시계열 저장 및 성능 저하 감지
+from timeseries_analysis import save_timeseries, detect_degradation, get_analysis_config
+# JTL 드릴다운용 보조 인덱스
+from jtl_index import build_jtl_index
+# 엔드포인트/구간별 오류 분류
+from error_taxonomy import save_error_breakdown
+
+# 분석 결과 형식이 바뀌면 올림 (reanalyze.py가 이전 버전으로 분석된 단계를 다시 분석)
+ANALYSIS_VERSION = 3
+
+
+class NumpyEncoder(JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, np.integer):
+            return int(obj)
+        elif isinstance(obj, np.floating):
+            return float(obj)
+        elif isinstance(obj, np.ndarray):
+            return obj.tolist()
+        return super(NumpyEncoder, self).default(obj)
+
+
+def analyze_results(jtl_file: str, results_dir: str, analysis_config: Optional[Dict] = None,
+                    generator_stats: Optional[Dict] = None, warmup_seconds: float = 0,
+                    test_time: Optional[str] = None) -> Dict:
+    """
+    테스트 결과 분석 및 저장
+    :param jtl_file: JMeter 결과 파일 (.jtl)
+    :param results_dir: 결과 저장 디렉토리
+    :param analysis_config: 시계열 구간/워밍업 설정 (stresstest_config.json의 analysis_config)
+    :param generator_stats: 부하 발생기 감시 요약 (포화 시 단계 무효 처리)
+    :param warmup_seconds: 통계에서 제외할 단계 시작 후 시간 (부하 프로파일의 램프 구간)
+    :param test_time: 기록할 테스트 시간 (재분석 시 원래 값 유지, 없으면 현재 시각)
+    :return: 분석된 통계 정보
+    """
+    print(f"📊 테스트 결과 분석 중... ({jtl_file})")
+    
+    # JTL 파일 읽기
+    samples = pd.read_csv(jtl_file)
+    
+    # 특정 초/엔드포인트/오류 행만 다시 읽을 수 있도록 바이트 오프셋 인덱스 저장
+    jtl_index_file = build_jtl_index(jtl_file, results_dir, samples)
+    
+    # 램프 구간 샘플은 목표 부하에 도달하기 전이므로 통계에서 제외 (남는 샘플이 없으면 전체 사용)
+    df = samples
+    if warmup_seconds:
+        measured = samples[samples['timeStamp'] >= samples['timeStamp'].min() + warmup_seconds * 1000]
+        if not measured.empty:
+            df = measured
+    
+    # 기본 통계 계산
+    stats = {
+        "timestamp": test_time or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "analysis_version": ANALYSIS_VERSION,
+        "total_requests": len(df),
+        "error_count": (df['success'] == False).sum(),
+        "error_rate": float((df['success'] == False).mean() * 100),
+        
+        # 응답 시간 통계 (밀리초)
+        "response_time": {
+            "min": float(df['elapsed'].min()),
+            "max": float(df['elapsed'].max()),
+            "mean": float(df['elapsed'].mean()),
+            "median": float(df['elapsed'].median()),
+            "90th_percentile": float(df['elapsed'].quantile(0.90)),
+            "95th_percentile": float(df['elapsed'].quantile(0.95)),
+            "99th_percentile": float(df['elapsed'].quantile(0.99))
+        },
+        
+        # 연결 시간 통계 (밀리초, JTL의 Connect 컬럼 - keep-alive 재사용 시 0)
+        "connect_time": {
+            "mean": float(df['Connect'].mean()),
+            "95th_percentile": float(df['Connect'].quantile(0.95)),
+            "max": float(df['Connect'].max()),
+            "new_connection_rate": float((df['Connect'] > 0).mean() * 100)
+        } if 'Connect' in df.columns else {},
+        
+        # 처리량 통계
+        "throughput": {
+            "requests_per_second": float(len(df) / (df['timeStamp'].max() - df['timeStamp'].min()) * 1000),
+            "total_bytes": int(df['bytes'].sum()),
+            "avg_bytes_per_request": float(df['bytes'].mean())
+        },
+        
+        # 에러 상세 정보
+        "errors": df[df['success'] == False]['responseMessage'].value_counts().to_dict(),
+        
+        # 엔드포인트별 오류 분류 (연결/응답 타임아웃, 연결 거부/재설정, HTTP 코드별, assertion)
+        "error_taxonomy": {},
+        
+        # HTTP 응답 코드 분포
+        "response_codes": df['responseCode'].value_counts().to_dict(),
+        
+        # 통계에서 제외한 램프 구간
+        "warmup": {
+            "seconds": warmup_seconds,
+            "excluded_requests": len(samples) - len(df)
+        }
+    }
+    
+    # 엔드포인트별 통계
+    endpoint_stats = {}
+    for endpoint in df['label'].unique():
+        endpoint_df = df[df['label'] == endpoint]
+        endpoint_stats[endpoint] = {
+            "total_requests": len(endpoint_df),
+            "error_rate": float((endpoint_df['success'] == False).mean() * 100),
+            "avg_response_time": float(endpoint_df['elapsed'].mean()),
+            "90th_percentile": float(endpoint_df['elapsed'].quantile(0.90)),
+            "95th_percentile": float(endpoint_df['elapsed'].quantile(0.95)),
+            "99th_percentile": float(endpoint_df['elapsed'].quantile(0.99)),
+            "requests_per_second": float(len(endpoint_df) / max(endpoint_df['timeStamp'].max() - endpoint_df['timeStamp'].min(), 1) * 1000),
+            "avg_connect_time": float(endpoint_df['Connect'].mean()) if 'Connect' in endpoint_df.columns else None,
+            "error_count": int((endpoint_df['success'] == False).sum())
+        }
+    
+    stats["endpoint_statistics"] = endpoint_stats
+    stats["jtl_index_file"] = os.path.basename(jtl_index_file) if jtl_index_file else None
+    
+    # 구간별 오류 분류 (시계열과 같은 구간 크기, 단계 첫 샘플 기준)
+    error_breakdown_file, stats["error_taxonomy"] = save_error_breakdown(
+        df, results_dir, int(samples['timeStamp'].min()), get_analysis_config(analysis_config)['window_seconds'])
+    stats["error_breakdown_file"] = os.path.basename(error_breakdown_file)
+    
+    # 구간별 시계열 (초당 처리량/오류율/응답시간 분위수)
+    timeseries_file, series = save_timeseries(samples, results_dir, analysis_config)
+    stats["timeseries_file"] = os.path.basename(timeseries_file)
+    print(f"📈 시계열 저장 완료: {timeseries_file}")
+    
+    # 단계 내 성능 저하 추세 감지
+    stats["degradation"] = detect_degradation(series, analysis_config)
+    
+    # 부하 발생기가 병목이었던 단계는 무효
+    stats["generator"] = generator_stats or {}
+    stats["valid"] = not stats["generator"].get("saturated", False)
+    
+    # JSON 파일로 저장
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    json_results_file = os.path.join(results_dir, f"test_results_{timestamp}.json")
+    stats["results_file"] = os.path.basename(json_results_file)
+    
+    # 이렇게 사용:
+    with open(json_results_file, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, indent=4, ensure_ascii=False, cls=NumpyEncoder)
+    
+    print(f"✅ 분석 결과 저장 완료: {json_results_file}")
+    
+    # 요약 로그 파일 생성
+    summary_file = os.path.join(results_dir, f"test_summary_{timestamp}.txt")
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        f.write(f"스트레스 테스트 결과 요약\n")
+        f.write(f"테스트 시간: {stats['timestamp']}\n")
+        f.write(f"총 요청 수: {stats['total_requests']}\n")
+        f.write(f"오류율: {stats['error_rate']:.2f}%\n")
+        f.write(f"평균 응답 시간: {stats['response_time']['mean']:.2f}ms\n")
+        f.write(f"90th 백분위 응답 시간: {stats['response_time']['90th_percentile']:.2f}ms\n")
+        f.write(f"초당 요청 수: {stats['throughput']['requests_per_second']:.2f}\n")
+        if stats['connect_time']:
+            f.write(f"평균 연결 시간: {stats['connect_time']['mean']:.2f}ms (신규 연결 비율 {stats['connect_time']['new_connection_rate']:.2f}%)\n")
+        
+        f.write("\n엔드포인트별 통계:\n")
+        for endpoint, endpoint_stat in stats["endpoint_statistics"].items():
+            f.write(f"\n{endpoint}:\n")
+            f.write(f"  총 요청 수: {endpoint_stat['total_requests']}\n")
+            f.write(f"  오류율: {endpoint_stat['error_rate']:.2f}%\n")
+            f.write(f"  평균 응답 시간: {endpoint_stat['avg_response_time']:.2f}ms\n")
+    
+    print(f"📝 테스트 요약 저장 완료: {summary_file}")
+    
+    return stats
@@ -0,0 +1,125 @@
+import gzip
+import os
+import shutil
+import time
+from typing import Dict, List, Optional, Tuple
+
+from dashboard_data import find_run_dirs
+
+JTL_FILE = "test_results.jtl"
+LOG_FILE = "jmeter.log"
+RAW_FILES = (JTL_FILE, LOG_FILE)
+
+# 확장자 → 압축 방식
+CODEC_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+DEFAULT_STORAGE_CONFIG = {
+    # 분석 후 원본 JTL/로그 압축
+    "compress": False,
+    # gzip | zstd (zstd는 zstandard 패키지 필요, 없으면 gzip)
+    "codec": "gzip",
+    # 이 기간(일)이 지난 실행의 원본 JTL/로그 삭제 (집계 결과는 유지, None이면 삭제 안 함)
+    "raw_retention_days": None
+}
+
+# 스트리밍 압축/해제 단위 (파일 전체를 메모리에 올리지 않음)
+CHUNK_BYTES = 1024 * 1024
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def get_storage_config(config: Dict) -> Dict:
+    """result_storage 설정에 기본값 채우기"""
+    storage_config = dict(DEFAULT_STORAGE_CONFIG)
+    storage_config.update(config.get("result_storage", {}))
+    return storage_config
+
+
+def find_raw_file(phase_dir: str, name: str = JTL_FILE) -> Optional[str]:
+    """phase 폴더의 원본 파일 경로 (압축 여부와 관계없이, 없으면 None)"""
+    for ext in ("",) + tuple(CODEC_EXTENSIONS.values()):
+        path = os.path.join(phase_dir, name + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def open_raw_file(path: str):
+    """원본 파일을 바이너리 읽기 스트림으로 열기 (.gz/.zst는 압축 해제하며 읽음)"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def _resolve_codec(codec: str) -> str:
+    if codec == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            print("⚠️ zstandard 패키지가 없어 gzip으로 압축합니다")
+            return "gzip"
+    return codec
+
+
+def compress_file(path: str, codec: str = "gzip") -> str:
+    """
+    파일을 스트리밍으로 압축하고 원본 삭제
+    :return: 압축 파일 경로
+    """
+    codec = _resolve_codec(codec)
+    target = path + CODEC_EXTENSIONS[codec]
+    temp_file = target + ".tmp"
+    with open(path, "rb") as src:
+        if codec == "zstd":
+            import zstandard
+            with open(temp_file, "wb") as raw, \
+                    zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw) as dst:
+                shutil.copyfileobj(src, dst, CHUNK_BYTES)
+        else:
+            with gzip.open(temp_file, "wb", compresslevel=GZIP_LEVEL) as dst:
+                shutil.copyfileobj(src, dst, CHUNK_BYTES)
+    # 원본 수정 시각 유지 (보존 기간/재분석 판단은 원본 기록 시각 기준)
+    shutil.copystat(path, temp_file)
+    os.replace(temp_file, target)
+    os.remove(path)
+    return target
+
+
+def compress_phase_raw(phase_dir: str, storage_config: Dict) -> List[str]:
+    """분석이 끝난 phase 폴더의 원본 JTL/로그 압축 (이미 압축된 파일은 건너뜀)"""
+    compressed = []
+    for name in RAW_FILES:
+        path = os.path.join(phase_dir, name)
+        if os.path.exists(path):
+            compressed.append(compress_file(path, storage_config["codec"]))
+    return compressed
+
+
+def apply_retention(storage_config: Dict, root: str = '.', sidecar_files: Tuple[str, ...] = ()) -> int:
+    """
+    보존 기간이 지난 실행의 원본 JTL/로그(압축 포함) 삭제
+    집계 결과(JSON, 시계열, 매니페스트)는 그대로 두므로 대시보드/비교는 계속 가능
+    :param sidecar_files: 원본과 함께 삭제할 파생 파일 (JTL 드릴다운 인덱스 등)
+    :return: 삭제한 파일 수
+    """
+    if storage_config["raw_retention_days"] is None:
+        return 0
+
+    oldest = time.time() - storage_config["raw_retention_days"] * 86400
+    removed = 0
+    for run_dir in find_run_dirs(root):
+        for entry in os.scandir(run_dir):
+            if not entry.is_dir() or not entry.name.startswith("phase_"):
+                continue
+            for name in RAW_FILES + sidecar_files:
+                for ext in ("",) + tuple(CODEC_EXTENSIONS.values()):
+                    path = os.path.join(entry.path, name + ext)
+                    if os.path.exists(path) and os.path.getmtime(path) < oldest:
+                        os.remove(path)
+                        removed += 1
+    if removed:
+        print(f"🧹 보존 기간({storage_config['raw_retention_days']}일)이 지난 원본 결과 파일 {removed}개 삭제")
+    return removed
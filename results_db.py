@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+DEFAULT_DB_PATH = "stress_test_results.db"
+
+# 실행 ID(stress_test_results_YYYYmmdd_HHMMSS[_대상])에 들어 있는 실행 시작 시각
+RUN_ID_TIME_PATTERN = re.compile(r"stress_test_results_(\d{8}_\d{6})")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    build_tag TEXT,
+    target TEXT,
+    started_at TEXT,
+    config TEXT
+);
+CREATE TABLE IF NOT EXISTS phases (
+    run_id TEXT NOT NULL,
+    phase_dir TEXT NOT NULL,
+    thread_count INTEGER NOT NULL,
+    duration INTEGER NOT NULL,
+    timestamp TEXT,
+    total_requests INTEGER,
+    error_rate REAL,
+    avg_response_time REAL,
+    p90 REAL,
+    p95 REAL,
+    p99 REAL,
+    rps REAL,
+    valid INTEGER,
+    degrading INTEGER,
+    PRIMARY KEY (run_id, phase_dir)
+);
+CREATE TABLE IF NOT EXISTS endpoint_stats (
+    run_id TEXT NOT NULL,
+    phase_dir TEXT NOT NULL,
+    thread_count INTEGER NOT NULL,
+    duration INTEGER NOT NULL,
+    endpoint TEXT NOT NULL,
+    total_requests INTEGER,
+    error_rate REAL,
+    avg_response_time REAL,
+    p90 REAL,
+    p95 REAL,
+    p99 REAL,
+    rps REAL,
+    PRIMARY KEY (run_id, phase_dir, endpoint)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_build_tag ON runs (build_tag);
+CREATE INDEX IF NOT EXISTS idx_phases_threads ON phases (run_id, thread_count, duration);
+CREATE INDEX IF NOT EXISTS idx_endpoint_lookup ON endpoint_stats (endpoint, thread_count, duration, run_id);
+"""
+
+# 실행 간 비교: 기준 실행과 비교 실행의 엔드포인트 × 쓰레드 수별 p95/RPS 변화율
+REGRESSION_QUERY = """
+WITH agg AS (
+    SELECT e.run_id, e.endpoint, e.thread_count,
+           AVG(e.p95) AS p95, AVG(e.p99) AS p99, AVG(e.rps) AS rps, AVG(e.error_rate) AS error_rate
+    FROM endpoint_stats e
+    JOIN phases p ON p.run_id = e.run_id AND p.phase_dir = e.phase_dir
+    WHERE e.run_id IN (?, ?) AND p.valid = 1
+    GROUP BY e.run_id, e.endpoint, e.thread_count
+)
+SELECT b.endpoint, b.thread_count,
+       b.p95 AS baseline_p95, c.p95 AS candidate_p95,
+       (c.p95 - b.p95) / NULLIF(b.p95, 0) * 100 AS p95_change_pct,
+       b.rps AS baseline_rps, c.rps AS candidate_rps,
+       (c.rps - b.rps) / NULLIF(b.rps, 0) * 100 AS rps_change_pct,
+       b.error_rate AS baseline_error_rate, c.error_rate AS candidate_error_rate
+FROM agg b
+JOIN agg c ON c.endpoint = b.endpoint AND c.thread_count = b.thread_count
+WHERE b.run_id = ? AND c.run_id = ?
+ORDER BY b.endpoint, b.thread_count
+"""
+
+
+class ResultsDB:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """
+        실행 간 비교를 위한 로컬 결과 저장소 (SQLite)
+        Args:
+            db_path: DB 파일 경로
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def record_run(self, run_id: str, config: Dict, build_tag: Optional[str] = None, target: Optional[str] = None):
+        """
+        실행 정보 등록
+        시작 시각은 실행 ID의 시각, 실행 ID에 시각이 없으면 처음 등록한 시각 (다시 등록해도 유지)
+        """
+        server = config.get("server_config", {})
+        started_at = get_run_started_at(run_id)
+        with self.conn:
+            self.conn.execute(
+                """INSERT INTO runs (run_id, build_tag, target, started_at, config) VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(run_id) DO UPDATE SET
+                       build_tag = excluded.build_tag, target = excluded.target, config = excluded.config,
+                       started_at = COALESCE(?, runs.started_at)""",
+                (run_id, build_tag, target or f"{server.get('server_name')}:{server.get('port')}",
+                 started_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S"), json.dumps(config), started_at)
+            )
+
+    def record_phase(self, run_id: str, phase_dir: str, thread_count: int, duration: int, stats: Dict):
+        """단계 결과와 엔드포인트별 통계 저장"""
+        response_time = stats["response_time"]
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO phases VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, phase_dir, thread_count, duration, stats["timestamp"], int(stats["total_requests"]),
+                 stats["error_rate"], response_time["mean"], response_time["90th_percentile"],
+                 response_time["95th_percentile"], response_time["99th_percentile"],
+                 stats["throughput"]["requests_per_second"], int(stats.get("valid", True)),
+                 int(stats.get("degradation", {}).get("degrading", False)))
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO endpoint_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, phase_dir, thread_count, duration, endpoint, int(endpoint_stat["total_requests"]),
+                     endpoint_stat["error_rate"], endpoint_stat["avg_response_time"],
+                     endpoint_stat.get("90th_percentile"), endpoint_stat.get("95th_percentile"),
+                     endpoint_stat.get("99th_percentile"), endpoint_stat.get("requests_per_second"))
+                    for endpoint, endpoint_stat in stats["endpoint_statistics"].items()
+                ]
+            )
+
+    def list_runs(self) -> pd.DataFrame:
+        """저장된 실행 목록 (단계 수, 최대 쓰레드 수 포함)"""
+        return pd.read_sql_query("""
+            SELECT r.run_id, r.build_tag, r.target, r.started_at,
+                   COUNT(p.phase_dir) AS phases, MAX(p.thread_count) AS max_threads, MAX(p.rps) AS max_rps
+            FROM runs r LEFT JOIN phases p ON p.run_id = r.run_id
+            GROUP BY r.run_id ORDER BY r.started_at
+        """, self.conn)
+
+    def compare_runs(self, baseline_run: str, candidate_run: str) -> pd.DataFrame:
+        """기준 실행 대비 비교 실행의 엔드포인트 × 쓰레드 수별 p95/RPS 변화"""
+        comparison = pd.read_sql_query(REGRESSION_QUERY, self.conn,
+                                       params=(baseline_run, candidate_run, baseline_run, candidate_run))
+        # 이전 버전 결과에는 엔드포인트별 p95/RPS가 없어 NULL일 수 있음
+        numeric_columns = comparison.columns.drop('endpoint')
+        comparison[numeric_columns] = comparison[numeric_columns].apply(pd.to_numeric, errors='coerce')
+        return comparison
+
+    def run_trend(self, endpoint: str) -> pd.DataFrame:
+        """엔드포인트의 실행별 쓰레드 수에 따른 p95/RPS 추이"""
+        return pd.read_sql_query("""
+            SELECT r.run_id, r.build_tag, e.thread_count, AVG(e.p95) AS p95, AVG(e.rps) AS rps
+            FROM endpoint_stats e JOIN runs r ON r.run_id = e.run_id
+            WHERE e.endpoint = ?
+            GROUP BY r.run_id, e.thread_count ORDER BY r.started_at, e.thread_count
+        """, self.conn, params=(endpoint,))
+
+    def list_endpoints(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT endpoint FROM endpoint_stats ORDER BY endpoint")]
+
+    def close(self):
+        self.conn.close()
+
+
+def get_run_started_at(run_id: str) -> Optional[str]:
+    """실행 ID에서 시작 시각 추출 (기존 결과 폴더를 나중에 등록해도 실행 순서 유지, 형식이 다르면 None)"""
+    match = RUN_ID_TIME_PATTERN.search(run_id)
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").strftime("%Y-%m-%d %H:%M:%S")
+
+
+def open_results_db(config: Dict) -> Optional[ResultsDB]:
+    """설정에 따라 결과 DB 열기 (비활성화 시 None)"""
+    db_config = config.get("results_db", {})
+    if not db_config.get("enabled", True):
+        return None
+    return ResultsDB(db_config.get("path", DEFAULT_DB_PATH))
+
+
+def get_build_tag(config: Dict) -> Optional[str]:
+    """빌드 태그 (설정의 build_tag, 없으면 BUILD_TAG 환경 변수)"""
+    return config.get("build_tag") or os.environ.get("BUILD_TAG")
+
+
+def import_run(db: ResultsDB, base_dir: str, run_id: Optional[str] = None):
+    """기존 stress_test_results_* 폴더를 DB에 등록 (다중 대상 실행은 대상별로 {실행}_{대상} ID 사용)"""
+    from dashboard_data import find_target_dirs, parse_phase_folder
+
+    run_id = run_id or os.path.basename(os.path.normpath(base_dir))
+    target_dirs = find_target_dirs(base_dir)
+    if target_dirs:
+        for target_dir in target_dirs:
+            import_run(db, target_dir, f"{run_id}_{os.path.basename(target_dir)}")
+        return
+
+    config_file = os.path.join(base_dir, "test_config.json")
+    config = {}
+    if os.path.exists(config_file):
+        with open(config_file, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    db.record_run(run_id, config, get_build_tag(config))
+
+    for folder in sorted(os.listdir(base_dir)):
+        phase = parse_phase_folder(folder)
+        if phase is None:
+            continue
+        phase_dir = os.path.join(base_dir, folder)
+        for stats_file in sorted(os.listdir(phase_dir)):
+            if stats_file.startswith("test_results_") and stats_file.endswith(".json"):
+                with open(os.path.join(phase_dir, stats_file), "r", encoding="utf-8") as f:
+                    db.record_phase(run_id, folder, phase[0], phase[1], json.load(f))
+    print(f"✅ DB 등록 완료: {run_id}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="기존 실행 결과를 결과 DB에 등록")
+    parser.add_argument("run_dirs", nargs="+", help="stress_test_results_* 폴더")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    args = parser.parse_args()
+
+    results_db = ResultsDB(args.db)
+    for run_dir in args.run_dirs:
+        import_run(results_db, run_dir)
+    results_db.close()
@@ -0,0 +1,54 @@
+import os
+import json
+from typing import Dict, List, Tuple
+
+MANIFEST_FILE = "run_manifest.jsonl"
+
+
+def append_manifest_entry(base_dir: str, entry: Dict):
+    """완료된 단계 정보를 실행 매니페스트(JSON Lines)에 한 줄 추가"""
+    with open(os.path.join(base_dir, MANIFEST_FILE), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def rewrite_manifest(base_dir: str, entries: List[Dict]):
+    """매니페스트 전체를 다시 쓰기 (재분석 후 결과 파일 이름 갱신용, 임시 파일로 쓴 뒤 교체)"""
+    path = os.path.join(base_dir, MANIFEST_FILE)
+    temp_file = path + ".tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    os.replace(temp_file, path)
+
+
+def has_manifest(base_dir: str) -> bool:
+    return os.path.exists(os.path.join(base_dir, MANIFEST_FILE))
+
+
+def get_manifest_size(base_dir: str) -> int:
+    """매니페스트 파일 크기 (새 단계가 추가되면 커짐, 없으면 -1)"""
+    try:
+        return os.path.getsize(os.path.join(base_dir, MANIFEST_FILE))
+    except OSError:
+        return -1
+
+
+def read_manifest(base_dir: str, offset: int = 0) -> Tuple[List[Dict], int]:
+    """
+    매니페스트에서 offset 이후에 추가된 항목만 읽기
+    :return: (새 항목 목록, 다음에 읽을 offset)
+    """
+    path = os.path.join(base_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return [], offset
+
+    entries = []
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            # 아직 쓰는 중인 마지막 줄은 다음에 다시 읽음
+            if not line.endswith(b"\n"):
+                break
+            entries.append(json.loads(line))
+            offset += len(line)
+    return entries, offset
@@ -0,0 +1,101 @@
+import os
+import json
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from dashboard_data import normalize_results, read_phase_results
+
+PIVOTS_FILE = "run_pivots.json"
+
+# 쓰레드 수 × 지속시간 피벗으로 유지하는 지표 (평탄화 컬럼 이름)
+PIVOT_METRICS = [
+    'total_requests', 'error_rate', 'avg_response_time',
+    '95th_percentile', '99th_percentile', 'requests_per_second'
+]
+
+
+def _empty_pivots() -> Dict:
+    return {"metrics": {metric: {} for metric in PIVOT_METRICS}}
+
+
+def _read_pivots_file(base_dir: str) -> Optional[Dict]:
+    path = os.path.join(base_dir, PIVOTS_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_pivots_file(base_dir: str, pivots: Dict):
+    path = os.path.join(base_dir, PIVOTS_FILE)
+    temp_file = path + ".tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(pivots, f, ensure_ascii=False)
+    os.replace(temp_file, path)
+
+
+def _add_records(pivots: Dict, records: List[Dict]):
+    """
+    레코드의 지표 값을 셀별 합계/개수에 누적 (재시도 단계 등 같은 셀의 여러 단계는 평균)
+    셀 구조: metrics[metric][thread_count][duration] = [합계, 개수]
+    """
+    data = normalize_results(records)
+    if data is None:
+        return
+    for metric in PIVOT_METRICS:
+        if metric not in data.columns:
+            continue
+        cells = pivots["metrics"].setdefault(metric, {})
+        for thread_count, duration, value in zip(data['thread_count'], data['duration'], data[metric]):
+            if pd.isna(value):
+                continue
+            cell = cells.setdefault(str(thread_count), {}).setdefault(str(duration), [0.0, 0])
+            cell[0] += float(value)
+            cell[1] += 1
+
+
+def update_run_pivots(base_dir: str, thread_count: int, duration: int, stats: Dict):
+    """
+    단계 분석이 끝날 때마다 실행 단위 피벗 테이블(run_pivots.json)에 해당 단계 값만 반영
+    무효(부하 발생기 포화) 단계는 대시보드와 동일하게 제외
+    """
+    if not stats.get('valid', True):
+        return
+    pivots = _read_pivots_file(base_dir) or _empty_pivots()
+    _add_records(pivots, [dict(stats, thread_count=thread_count, duration=duration)])
+    _write_pivots_file(base_dir, pivots)
+
+
+def build_run_pivots(base_dir: str) -> Dict:
+    """run_pivots.json이 없는 이전 실행용: phase 결과 전체로 피벗 생성"""
+    pivots = _empty_pivots()
+    _add_records(pivots, read_phase_results(base_dir))
+    return pivots
+
+
+def rebuild_run_pivots(base_dir: str):
+    """phase 결과가 다시 분석된 실행의 run_pivots.json을 처음부터 다시 생성"""
+    _write_pivots_file(base_dir, build_run_pivots(base_dir))
+
+
+def get_pivots_mtime(base_dir: str) -> Optional[float]:
+    """run_pivots.json 수정 시각 (대시보드 캐시 키, 없으면 None)"""
+    path = os.path.join(base_dir, PIVOTS_FILE)
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+
+def load_run_pivots(base_dir: str) -> Dict[str, pd.DataFrame]:
+    """
+    지표별 피벗 DataFrame (index: 쓰레드 수, columns: 지속시간, 값: 평균)
+    파일이 없으면 phase 결과로 한 번 계산
+    """
+    pivots = _read_pivots_file(base_dir) or build_run_pivots(base_dir)
+    tables = {}
+    for metric, cells in pivots["metrics"].items():
+        table = pd.DataFrame({
+            int(thread_count): {int(duration): total / count for duration, (total, count) in by_duration.items()}
+            for thread_count, by_duration in cells.items()
+        }).T
+        tables[metric] = table.sort_index().sort_index(axis=1)
+    return tables
@@ -0,0 +1,124 @@
+import json
+import re
+from typing import Dict, List, Optional
+
+from data_feeder import apply_placeholders, template_body
+
+# JMeter JSON Extractor의 기본값과 동일 (추출 실패 시 변수 값)
+NOT_FOUND = "NOT_FOUND"
+
+# 지원하는 JSONPath 부분 집합: $.key, $['key'], [0], [*](첫 번째 요소)
+JSON_PATH_TOKEN = re.compile(r"\.(\w+)|\['([^']+)'\]|\[(\d+|\*)\]")
+
+
+def parse_json_path(path: str) -> List:
+    """
+    JSONPath를 키/인덱스 목록으로 변환
+    지원하지 않는 문법($..key 재귀 탐색, 필터 등)은 ValueError
+    """
+    if not path.startswith("$"):
+        raise ValueError(f"JSONPath는 $로 시작해야 합니다: {path}")
+
+    tokens = []
+    pos = 1
+    while pos < len(path):
+        match = JSON_PATH_TOKEN.match(path, pos)
+        if match is None:
+            raise ValueError(f"지원하지 않는 JSONPath 문법입니다: {path}")
+        key, quoted_key, index = match.groups()
+        if index is None:
+            tokens.append(key if key is not None else quoted_key)
+        else:
+            tokens.append(0 if index == "*" else int(index))
+        pos = match.end()
+    return tokens
+
+
+def extract_json_path(document, tokens: List) -> Optional[str]:
+    """
+    파싱된 JSONPath로 값 추출 (JMeter처럼 문자열로 반환, 객체/배열은 JSON 문자열)
+    :return: 추출 값, 경로가 없으면 None
+    """
+    value = document
+    for token in tokens:
+        try:
+            value = value[token]
+        except (KeyError, IndexError, TypeError):
+            return None
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def get_scenario_config(config: Dict) -> Optional[Dict]:
+    """scenario_config가 활성화되어 있으면 반환 (없거나 비활성화 시 None)"""
+    scenario_config = config.get("scenario_config", {})
+    if not scenario_config.get("enabled", False) or not scenario_config.get("steps"):
+        return None
+    return scenario_config
+
+
+def build_scenario_steps(scenario_config: Dict, request_specs: List[Dict]) -> List[Dict]:
+    """
+    시나리오 단계 정의를 요청 템플릿에 결합
+    각 단계는 엔드포인트의 기본 요청 템플릿(build_request_specs)에 method/headers/body 덮어쓰기를 적용하고,
+    앞 단계에서 추출한 변수와 이름이 같은 header/body 키는 ${변수} 플레이스홀더로 바꿈
+    :param scenario_config: {"name", "steps": [{"endpoint", "name", "think_time_ms", "extract": {변수: JSONPath}, ...}]}
+    :param request_specs: build_request_specs 결과
+    :return: 요청 템플릿에 label, think_time_ms, extract(파싱된 경로 포함)가 추가된 단계 목록
+    """
+    specs_by_endpoint = {spec["endpoint"]: spec for spec in request_specs}
+    variables: List[str] = []
+    steps = []
+
+    for index, step in enumerate(scenario_config["steps"]):
+        endpoint = step["endpoint"]
+        if endpoint not in specs_by_endpoint:
+            raise ValueError(f"시나리오 {index + 1}단계의 엔드포인트가 API 명세에 없습니다: {endpoint}")
+
+        spec = dict(specs_by_endpoint[endpoint])
+        spec["method"] = step.get("method", spec["method"])
+        spec["headers"] = apply_placeholders(dict(spec["headers"], **step.get("headers", {})), variables)
+        body = step.get("body", spec["body"])
+        if isinstance(body, dict):
+            body = json.dumps(body, ensure_ascii=False)
+        spec["body"] = template_body(body, variables) if spec["method"] == "POST" else ""
+        spec["path"] = step.get("path", endpoint)
+        spec["label"] = step.get("name", endpoint)
+        spec["think_time_ms"] = step.get("think_time_ms", 0)
+        spec["extract"] = [
+            {"variable": variable, "path": path, "tokens": parse_json_path(path)}
+            for variable, path in step.get("extract", {}).items()
+        ]
+        variables.extend(variable for variable in step.get("extract", {}) if variable not in variables)
+        steps.append(spec)
+    return steps
+
+
+def create_json_extractor_xml(step: Dict) -> str:
+    """단계 샘플러에 붙일 JSON Extractor(JSONPostProcessor) 설정 요소 생성"""
+    if not step["extract"]:
+        return ""
+    names = ";".join(item["variable"] for item in step["extract"])
+    paths = ";".join(item["path"] for item in step["extract"])
+    match_numbers = ";".join("1" for _ in step["extract"])
+    defaults = ";".join(NOT_FOUND for _ in step["extract"])
+    return f'''
+          <JSONPostProcessor guiclass="JSONPostProcessorGui" testclass="JSONPostProcessor" testname="Extract {names}" enabled="true">
+            <stringProp name="JSONPostProcessor.referenceNames">{names}</stringProp>
+            <stringProp name="JSONPostProcessor.jsonPathExprs">{paths}</stringProp>
+            <stringProp name="JSONPostProcessor.match_numbers">{match_numbers}</stringProp>
+            <stringProp name="JSONPostProcessor.defaultValues">{defaults}</stringProp>
+          </JSONPostProcessor>
+          <hashTree/>'''
+
+
+def create_think_time_xml(step: Dict) -> str:
+    """단계 요청 전 대기(Constant Timer) 설정 요소 생성 - JMeter 타이머는 같은 범위의 샘플러 실행 전에 적용됨"""
+    if not step["think_time_ms"]:
+        return ""
+    return f'''
+          <ConstantTimer guiclass="ConstantTimerGui" testclass="ConstantTimer" testname="Think Time" enabled="true">
+            <stringProp name="ConstantTimer.delay">{step["think_time_ms"]}</stringProp>
+          </ConstantTimer>
+          <hashTree/>'''
@@ -1,38 +1,56 @@
 import subprocess
+import sys
 import json
 import time
-import pandas as pd
 import os
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from typing import Dict, Tuple, Optional
-import numpy as np
-from json import JSONEncoder
 # for OCR
 from api_file_script import parse_api_spec_from_pdf
 # for GPT
 from api_gpt_script import TextAnalyzer
 from dotenv import load_dotenv
+# 데이터 피더 / 네이티브 엔진
+from data_feeder import DataFeeder, create_feeder, create_csv_data_set_xml, apply_placeholders, template_body
+from native_engine import run_native_test, resolve_connection_settings
+# 단계 결과 분석
+from result_analysis import analyze_results
+# 서버 자원 사용량 수집
+from resource_sampler import start_resource_sampler
+# 부하 발생기 자체 감시
+from generator_monitor import start_generator_monitor, get_monitor_config
+# 실행 매니페스트 (대시보드 실시간 갱신용)
+from run_manifest import append_manifest_entry
+# 단계 진행 중 실시간 집계
+from live_metrics import start_live_metrics
+# 실행 간 비교용 결과 DB
+from results_db import open_results_db, get_build_tag
 
+# 헤드리스 실행용 성능 회귀 검사
+from regression_gate import run_regression_gate
+# 대시보드용 실행 단위 피벗 테이블
+from run_pivots import update_run_pivots
+# 다중 대상 동시 실행
+from campaign import ThreadBudget, create_thread_budget, get_targets
+# 램프 방식(부하 프로파일)
+from load_profile import get_load_profile, get_warmup_seconds, apply_profile_warmup, create_profile_thread_group_xml
+# 단계 간 유지되는 네이티브 엔진 프로세스
+from engine_process import start_engine_process
+# 동일 조건 단계 결과 재사용
+from phase_cache import get_cache_config, phase_fingerprint, find_cached_phase, record_cached_phase, reuse_cached_phase
+# JTL 드릴다운 인덱스
+from jtl_index import JTL_INDEX_FILES
+# 오류 분류 / 실패 응답 샘플
+from error_taxonomy import get_error_sampling, create_error_sampler_xml
+# 원본 결과 압축/보존 기간
+from result_storage import get_storage_config, compress_phase_raw, apply_retention
+# 시나리오(사용자 여정) 모드
+from scenario import get_scenario_config, build_scenario_steps, create_json_extractor_xml, create_think_time_xml
 
-load_dotenv()
-with open("test_value_config.json", "r", encoding="utf-8") as f:
-    value_config = json.load(f)
-
-class NumpyEncoder(JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return super(NumpyEncoder, self).default(obj)
-
-api_detail = parse_api_spec_from_pdf()
 
 # for GPT
-analyzer = TextAnalyzer(os.environ.get("API_KEY"))
 info_prompt = """
     나는 이 텍스트에서 아래와 같은 정보들을 가져오길 원해
     API Endpoint 별로 요청 명세와 응답 명세에 있는 http_method, header key, body key를 가져오고 싶어.
@@ -77,8 +95,7 @@ info_prompt = """
 
     """
 
-api_spec_dict = json.loads(analyzer.analyze_with_gpt(api_detail, info_prompt))
-# API 엔드포인트 및 HTTP 메서드 설정
+# API 엔드포인트 및 HTTP 메서드 설정 (load_api_spec에서 채움)
 API_ENDPOINTS = {}
 # 엔드포인트별 Header 설정
 ENDPOINT_HEADERS = {
@@ -94,8 +111,23 @@ ENDPOINT_HEADERS = {
 # Request Bodies 설정
 REQUEST_BODIES = {}
 
-for endpoint, spec in api_spec_dict.items():
-    if endpoint in api_spec_dict:
+
+def load_api_spec():
+    """
+    API 명세(PDF)를 GPT로 분석해 엔드포인트/Header/Body 설정을 채움 (한 번만 수행)
+    import 시점에 하지 않으므로 spawn으로 시작하는 엔진 프로세스는 명세를 다시 분석하지 않음
+    """
+    if API_ENDPOINTS:
+        return
+    load_dotenv()
+    with open("test_value_config.json", "r", encoding="utf-8") as f:
+        value_config = json.load(f)
+
+    api_detail = parse_api_spec_from_pdf()
+    analyzer = TextAnalyzer(os.environ.get("API_KEY"))
+    api_spec_dict = json.loads(analyzer.analyze_with_gpt(api_detail, info_prompt))
+
+    for endpoint, spec in api_spec_dict.items():
         API_ENDPOINTS[endpoint] = spec["http_method"]
         ENDPOINT_HEADERS[endpoint] = {
             header: value_config['header'].get(header, "") for header in spec['request']['header']
@@ -103,7 +135,7 @@ for endpoint, spec in api_spec_dict.items():
         # Content-Type 추가
         if "Content-Type" in spec["request"] and spec["http_method"] != "GET":
             ENDPOINT_HEADERS[endpoint]["Content-Type"] = spec["request"]["Content-Type"]
-        
+
         if len(spec['request']['body']) != 0:
             body_dict = {body: value_config['body'].get(body, "") for body in spec['request']['body']}
             REQUEST_BODIES[endpoint] = json.dumps(body_dict)
@@ -115,11 +147,12 @@ JMETER_PATH = r"C:\Users\Administrator\Downloads\apache-jmeter-5.6.3\apache-jmet
 # REQUEST_BODIES_JSON = json.dumps(REQUEST_BODIES)
 
 
-def run_jmeter_test(jmx_file, results_dir):
+def run_jmeter_test(jmx_file, results_dir, generator_monitor=None):
     """
     JMeter 테스트 실행
     :param jmx_file: JMeter 테스트 설정 파일 경로
     :param results_dir: 결과 저장 디렉토리
+    :param generator_monitor: 부하 발생기 감시 (JMeter 프로세스 트리를 감시 대상으로 지정)
     :return: (성공 여부, 결과 파일 경로)
     """
     result_file = os.path.join(results_dir, "test_results.jtl")
@@ -132,6 +165,8 @@ def run_jmeter_test(jmx_file, results_dir):
     
     try:
         process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        if generator_monitor:
+            generator_monitor.attach(process.pid)
         
         while True:
             output = process.stdout.readline()
@@ -185,6 +220,12 @@ class StressTestController:
         self.failure_detected = False
         self.failure_reason = None
         
+        # 부하 발생기 포화 시 재시도 설정
+        monitor_config = get_monitor_config(config)
+        self.max_saturation_retries = monitor_config['max_saturation_retries']
+        self.saturation_pause_seconds = monitor_config['saturation_pause_seconds']
+        self.saturation_retries = 0
+        
     def should_continue(self, stats: Dict) -> Tuple[bool, Optional[str]]:
         """
         테스트 지속 여부 결정
@@ -195,6 +236,8 @@ class StressTestController:
                 return False, f"최대 쓰레드 수({self.max_threads})에서 오류율({stats['error_rate']}%)이 임계값({self.error_threshold}%)을 초과함"
             if stats["avg_response_time"] > self.response_time_threshold:
                 return False, f"최대 쓰레드 수({self.max_threads})에서 응답시간({stats['avg_response_time']}ms)이 임계값({self.response_time_threshold}ms)을 초과함"
+            if stats.get("degrading"):
+                return False, f"최대 쓰레드 수({self.max_threads})에서 성능 저하 감지: {stats['degradation_reason']}"
             
         # max thread & max duration 도달 시 종료
         if self.current_threads >= self.max_threads and self.current_duration >= self.max_duration:
@@ -208,9 +251,32 @@ class StressTestController:
         if stats["avg_response_time"] > self.response_time_threshold:
             print(f"⚠️ 응답시간({stats['avg_response_time']}ms)이 임계값({self.response_time_threshold}ms)을 초과함")
             return True, "threshold_exceeded"
+        
+        # 평균은 임계값 이내여도 단계 내 추세가 나빠지면 남은 duration 단계를 건너뜀
+        if stats.get("degrading"):
+            print(f"⚠️ 성능 저하 감지: {stats['degradation_reason']}")
+            return True, "threshold_exceeded"
             
         return True, None
 
+    def should_retry_phase(self, generator_stats: Dict) -> Tuple[bool, Optional[str]]:
+        """
+        부하 발생기 자체가 병목이었던 단계는 서버 한계로 기록하지 않고 재시도 여부 결정
+        :return: (재시도 여부, 재시도하지 않는 경우 종료 사유)
+        """
+        if not generator_stats.get("saturated"):
+            self.saturation_retries = 0
+            return False, None
+        
+        reasons = ", ".join(generator_stats["reasons"])
+        if self.saturation_retries >= self.max_saturation_retries:
+            return False, f"부하 발생기 포화로 측정 불가 ({reasons}) - 부하 발생기 증설 필요"
+        
+        self.saturation_retries += 1
+        print(f"⚠️ 부하 발생기 포화로 단계 무효 처리: {reasons}")
+        print(f"   {self.saturation_pause_seconds}초 대기 후 재시도 ({self.saturation_retries}/{self.max_saturation_retries})")
+        return True, None
+
     def increment_test_parameters(self, threshold_exceeded=False):
         """다음 테스트를 위한 파라미터 조정"""
         if threshold_exceeded:
@@ -230,94 +296,155 @@ class StressTestController:
             return "threads_increased"
 
 
-def create_jmx_file(config, results_dir, thread_count, duration, filename="generated_test.jmx"):
-    """JMeter 테스트 설정 파일 생성"""
-    full_path = os.path.join(results_dir, filename)
-    
-    # (이전 JMX 템플릿 코드는 동일하게 유지하되, duration 값만 변경)
-    # ThreadGroup 설정에서 duration 값을 변경:
-    # <stringProp name="ThreadGroup.duration">{duration}</stringProp>
-    jmx_template = f'''<?xml version="1.0" encoding="UTF-8"?>
-<jmeterTestPlan version="1.2" properties="5.0" jmeter="5.6.3">
-  <hashTree>
-    <TestPlan guiclass="TestPlanGui" testclass="TestPlan" testname="Stress Test Plan" enabled="true">
-      <stringProp name="TestPlan.comments"></stringProp>
-      <boolProp name="TestPlan.functional_mode">false</boolProp>
-      <boolProp name="TestPlan.tearDown_on_shutdown">true</boolProp>
-      <boolProp name="TestPlan.serialize_threadgroups">false</boolProp>
-      <elementProp name="TestPlan.user_defined_variables" elementType="Arguments" guiclass="ArgumentsPanel" testclass="Arguments" testname="User Defined Variables" enabled="true">
-        <collectionProp name="Arguments.arguments"/>
-      </elementProp>
-      <stringProp name="TestPlan.user_define_classpath"></stringProp>
-    </TestPlan>
-    <hashTree>'''
-
-    # 각 API 엔드포인트에 대한 쓰레드 그룹 설정
+def build_request_specs(connection_config: Optional[Dict] = None, feeder: Optional[DataFeeder] = None):
+    """엔드포인트별 요청 템플릿 목록 생성 (피더 사용 시 ${컬럼} 플레이스홀더 적용)"""
+    fields = feeder.fields if feeder else []
+    specs = []
     for endpoint, method in API_ENDPOINTS.items():
         headers = ENDPOINT_HEADERS.get(endpoint, ENDPOINT_HEADERS['default'])
         body = REQUEST_BODIES.get(endpoint, "")
-        
-        jmx_template += f''' #각 엔드포인트에 대한 쓰레드 그룹 어떻게 설정할 지?
-      <ThreadGroup guiclass="ThreadGroupGui" testclass="ThreadGroup" testname="{endpoint} Test" enabled="true">
+        specs.append({
+            "endpoint": endpoint,
+            "method": method,
+            "headers": apply_placeholders(headers, fields),
+            "body": template_body(body, fields) if method == "POST" else "",
+            "connection": resolve_connection_settings(connection_config, endpoint)
+        })
+    return specs
+
+
+def create_thread_group_xml(testname, thread_count, duration, loops=1, load_profile=None):
+    """
+    쓰레드 그룹 설정 요소 생성 (하위 요소용 hashTree를 열어 둔 상태로 반환)
+    :param load_profile: get_load_profile 결과 (constant가 아니면 jmeter-plugins 쓰레드 그룹으로 생성)
+    """
+    if load_profile and load_profile['type'] != "constant":
+        return create_profile_thread_group_xml(load_profile, testname, thread_count, duration)
+    ramp_time = load_profile['ramp_seconds'] if load_profile else 1
+    return f'''
+      <ThreadGroup guiclass="ThreadGroupGui" testclass="ThreadGroup" testname="{testname}" enabled="true">
         <stringProp name="ThreadGroup.on_sample_error">continue</stringProp>
         <elementProp name="ThreadGroup.main_controller" elementType="LoopController" guiclass="LoopControlPanel" testclass="LoopController" testname="Loop Controller" enabled="true">
           <boolProp name="LoopController.continue_forever">false</boolProp>
-          <stringProp name="LoopController.loops">1</stringProp>
+          <stringProp name="LoopController.loops">{loops}</stringProp>
         </elementProp>
         <stringProp name="ThreadGroup.num_threads">{thread_count}</stringProp>
-        <stringProp name="ThreadGroup.ramp_time">1</stringProp>
+        <stringProp name="ThreadGroup.ramp_time">{ramp_time}</stringProp>
         <boolProp name="ThreadGroup.scheduler">true</boolProp>
         <stringProp name="ThreadGroup.duration">{duration}</stringProp>
         <stringProp name="ThreadGroup.delay"></stringProp>
         <boolProp name="ThreadGroup.same_user_on_next_iteration">true</boolProp>
       </ThreadGroup>
-      <hashTree>
-        <HTTPSamplerProxy guiclass="HttpTestSampleGui" testclass="HTTPSamplerProxy" testname="{endpoint}" enabled="true">
+      <hashTree>'''
+
+def create_sampler_xml(config, spec, children=""):
+    """
+    HTTP 샘플러와 헤더 관리자 설정 요소 생성
+    :param spec: build_request_specs/build_scenario_steps의 요청 템플릿 (path, label이 있으면 경로/이름으로 사용)
+    :param children: 샘플러 하위에 추가할 요소 (JSON Extractor, 타이머 등)
+    """
+    endpoint, method = spec['endpoint'], spec['method']
+    headers = spec['headers']
+    body = spec['body']
+    connection = spec['connection']
+    xml = f'''
+        <HTTPSamplerProxy guiclass="HttpTestSampleGui" testclass="HTTPSamplerProxy" testname="{spec.get('label', endpoint)}" enabled="true">
           <boolProp name="HTTPSampler.postBodyRaw">true</boolProp>
           <elementProp name="HTTPsampler.Arguments" elementType="Arguments">
             <collectionProp name="Arguments.arguments">'''
 
-        if method == "POST" and body:
-            jmx_template += f'''
+    if method == "POST" and body:
+        xml += f'''
               <elementProp name="" elementType="HTTPArgument">
                 <boolProp name="HTTPArgument.always_encode">false</boolProp>
                 <stringProp name="Argument.value">{body}</stringProp>
                 <stringProp name="Argument.metadata">=</stringProp>
               </elementProp>'''
 
-        jmx_template += f'''
+    xml += f'''
             </collectionProp>
           </elementProp>
           <stringProp name="HTTPSampler.domain">{config['server_name']}</stringProp>
           <stringProp name="HTTPSampler.port">{config['port']}</stringProp>
           <stringProp name="HTTPSampler.protocol">{config['protocol']}</stringProp>
           <stringProp name="HTTPSampler.contentEncoding">UTF-8</stringProp>
-          <stringProp name="HTTPSampler.path">{endpoint}</stringProp>
+          <stringProp name="HTTPSampler.path">{spec.get('path', endpoint)}</stringProp>
           <stringProp name="HTTPSampler.method">{method}</stringProp>
           <boolProp name="HTTPSampler.follow_redirects">true</boolProp>
           <boolProp name="HTTPSampler.auto_redirects">false</boolProp>
-          <boolProp name="HTTPSampler.use_keepalive">true</boolProp>
+          <boolProp name="HTTPSampler.use_keepalive">{str(connection['keep_alive']).lower()}</boolProp>
           <boolProp name="HTTPSampler.DO_MULTIPART_POST">false</boolProp>
           <stringProp name="HTTPSampler.embedded_url_re"></stringProp>
-          <stringProp name="HTTPSampler.connect_timeout"></stringProp>
-          <stringProp name="HTTPSampler.response_timeout"></stringProp>
+          <stringProp name="HTTPSampler.implementation">HttpClient4</stringProp>
+          <stringProp name="HTTPSampler.connect_timeout">{connection['connect_timeout'] or ''}</stringProp>
+          <stringProp name="HTTPSampler.response_timeout">{connection['response_timeout'] or ''}</stringProp>
         </HTTPSamplerProxy>
         <hashTree>
           <HeaderManager guiclass="HeaderPanel" testclass="HeaderManager" testname="HTTP Header Manager" enabled="true">
             <collectionProp name="HeaderManager.headers">'''
 
-        for header_name, header_value in headers.items():
-            jmx_template += f'''
+    for header_name, header_value in headers.items():
+        xml += f'''
               <elementProp name="" elementType="Header">
                 <stringProp name="Header.name">{header_name}</stringProp>
                 <stringProp name="Header.value">{header_value}</stringProp>
               </elementProp>'''
 
-        jmx_template += '''
+    xml += f'''
             </collectionProp>
           </HeaderManager>
-          <hashTree/>
-        </hashTree>
+          <hashTree/>{children}
+        </hashTree>'''
+    return xml
+
+
+def create_jmx_file(config, results_dir, thread_count, duration, filename="generated_test.jmx", feeder=None,
+                    connection_config=None, scenario_config=None, load_profile=None, error_sampling=None):
+    """JMeter 테스트 설정 파일 생성"""
+    full_path = os.path.join(results_dir, filename)
+    
+    # (이전 JMX 템플릿 코드는 동일하게 유지하되, duration 값만 변경)
+    # ThreadGroup 설정에서 duration 값을 변경:
+    # <stringProp name="ThreadGroup.duration">{duration}</stringProp>
+    jmx_template = f'''<?xml version="1.0" encoding="UTF-8"?>
+<jmeterTestPlan version="1.2" properties="5.0" jmeter="5.6.3">
+  <hashTree>
+    <TestPlan guiclass="TestPlanGui" testclass="TestPlan" testname="Stress Test Plan" enabled="true">
+      <stringProp name="TestPlan.comments"></stringProp>
+      <boolProp name="TestPlan.functional_mode">false</boolProp>
+      <boolProp name="TestPlan.tearDown_on_shutdown">true</boolProp>
+      <boolProp name="TestPlan.serialize_threadgroups">false</boolProp>
+      <elementProp name="TestPlan.user_defined_variables" elementType="Arguments" guiclass="ArgumentsPanel" testclass="Arguments" testname="User Defined Variables" enabled="true">
+        <collectionProp name="Arguments.arguments"/>
+      </elementProp>
+      <stringProp name="TestPlan.user_define_classpath"></stringProp>
+    </TestPlan>
+    <hashTree>'''
+
+    # 데이터 피더: 모든 쓰레드 그룹이 공유하는 CSV Data Set
+    if feeder:
+        jmx_template += create_csv_data_set_xml(feeder)
+
+    # 실패 응답 저수지 샘플 (JTL에는 응답 body가 남지 않음)
+    if error_sampling:
+        jmx_template += create_error_sampler_xml(results_dir, error_sampling)
+
+    request_specs = build_request_specs(connection_config, feeder)
+    if scenario_config:
+        # 시나리오 모드: 가상 사용자마다 단계들을 순서대로 반복하는 단일 쓰레드 그룹 (duration 동안 반복)
+        jmx_template += create_thread_group_xml(scenario_config.get('name', 'Scenario'), thread_count, duration,
+                                                loops=-1, load_profile=load_profile)
+        for step in build_scenario_steps(scenario_config, request_specs):
+            jmx_template += create_sampler_xml(config, step, create_json_extractor_xml(step) + create_think_time_xml(step))
+        jmx_template += '''
+      </hashTree>'''
+    else:
+        # 각 API 엔드포인트에 대한 쓰레드 그룹 설정
+        for spec in request_specs:
+            jmx_template += create_thread_group_xml(f"{spec['endpoint']} Test", thread_count, duration,
+                                                    load_profile=load_profile)
+            jmx_template += create_sampler_xml(config, spec)
+            jmx_template += '''
       </hashTree>'''
 
     # 결과 수집기 추가
@@ -372,156 +499,165 @@ def create_jmx_file(config, results_dir, thread_count, duration, filename="gener
     return full_path
     
 
-def analyze_results(jtl_file: str, results_dir: str) -> Dict:
+def run_campaign(config: Dict, results_dir: str, run_id: str, feeder: Optional[DataFeeder] = None,
+                 thread_budget: Optional[ThreadBudget] = None, target: Optional[str] = None) -> StressTestController:
     """
-    테스트 결과 분석 및 저장
-    :param jtl_file: JMeter 결과 파일 (.jtl)
-    :param results_dir: 결과 저장 디렉토리
-    :return: 분석된 통계 정보
+    대상 하나의 단계별 스트레스 테스트 (쓰레드/지속시간 증가를 종료 조건까지 반복)
+    :param config: 대상별 설정 (get_targets 결과)
+    :param results_dir: 대상 결과 디렉토리 (phase 폴더, 매니페스트, 피벗 저장)
+    :param run_id: 결과 DB 실행 ID
+    :param feeder: 요청 데이터 피더 (대상 간 공유)
+    :param thread_budget: 동시 실행 대상과 공유하는 쓰레드 예산 (None이면 제한 없음)
+    :param target: 다중 대상 실행 시 대상 이름 (출력 앞 표시, 결과 DB 대상)
+    :return: 종료 상태가 기록된 컨트롤러 (test_phase가 "completed"면 정상 종료)
     """
-    print(f"📊 테스트 결과 분석 중... ({jtl_file})")
-    
-    # JTL 파일 읽기
-    df = pd.read_csv(jtl_file)
-    
-    # 기본 통계 계산
-    stats = {
-        "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        "total_requests": len(df),
-        "error_count": (df['success'] == False).sum(),
-        "error_rate": float((df['success'] == False).mean() * 100),
-        
-        # 응답 시간 통계 (밀리초)
-        "response_time": {
-            "min": float(df['elapsed'].min()),
-            "max": float(df['elapsed'].max()),
-            "mean": float(df['elapsed'].mean()),
-            "median": float(df['elapsed'].median()),
-            "90th_percentile": float(df['elapsed'].quantile(0.90)),
-            "95th_percentile": float(df['elapsed'].quantile(0.95)),
-            "99th_percentile": float(df['elapsed'].quantile(0.99))
-        },
-        
-        # 처리량 통계
-        "throughput": {
-            "requests_per_second": float(len(df) / (df['timeStamp'].max() - df['timeStamp'].min()) * 1000),
-            "total_bytes": int(df['bytes'].sum()),
-            "avg_bytes_per_request": float(df['bytes'].mean())
-        },
-        
-        # 에러 상세 정보
-        "errors": df[df['success'] == False]['responseMessage'].value_counts().to_dict(),
-        
-        # HTTP 응답 코드 분포
-        "response_codes": df['responseCode'].value_counts().to_dict()
-    }
-    
-    # 엔드포인트별 통계
-    endpoint_stats = {}
-    for endpoint in df['label'].unique():
-        endpoint_df = df[df['label'] == endpoint]
-        endpoint_stats[endpoint] = {
-            "total_requests": len(endpoint_df),
-            "error_rate": float((endpoint_df['success'] == False).mean() * 100),
-            "avg_response_time": float(endpoint_df['elapsed'].mean()),
-            "90th_percentile": float(endpoint_df['elapsed'].quantile(0.90)),
-            "error_count": int((endpoint_df['success'] == False).sum())
-        }
-    
-    stats["endpoint_statistics"] = endpoint_stats
-    
-    # JSON 파일로 저장
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    json_results_file = os.path.join(results_dir, f"test_results_{timestamp}.json")
-    
-    # 이렇게 사용:
-    with open(json_results_file, 'w', encoding='utf-8') as f:
-        json.dump(stats, f, indent=4, ensure_ascii=False, cls=NumpyEncoder)
-    
-    print(f"✅ 분석 결과 저장 완료: {json_results_file}")
-    
-    # 요약 로그 파일 생성
-    summary_file = os.path.join(results_dir, f"test_summary_{timestamp}.txt")
-    with open(summary_file, 'w', encoding='utf-8') as f:
-        f.write(f"스트레스 테스트 결과 요약\n")
-        f.write(f"테스트 시간: {stats['timestamp']}\n")
-        f.write(f"총 요청 수: {stats['total_requests']}\n")
-        f.write(f"오류율: {stats['error_rate']:.2f}%\n")
-        f.write(f"평균 응답 시간: {stats['response_time']['mean']:.2f}ms\n")
-        f.write(f"90th 백분위 응답 시간: {stats['response_time']['90th_percentile']:.2f}ms\n")
-        f.write(f"초당 요청 수: {stats['throughput']['requests_per_second']:.2f}\n")
-        
-        f.write("\n엔드포인트별 통계:\n")
-        for endpoint, endpoint_stat in stats["endpoint_statistics"].items():
-            f.write(f"\n{endpoint}:\n")
-            f.write(f"  총 요청 수: {endpoint_stat['total_requests']}\n")
-            f.write(f"  오류율: {endpoint_stat['error_rate']:.2f}%\n")
-            f.write(f"  평균 응답 시간: {endpoint_stat['avg_response_time']:.2f}ms\n")
-    
-    print(f"📝 테스트 요약 저장 완료: {summary_file}")
-    
-    return stats
-
-def run_stress_test(config: Dict):
-    """
-    스트레스 테스트 실행 메인 함수
-    """
-    base_results_dir = f"stress_test_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-    os.makedirs(base_results_dir, exist_ok=True)
-    
-    # 스트레스 테스트 컨트롤러 초기화
+    os.makedirs(results_dir, exist_ok=True)
+    label = f"[{target}] " if target else ""
     controller = StressTestController(config)
+    engine = config.get('engine_config', {}).get('type', 'jmeter')
+    phase_pause_seconds = config.get('engine_config', {}).get('phase_pause_seconds', 5)
+    scenario_config = get_scenario_config(config)
+    load_profile = get_load_profile(config)
+    cache_config = get_cache_config(config)
+    storage_config = get_storage_config(config)
     
     # 테스트 설정 기록
-    with open(os.path.join(base_results_dir, "test_config.json"), 'w') as f:
+    with open(os.path.join(results_dir, "test_config.json"), 'w') as f:
         json.dump(config, f, indent=4)
     
+    # 대상별 스레드에서 쓰므로 연결도 대상마다 따로 사용
+    results_db = open_results_db(config)
+    if results_db:
+        results_db.record_run(run_id, config, get_build_tag(config), target)
+    
+    # persistent 네이티브 엔진은 캠페인 동안 프로세스와 커넥션을 유지 (JMeter는 단계마다 새로 실행)
+    engine_process = start_engine_process(config)
+    
     while True:
-        phase_dir = os.path.join(base_results_dir, 
-                               f"phase_threads_{controller.current_threads}_duration_{controller.current_duration}")
+        phase_name = f"phase_threads_{controller.current_threads}_duration_{controller.current_duration}"
+        if controller.saturation_retries:
+            phase_name += f"_retry{controller.saturation_retries}"
+        phase_dir = os.path.join(results_dir, phase_name)
         os.makedirs(phase_dir, exist_ok=True)
         
-        print(f"\n🔄 테스트 단계 시작:")
+        print(f"\n🔄 {label}테스트 단계 시작:")
         print(f"   - 쓰레드 수: {controller.current_threads}")
         print(f"   - 테스트 지속시간: {controller.current_duration}초")
+        print(f"   - 부하 프로파일: {load_profile['type']} (램프 {load_profile['ramp_seconds']}초)")
+        
+        # 같은 조건(지문)으로 TTL 이내에 실행한 단계가 있으면 다시 실행하지 않고 결과 재사용
+        request_specs = build_request_specs(config.get('connection_config'), feeder)
+        scenario_steps = build_scenario_steps(scenario_config, request_specs) if scenario_config else None
+        fingerprint = phase_fingerprint(config, request_specs, controller.current_threads, controller.current_duration,
+                                        scenario_steps, load_profile, JMETER_PATH)
+        cached_phase = find_cached_phase(cache_config, fingerprint) if cache_config['enabled'] else None
+        if cached_phase:
+            print(f"♻️ {label}캐시된 단계 결과 재사용: {cached_phase['phase_dir']}")
+            stats = reuse_cached_phase(cached_phase, phase_dir)
+        else:
+            # 다른 대상과 공유하는 쓰레드 예산 확보 (실제 부하 쓰레드 수 기준:
+            # 시나리오 모드는 쓰레드 수만큼, 엔드포인트 모드는 엔드포인트마다 쓰레드 수만큼 실행)
+            generator_threads = controller.current_threads * (1 if scenario_steps else len(request_specs))
+            reserved = thread_budget.acquire(generator_threads) if thread_budget else 0
+        
+            # 테스트 생성 및 실행 (자원 샘플러/부하 발생기 감시는 단계 동안 함께 동작)
+            # 엔진 프로세스를 쓰면 부하 발생기 감시는 엔진 프로세스 안에서 수행
+            resource_sampler = start_resource_sampler(config, phase_dir)
+            generator_monitor = None if engine_process else start_generator_monitor(config, phase_dir)
+            live_metrics = start_live_metrics(config, os.path.join(phase_dir, "test_results.jtl"), phase_dir)
+            generator_stats = None
+            if engine_process:
+                success, result_file, generator_stats = engine_process.run_phase(
+                    phase_dir, controller.current_threads, controller.current_duration,
+                    request_specs, scenario_steps, load_profile)
+            elif engine == "native":
+                success, result_file = run_native_test(config['server_config'], phase_dir,
+                                                       controller.current_threads, controller.current_duration,
+                                                       request_specs, feeder, scenario_steps, load_profile,
+                                                       error_sampling=get_error_sampling(config))
+            else:
+                jmx_file = create_jmx_file(config['server_config'], phase_dir, 
+                                          controller.current_threads, controller.current_duration,
+                                          feeder=feeder, connection_config=config.get('connection_config'),
+                                          scenario_config=scenario_config, load_profile=load_profile,
+                                          error_sampling=get_error_sampling(config))
+                success, result_file = run_jmeter_test(jmx_file, phase_dir, generator_monitor)
+            if resource_sampler:
+                resource_sampler.stop()
+            if generator_monitor:
+                generator_stats = generator_monitor.stop()
+            if live_metrics:
+                live_metrics.stop()
+            if thread_budget:
+                thread_budget.release(reserved)
+        
+            if not success:
+                print(f"❌ {label}테스트 실행 실패")
+                controller.failure_detected = True
+                controller.failure_reason = f"{engine} 실행 실패"
+                break
+            
+            # 결과 분석
+            # 프로파일의 램프 구간은 통계와 시계열(추세 판정) 모두에서 제외
+            stats = analyze_results(result_file, phase_dir,
+                                    apply_profile_warmup(config.get('analysis_config'), load_profile, controller.current_duration),
+                                    generator_stats, get_warmup_seconds(load_profile, controller.current_duration))
+            if cache_config['enabled']:
+                record_cached_phase(cache_config, fingerprint, phase_dir, stats)
+        append_manifest_entry(results_dir, {
+            "phase_dir": phase_name,
+            "results_file": stats["results_file"],
+            "thread_count": controller.current_threads,
+            "duration": controller.current_duration,
+            "valid": stats["valid"],
+            "timestamp": stats["timestamp"],
+            "cached": "cached_from" in stats
+        })
+        update_run_pivots(results_dir, controller.current_threads, controller.current_duration, stats)
+        if results_db:
+            results_db.record_phase(run_id, phase_name, controller.current_threads, controller.current_duration, stats)
         
-        # JMeter 테스트 생성 및 실행
-        jmx_file = create_jmx_file(config['server_config'], phase_dir, 
-                                  controller.current_threads, controller.current_duration)
-        success, result_file = run_jmeter_test(jmx_file, phase_dir)
+        # 집계가 모두 저장된 뒤 원본 JTL/로그 압축 (분석 도구는 압축 파일을 그대로 읽음)
+        if storage_config['compress']:
+            compress_phase_raw(phase_dir, storage_config)
         
-        if not success:
-            print("❌ 테스트 실행 실패")
+        # 부하 발생기 포화 단계는 서버 한계로 기록하지 않음
+        retry, reason = controller.should_retry_phase(stats["generator"])
+        if retry:
+            time.sleep(controller.saturation_pause_seconds)
+            continue
+        if reason:
+            print(f"\n🛑 {label}스트레스 테스트 중단: {reason}")
             controller.failure_detected = True
-            controller.failure_reason = "JMeter 실행 실패"
+            controller.failure_reason = reason
             break
-            
-        # 결과 분석
-        stats = analyze_results(result_file, phase_dir)
         
         # 단계별 결과 출력
-        print(f"\n📊 단계별 결과:")
+        print(f"\n📊 {label}단계별 결과:")
         print(f"쓰레드 수: {controller.current_threads}")
         print(f"테스트 지속시간: {controller.current_duration}초")
         print(f"초당 요청 수: {stats['throughput']['requests_per_second']:.2f}")
         print(f"평균 응답 시간: {stats['response_time']['mean']:.2f}ms")
         print(f"오류율: {stats['error_rate']:.2f}%")
         print(f"90퍼센타일 응답 시간: {stats['response_time']['90th_percentile']:.2f}ms")
+        if stats['connect_time']:
+            print(f"평균 연결 시간: {stats['connect_time']['mean']:.2f}ms")
         
         # 계속 진행 여부 확인
         # 계속 진행 여부 확인
         adjusted_stats = {
             "error_rate": stats["error_rate"],
-            "avg_response_time": stats["response_time"]["mean"]
+            "avg_response_time": stats["response_time"]["mean"],
+            "degrading": stats["degradation"]["degrading"],
+            "degradation_reason": stats["degradation"]["reason"]
         }
         should_continue, reason = controller.should_continue(adjusted_stats)
         
         if not should_continue:
-            print(f"\n🛑 스트레스 테스트 완료: {reason}")
+            print(f"\n🛑 {label}스트레스 테스트 완료: {reason}")
             controller.failure_detected = True
             controller.failure_reason = reason
-            print("📊 대시보드를 실행합니다...")
-            os.system("streamlit run dashboard.py")
+            controller.test_phase = "completed"
             break
             
         # 다음 단계를 위한 파라미터 조정
@@ -529,15 +665,65 @@ def run_stress_test(config: Dict):
         result = controller.increment_test_parameters(threshold_exceeded)
         
         if result == "threads_increased":
-            print(f"\n🔄 쓰레드 수 증가: {controller.current_threads}")
+            print(f"\n🔄 {label}쓰레드 수 증가: {controller.current_threads}")
             print(f"   지속시간 초기화: {controller.current_duration}초")
         else:
-            print(f"\n⏱️ 지속시간 증가: {controller.current_duration}초")
+            print(f"\n⏱️ {label}지속시간 증가: {controller.current_duration}초")
         
-        # 단계 간 일시 중지
-        time.sleep(5)
+        # 단계 간 일시 중지 (engine_config.phase_pause_seconds, 0이면 바로 다음 단계 / 재사용한 단계 뒤에는 생략)
+        if phase_pause_seconds and not cached_phase:
+            time.sleep(phase_pause_seconds)
+
+    if engine_process:
+        engine_process.stop()
+    if results_db:
+        results_db.close()
+    return controller
+
+def run_stress_test(config: Dict, headless: bool = False) -> str:
+    """
+    스트레스 테스트 실행 메인 함수
+    targets가 있으면 대상별 캠페인을 동시에 실행하고 결과는 실행 폴더의 대상별 하위 폴더에 저장
+    :return: 실행 결과 폴더
+    """
+    load_api_spec()
+    base_results_dir = f"stress_test_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    os.makedirs(base_results_dir, exist_ok=True)
+    
+    feeder = create_feeder(config)
+    targets = get_targets(config)
+    run_id = os.path.basename(base_results_dir)
+    
+    if targets[0]["name"] is None:
+        controllers = [run_campaign(config, base_results_dir, run_id, feeder)]
+    else:
+        with open(os.path.join(base_results_dir, "test_config.json"), 'w') as f:
+            json.dump(config, f, indent=4)
+        thread_budget = create_thread_budget(config)
+        print(f"🎯 대상 {len(targets)}개 동시 실행: {', '.join(target['name'] for target in targets)}")
+        
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            futures = [
+                executor.submit(run_campaign, target["config"], os.path.join(base_results_dir, target["name"]),
+                                f"{run_id}_{target['name']}", feeder, thread_budget, target["name"])
+                for target in targets
+            ]
+            controllers = [future.result() for future in futures]
+    
+    # 보존 기간이 지난 이전 실행의 원본 결과 정리
+    apply_retention(get_storage_config(config), sidecar_files=JTL_INDEX_FILES)
+    
+    if not headless and any(controller.test_phase == "completed" for controller in controllers):
+        print("📊 대시보드를 실행합니다...")
+        os.system("streamlit run dashboard.py")
+
+    return base_results_dir
 
 if __name__ == "__main__":
     print("🚀 JMeter 스트레스 테스트 시작")
     config = load_config()  # JSON 파일에서 설정 로드
-    run_stress_test(config)
\ No newline at end of file
+    # CI 등에서는 --headless 또는 설정의 headless로 UI 없이 실행 후 기준 대비 회귀 검사
+    headless = "--headless" in sys.argv or config.get("headless", False)
+    base_results_dir = run_stress_test(config, headless=headless)
+    if headless:
+        sys.exit(run_regression_gate(base_results_dir, config, save_baseline="--save-baseline" in sys.argv))
\ No newline at end of file
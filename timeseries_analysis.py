@@ -0,0 +1,154 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+TIMESERIES_FILE = "phase_timeseries.csv"
+
+DEFAULT_ANALYSIS_CONFIG = {
+    "window_seconds": 1,
+    "warmup_seconds": 0,
+    "cooldown_seconds": 0,
+    # 추세(성능 저하) 감지
+    "trend_min_windows": 30,
+    "max_latency_growth": 0.5,
+    "max_rps_drop": 0.3
+}
+
+
+def get_analysis_config(config: Optional[Dict]) -> Dict:
+    """analysis_config 설정에 기본값 채우기"""
+    analysis_config = dict(DEFAULT_ANALYSIS_CONFIG)
+    analysis_config.update(config or {})
+    return analysis_config
+
+
+def compute_timeseries(df: pd.DataFrame, window_seconds: float = 1,
+                       warmup_seconds: float = 0, cooldown_seconds: float = 0) -> pd.DataFrame:
+    """
+    JTL 샘플을 시간 구간(window)별로 묶어 처리량/오류율/응답시간 분위수 시계열 생성
+    :param df: JTL DataFrame (timeStamp, elapsed, success 컬럼 필요)
+    :param window_seconds: 구간 크기 (초)
+    :param warmup_seconds: 단계 시작 후 제외할 시간 (초)
+    :param cooldown_seconds: 단계 종료 전 제외할 시간 (초)
+    :return: 구간별 시계열 DataFrame (second = 단계 시작 기준 구간 시작 시각, timestamp = epoch ms)
+             샘플이 없는 구간도 requests/rps 0으로 포함 (분위수는 NaN)
+             cooldown_seconds가 0이면 단계 종료로 잘린 마지막 구간은 partial로 표시
+    """
+    start = df['timeStamp'].min()
+    end = df['timeStamp'].max()
+    trimmed = df[(df['timeStamp'] >= start + warmup_seconds * 1000) &
+                 (df['timeStamp'] <= end - cooldown_seconds * 1000)]
+    if trimmed.empty:
+        return pd.DataFrame(columns=["second", "timestamp", "requests", "rps", "error_rate",
+                                     "mean", "p50", "p90", "p95", "p99", "partial"])
+
+    window_ms = window_seconds * 1000
+    bins = ((trimmed['timeStamp'] - start) // window_ms).astype('int64')
+    grouped = trimmed.groupby(bins)
+
+    series = pd.DataFrame({
+        "requests": grouped.size(),
+        "error_rate": (trimmed['success'] == False).groupby(bins).mean() * 100,
+        "mean": grouped['elapsed'].mean()
+    })
+    percentiles = grouped['elapsed'].quantile([0.5, 0.9, 0.95, 0.99]).unstack()
+    percentiles.columns = ["p50", "p90", "p95", "p99"]
+    series = series.join(percentiles)
+
+    # 샘플이 하나도 없는 구간(GC 정지, 서버 멈춤)도 처리량 0으로 남김
+    series = series.reindex(range(bins.min(), bins.max() + 1))
+    series["requests"] = series["requests"].fillna(0).astype('int64')
+
+    series["rps"] = series["requests"] / window_seconds
+    # 쿨다운으로 잘라내지 않으면 마지막 구간은 단계 종료 시점에서 끊겨 처리량이 낮게 나옴
+    series["partial"] = False
+    if cooldown_seconds == 0 and len(series) > 1:
+        series.loc[series.index[-1], "partial"] = True
+    series["timestamp"] = (start + series.index * window_ms).astype('int64')
+    series.index = series.index * window_seconds
+    series.index.name = "second"
+
+    return series.reset_index()[["second", "timestamp", "requests", "rps", "error_rate",
+                                 "mean", "p50", "p90", "p95", "p99", "partial"]]
+
+
+def save_timeseries(df: pd.DataFrame, results_dir: str, analysis_config: Optional[Dict] = None) -> Tuple[str, pd.DataFrame]:
+    """
+    단계별 시계열을 계산하여 phase 폴더에 저장
+    :return: (저장 파일 경로, 시계열 DataFrame)
+    """
+    analysis_config = get_analysis_config(analysis_config)
+    series = compute_timeseries(
+        df,
+        window_seconds=analysis_config['window_seconds'],
+        warmup_seconds=analysis_config['warmup_seconds'],
+        cooldown_seconds=analysis_config['cooldown_seconds']
+    )
+    timeseries_file = os.path.join(results_dir, TIMESERIES_FILE)
+    series.round(2).to_csv(timeseries_file, index=False)
+    return timeseries_file, series
+
+
+def _relative_change(seconds: np.ndarray, values: np.ndarray) -> Tuple[float, float]:
+    """
+    선형 회귀 기울기로 단계 전체 구간의 상대 변화량 계산
+    :return: (초당 기울기, 초반 20% 구간 중앙값 대비 단계 전체 변화 비율)
+    """
+    slope = np.polyfit(seconds, values, 1)[0]
+    head = values[:max(1, len(values) // 5)]
+    baseline = float(np.median(head))
+    if baseline <= 0:
+        return float(slope), 0.0
+    return float(slope), float(slope * (seconds[-1] - seconds[0]) / baseline)
+
+
+def detect_degradation(series: pd.DataFrame, analysis_config: Optional[Dict] = None) -> Dict:
+    """
+    단계 내 시계열의 추세로 성능 저하 여부 판정
+    평균이 임계값 아래여도 p95가 계속 오르거나 처리량이 계속 떨어지면 저하로 판단
+    :param series: compute_timeseries 결과 (partial 구간은 제외, 샘플 없는 구간은 처리량 추세에만 사용)
+    :return: 판정 결과 (degrading, reason, 기울기/변화율)
+    """
+    analysis_config = get_analysis_config(analysis_config)
+    if 'partial' in series.columns:
+        series = series[series['partial'] != True]
+    result = {
+        "degrading": False,
+        "reason": None,
+        "windows": int(len(series)),
+        "p95_slope_ms_per_min": None,
+        "p95_growth": None,
+        "rps_slope_per_min": None,
+        "rps_drop": None
+    }
+    sampled = series['p95'].notna().to_numpy()
+    if len(series) < analysis_config['trend_min_windows'] or sampled.sum() < 2:
+        return result
+
+    seconds = series['second'].to_numpy(dtype=float)
+    p95_slope, p95_growth = _relative_change(seconds[sampled], series['p95'].to_numpy(dtype=float)[sampled])
+    rps_slope, rps_change = _relative_change(seconds, series['rps'].to_numpy(dtype=float))
+
+    result.update({
+        "p95_slope_ms_per_min": round(p95_slope * 60, 4),
+        "p95_growth": round(p95_growth, 4),
+        "rps_slope_per_min": round(rps_slope * 60, 4),
+        "rps_drop": round(-rps_change, 4)
+    })
+
+    if p95_growth > analysis_config['max_latency_growth']:
+        result["degrading"] = True
+        result["reason"] = f"p95 응답시간이 단계 동안 {p95_growth * 100:.1f}% 증가하는 추세"
+    elif -rps_change > analysis_config['max_rps_drop']:
+        result["degrading"] = True
+        result["reason"] = f"처리량이 단계 동안 {-rps_change * 100:.1f}% 감소하는 추세"
+    return result
+
+
+def load_timeseries(phase_dir: str) -> Optional[pd.DataFrame]:
+    """저장된 단계별 시계열 로드 (없으면 None)"""
+    timeseries_file = os.path.join(phase_dir, TIMESERIES_FILE)
+    if not os.path.exists(timeseries_file):
+        return None
+    return pd.read_csv(timeseries_file)
@@ -2,34 +2,17 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import os
-import time
-import json
 from datetime import datetime
 import base64
+from dashboard_data import find_run_dirs, get_run_mtime, load_run
 
-def load_test_results(base_dir):
-    """각 phase 폴더에서 테스트 결과를 로드하여 DataFrame으로 변환"""
-    all_results = []
-    
-    for folder in os.listdir(base_dir):
-        if folder.startswith('phase_'):
-            # 스레드 수 추출
-            thread_count = int(folder.split('_')[1])
-            
-            # phase 폴더 내의 stats 파일 찾기
-            phase_dir = os.path.join(base_dir, folder)
-            stats_files = [f for f in os.listdir(phase_dir) if f.startswith('test_results_')]
-            
-            if stats_files:
-                # 가장 최근 stats 파일 사용
-                latest_stats = stats_files[-1]
-                with open(os.path.join(phase_dir, latest_stats), 'r') as f:
-                    stats = json.load(f)
-                    stats['thread_count'] = thread_count
-                    all_results.append(stats)
-    
-    return pd.DataFrame(all_results)
+@st.cache_data(show_spinner=False)
+def load_run_data(base_dir, run_mtime=None):
+    """
+    phase별/엔드포인트별 결과 DataFrame 로드 (dashboard_data 공용 평탄화 사용)
+    run_mtime(get_run_mtime)이 캐시 키에 포함되어 새 phase가 생길 때만 다시 읽음
+    """
+    return load_run(base_dir)
 
 
 def get_download_link(df, filename):
@@ -72,7 +55,8 @@ def main():
             )
 
     # select result repo
-    result_dirs = [d for d in os.listdir('.') if d.startswith('stress_test_results_')]
+    # 다중 대상 실행은 대상별 하위 폴더를 각각 선택 가능
+    result_dirs = find_run_dirs()
     if not result_dirs:
         st.error("No test results found!")
         return
@@ -83,8 +67,11 @@ def main():
         index=len(result_dirs)-1  # default the newest version
     )
     
-    # load data
-    df = load_test_results(selected_dir)
+    # load data (새 phase가 추가된 경우에만 디스크에서 다시 읽음)
+    df, _ = load_run_data(selected_dir, get_run_mtime(selected_dir))
+    if df is None:
+        st.error("No data found in the selected directory!")
+        return
     
     # the top result matrics
     def load_and_display_data():
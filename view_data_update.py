@@ -3,65 +3,102 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import os
-import json
 from datetime import datetime
 import base64
+from dashboard_data import find_run_dirs, get_run_mtime, load_run, read_manifest_records, normalize_results, normalize_endpoint_results
+from run_manifest import has_manifest, read_manifest, get_manifest_size
+from live_metrics import find_running_phase, load_live_metrics, LIVE_METRICS_FILE
+from timeseries_analysis import load_timeseries
+from downsample import downsample_frame
+from run_pivots import get_pivots_mtime, load_run_pivots
 
-def load_test_results(base_dir):
-    """각 phase 폴더의 모든 JSON 파일을 로드하여 DataFrame으로 변환"""
-    all_results = []
-    
-    for folder in os.listdir(base_dir):
-        if folder.startswith('phase_threads_'):
-            thread_count = int(folder.split('_')[2])
-            duration = int(folder.split('_')[4])
-            
-            phase_dir = os.path.join(base_dir, folder)
-            for stats_file in os.listdir(phase_dir):
-                if stats_file.startswith('test_results_'):
-                    with open(os.path.join(phase_dir, stats_file), 'r') as f:
-                        stats = json.load(f)
-                        stats['thread_count'] = thread_count
-                        stats['duration'] = duration
-                        stats['file_name'] = stats_file
-                        all_results.append(stats)
-    
-    if not all_results:
-        return None
+@st.cache_data(show_spinner=False)
+def load_run_data(base_dir, run_mtime=None):
+    """
+    phase별/엔드포인트별 결과 DataFrame 로드 (dashboard_data 공용 평탄화 사용)
+    run_mtime(get_run_mtime)이 캐시 키에 포함되어 새 phase가 생길 때만 다시 읽음
+    """
+    return load_run(base_dir)
+
+def load_live_run(base_dir):
+    """
+    실행 매니페스트에서 새로 완료된 단계만 읽어 세션 상태의 DataFrame에 추가
+    매니페스트가 없는 이전 실행은 폴더 mtime 기준 캐시 로드 사용
+    """
+    if not has_manifest(base_dir):
+        return load_run_data(base_dir, get_run_mtime(base_dir))
+
+    state = st.session_state.get('live_run')
+    if state is None or state['base_dir'] != base_dir:
+        state = {'base_dir': base_dir, 'offset': 0, 'data': None, 'endpoint_data': pd.DataFrame()}
+
+    entries, state['offset'] = read_manifest(base_dir, state['offset'])
+    records = read_manifest_records(base_dir, entries)
+    if records:
+        new_data = normalize_results(records)
+        state['data'] = new_data if state['data'] is None else pd.concat([state['data'], new_data], ignore_index=True)
+        state['endpoint_data'] = pd.concat([state['endpoint_data'], normalize_endpoint_results(records)], ignore_index=True)
+
+    st.session_state['live_run'] = state
+    return state['data'], state['endpoint_data']
+
+def get_live_signature(base_dir):
+    """
+    다시 그려야 하는지 확인용 값
+    (매니페스트 크기 또는 폴더 mtime, 실행 중인 단계의 live_metrics.json mtime)
+    """
+    completed = get_manifest_size(base_dir) if has_manifest(base_dir) else get_run_mtime(base_dir)
+    running_phase = find_running_phase(base_dir)
+    live_mtime = os.path.getmtime(os.path.join(running_phase, LIVE_METRICS_FILE)) if running_phase else None
+    return completed, live_mtime
+
+def _check_changes(base_dir):
+    # fragment 재실행마다 한 번만 확인 (페이지를 막지 않으므로 선택/필터 변경이 바로 반영됨)
+    if get_live_signature(base_dir) != st.session_state.get('live_signature'):
+        st.rerun()
+
+def wait_for_changes(base_dir, refresh_rate):
+    """실시간 모드: 간격마다 변경 여부만 확인하고, 새 단계 완료나 실시간 집계 갱신 시에만 전체를 다시 그림"""
+    if refresh_rate <= 0:
+        return
+    st.session_state['live_signature'] = get_live_signature(base_dir)
+    st.fragment(_check_changes, run_every=refresh_rate)(base_dir)
+
+def show_live_phase(base_dir):
+    """실행 중인 단계의 구간별 집계(live_metrics.json)를 초 단위로 표시"""
+    phase_dir = find_running_phase(base_dir)
+    if phase_dir is None:
+        return
+
+    st.subheader(f"🔴 Live Phase: {os.path.basename(phase_dir)}")
+    points = pd.DataFrame(load_live_metrics(phase_dir)['points'])
+    if points.empty:
+        st.info("Waiting for samples...")
+        return
+
+    points['time'] = pd.to_datetime(points['timestamp'], unit='ms')
+    latest = points.iloc[-1]
+    points = downsample_frame(points, 'time', ['rps', 'error_rate', 'p50', 'p95', 'p99'])
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Requests/Second", f"{latest['rps']:.1f}")
+    col2.metric("Error Rate", f"{latest['error_rate']:.2f}%")
+    col3.metric("p95 Response Time", f"{latest['p95']:.0f}ms")
+    col4.metric("p99 Response Time", f"{latest['p99']:.0f}ms")
+
+    fig_live = go.Figure()
+    fig_live.add_trace(go.Scatter(x=points['time'], y=points['rps'], mode='lines', name='Requests/Second'))
+    fig_live.add_trace(go.Scatter(x=points['time'], y=points['error_rate'], mode='lines', name='Error Rate (%)'))
+    for percentile in ['p50', 'p95', 'p99']:
+        fig_live.add_trace(go.Scatter(x=points['time'], y=points[percentile], mode='lines',
+                                      name=f'{percentile} (ms)', yaxis='y2', line=dict(dash='dot')))
+    fig_live.update_layout(
+        title='Current Phase (per second)',
+        xaxis_title='Time',
+        yaxis_title='Requests/Second | Error Rate (%)',
+        yaxis2=dict(title='Response Time (ms)', overlaying='y', side='right')
+    )
+    st.plotly_chart(fig_live, use_container_width=True)
 
-    data = pd.DataFrame(all_results)
-    data['timestamp'] = pd.to_datetime(data['timestamp'])
-    
-    # response_time과 throughput 데이터 처리
-    data['min_response_time'] = data['response_time'].apply(lambda x: x['min'])
-    data['max_response_time'] = data['response_time'].apply(lambda x: x['max'])
-    data['avg_response_time'] = data['response_time'].apply(lambda x: x['mean'])
-    data['median_response_time'] = data['response_time'].apply(lambda x: x['median'])
-    data['90th_percentile'] = data['response_time'].apply(lambda x: x['90th_percentile'])
-    data['95th_percentile'] = data['response_time'].apply(lambda x: x['95th_percentile'])
-    data['99th_percentile'] = data['response_time'].apply(lambda x: x['99th_percentile'])
-    data['requests_per_second'] = data['throughput'].apply(lambda x: x['requests_per_second'])
-    
-    return data
-
-def create_endpoint_metrics(data):
-    """엔드포인트별 메트릭스 생성"""
-    endpoint_data = []
-    for _, row in data.iterrows():
-        for endpoint, stats in row['endpoint_statistics'].items():
-            endpoint_data.append({
-                'timestamp': row['timestamp'],
-                'thread_count': row['thread_count'],
-                'duration': row['duration'],
-                'endpoint': endpoint,
-                'total_requests': stats['total_requests'],
-                'error_rate': stats['error_rate'],
-                'avg_response_time': stats['avg_response_time'],
-                '90th_percentile': stats['90th_percentile'],
-                'error_count': stats['error_count']
-            })
-    return pd.DataFrame(endpoint_data)
-   
 def detect_changes(data):
     """변화 감지 함수"""
     changes = {
@@ -72,15 +109,16 @@ def detect_changes(data):
     }
     return changes
 
-def create_heatmap(data, metric):
-    """스레드 수와 지속 시간에 따른 히트맵 생성"""
-    pivot_data = data.pivot_table(
-        values=metric,
-        index='thread_count',
-        columns='duration',
-        aggfunc='mean'
-    )
-    
+@st.cache_data(show_spinner=False)
+def load_pivot_data(base_dir, pivots_mtime=None, run_mtime=None):
+    """
+    실행 중 갱신되는 run_pivots.json 로드 (파일 mtime이 바뀔 때만 다시 읽음)
+    피벗 파일이 없는 이전 실행은 run_mtime 기준으로 한 번만 계산
+    """
+    return load_run_pivots(base_dir)
+
+def create_heatmap(pivot_data, metric):
+    """스레드 수와 지속 시간에 따른 히트맵 생성 (미리 계산된 피벗 사용)"""
     fig = go.Figure(data=go.Heatmap(
         z=pivot_data.values,
         x=pivot_data.columns,
@@ -100,17 +138,30 @@ def main():
     st.title("🚀 API Performance Test Dashboard")
     
     # 파일 선택
-    result_dirs = [d for d in os.listdir('.') if d.startswith('stress_test_results')]
+    # 다중 대상 실행은 대상별 하위 폴더를 각각 선택 가능
+    result_dirs = find_run_dirs()
     if not result_dirs:
         st.error("No test result files found!")
         return
     
     selected_dir = st.selectbox("Select Test Run:", options=result_dirs, index=len(result_dirs)-1)
     
-    # 데이터 로드
-    data = load_test_results(selected_dir)
+    # 자동 새로고침 설정
+    st.sidebar.title("Dashboard Settings")
+    refresh_rate = st.sidebar.selectbox(
+        "Auto-refresh interval (seconds)",
+        options=[0, 5, 10, 30, 60],
+        index=0
+    )
+
+    # 실행 중인 단계 실시간 표시
+    show_live_phase(selected_dir)
+
+    # 데이터 로드 (새 phase가 추가된 경우에만 디스크에서 다시 읽음)
+    data, endpoint_df = load_live_run(selected_dir)
     if data is None:
         st.error("No data found in the selected directory!")
+        wait_for_changes(selected_dir, refresh_rate)
         return
 
     changes = detect_changes(data)
@@ -126,28 +177,32 @@ def main():
     st.subheader("Performance Heatmaps")
     col1, col2 = st.columns(2)
 
+    pivots_mtime = get_pivots_mtime(selected_dir)
+    pivots = load_pivot_data(selected_dir, pivots_mtime, None if pivots_mtime else get_run_mtime(selected_dir))
+
     with col1: 
-        fig_requests_heatmap = create_heatmap(data, 'total_requests')
+        fig_requests_heatmap = create_heatmap(pivots['total_requests'], 'total_requests')
         st.plotly_chart(fig_requests_heatmap, use_container_width=True)
     
     with col2:
-        fig_response_heatmap = create_heatmap(data, 'avg_response_time')
+        fig_response_heatmap = create_heatmap(pivots['avg_response_time'], 'avg_response_time')
         st.plotly_chart(fig_response_heatmap, use_container_width=True)
 
     st.subheader("Time Series Metrics")
+    timeline_data = downsample_frame(data, 'timestamp', ['thread_count', 'avg_response_time'])
     fig_timeline = go.Figure()
 
     fig_timeline.add_trace(go.Scatter(
-        x=data['timestamp'],
-        y=data['thread_count'],
+        x=timeline_data['timestamp'],
+        y=timeline_data['thread_count'],
         mode="lines+markers",
         name='Thread Count',
         yaxis='y2'
     ))
 
     fig_timeline.add_trace(go.Scatter(
-        x=data['timestamp'],
-        y=data['avg_response_time'],
+        x=timeline_data['timestamp'],
+        y=timeline_data['avg_response_time'],
         mode='lines+markers',
         name='Avg Response Time'
     ))
@@ -232,12 +287,44 @@ def main():
         )
         st.plotly_chart(fig_response, use_container_width=True)
 
+    # 단계 내 시계열 (duration별 p95 추이)
+    st.subheader(f"Phase Time Series (Threads: {selected_thread})")
+    fig_series = go.Figure()
+    # duration별 가장 최근 유효 단계 폴더 (포화로 재시도한 경우 _retryN 폴더)
+    phase_dirs = filtered_data.sort_values('timestamp').drop_duplicates('duration', keep='last').sort_values('duration')
+    for duration, phase_name in zip(phase_dirs['duration'], phase_dirs['phase_dir']):
+        series = load_timeseries(os.path.join(selected_dir, phase_name))
+        if series is None or series.empty:
+            continue
+        series = downsample_frame(series, 'second', ['p95', 'rps'])
+        fig_series.add_trace(go.Scatter(
+            x=series['second'],
+            y=series['p95'],
+            mode='lines',
+            name=f'p95 ({duration}s)'
+        ))
+        fig_series.add_trace(go.Scatter(
+            x=series['second'],
+            y=series['rps'],
+            mode='lines',
+            name=f'RPS ({duration}s)',
+            yaxis='y2',
+            line=dict(dash='dot')
+        ))
+    fig_series.update_layout(
+        title='p95 Response Time and Throughput within Each Phase',
+        xaxis_title='Elapsed Time in Phase (seconds)',
+        yaxis_title='Response Time (ms)',
+        yaxis2=dict(title='Requests/Second', overlaying='y', side='right')
+    )
+    st.plotly_chart(fig_series, use_container_width=True)
+
     # 엔드포인트별 성능
     st.subheader("Endpoint Performance")
-    endpoint_df = create_endpoint_metrics(filtered_data)
+    endpoint_df = endpoint_df[endpoint_df['thread_count'] == selected_thread]
     
     fig_endpoint = px.line(
-        endpoint_df,
+        downsample_frame(endpoint_df.sort_values('duration'), 'duration', ['error_rate'], by='endpoint'),
         x='duration',
         y='error_rate',
         color='endpoint',
@@ -258,16 +345,7 @@ def main():
     
     st.dataframe(metrics_df)
 
-    # 자동 새로고침 설정
-    st.sidebar.title("Dashboard Settings")
-    refresh_rate = st.sidebar.selectbox(
-        "Auto-refresh interval (seconds)",
-        options=[0, 5, 10, 30, 60],
-        index=0
-    )
-    
-    if refresh_rate > 0:
-        st.experimental_rerun()
+    wait_for_changes(selected_dir, refresh_rate)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file